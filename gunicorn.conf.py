@@ -0,0 +1,11 @@
+"""
+Gunicorn hooks - picked up automatically when gunicorn runs from the repository root,
+and passed explicitly by scripts/run_production.py
+"""
+
+
+def post_worker_init(worker):
+    # Start job runners and background threads as soon as each worker boots (with or without --preload-app),
+    # so jobs interrupted by a restart or --max-requests recycle resume before any request arrives
+    from src.app import start_background_services
+    start_background_services()
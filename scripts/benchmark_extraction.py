@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Offline extraction benchmark - times the parsing stages over saved pages and synthetic bios (no network)
+"""
+import os
+import sys
+import json
+import glob
+import time
+import random
+import argparse
+import platform
+import statistics
+import tracemalloc
+import contextlib
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+DEFAULT_CORPUS = os.path.join(ROOT_DIR, 'data', '*.html')
+DEFAULT_BASELINE = os.path.join(ROOT_DIR, 'data', 'benchmarks', 'extraction_baseline.json')
+
+BIO_FRAGMENTS = [
+    'lifestyle • vibes • travel',
+    '📍 NYC | LA',
+    'DM for collabs',
+    'new video every friday 🎬',
+    'business inquiries below 👇',
+    '$20 off code: SPRING',
+    'she/her',
+]
+EMAIL_FORMATS = [
+    '{user}@{domain}',
+    '📧 {user}@{domain}',
+    'contact: {user} @ {domain}',
+    '{user}[at]{host}[dot]com',
+    '{user}(at){host}(dot)com',
+    'Email - {user}@{domain}!',
+]
+
+
+def synthetic_bios(count, seed=1234):
+    """Deterministic bios covering plain, obfuscated and emoji-prefixed emails"""
+    rng = random.Random(seed)
+    bios = []
+    for i in range(count):
+        lines = rng.sample(BIO_FRAGMENTS, rng.randint(1, 4))
+        if rng.random() < 0.7:
+            user = f"creator{i}"
+            host = rng.choice(['gmail', 'outlook', 'studio-mail'])
+            lines.insert(rng.randint(0, len(lines)), rng.choice(EMAIL_FORMATS).format(user=user, host=host, domain=f"{host}.com"))
+        bios.append('\n'.join(lines))
+    return bios
+
+
+def load_corpus(pattern):
+    pages = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, 'rb') as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def run_stage(name, func, inputs, iterations):
+    """Time func over inputs; returns per-call timing, throughput and peak traced memory"""
+    # Warm up once so imports and regex compilation aren't counted
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for item in inputs:
+            func(item)
+
+    timings = []
+    total_bytes = sum(len(item) for item in inputs if isinstance(item, (bytes, str)))
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            for item in inputs:
+                t0 = time.perf_counter()
+                func(item)
+                timings.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - started
+
+        # Separate pass for memory - tracemalloc slows allocation-heavy stages too much to time them with it on
+        tracemalloc.start()
+        for item in inputs:
+            func(item)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        'stage': name,
+        'calls': len(timings),
+        'mean_ms': round(statistics.mean(timings) * 1000, 4),
+        'p50_ms': round(timings[len(timings) // 2] * 1000, 4),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000, 4),
+        'ops_per_sec': round(len(timings) / elapsed, 1) if elapsed else None,
+        'mb_per_sec': round(total_bytes * iterations / elapsed / (1024 * 1024), 2) if elapsed and total_bytes else None,
+        'peak_memory_mb': round(peak / (1024 * 1024), 2),
+    }
+
+
+def build_stages(scraper, pages, bios):
+    page_bodies = [body for _, body in pages]
+
+    json_blobs = []
+    for body in page_bodies:
+        for marker, _ in scraper.JSON_BLOB_MARKERS:
+            pos = body.find(marker)
+            if pos != -1:
+                start = body.find(b'>', pos) + 1
+                json_blobs.append(json.loads(body[start:body.find(b'</script>', start)].decode('utf-8')))
+                break
+
+    stages = [
+        ('fast_path_extract', lambda body: scraper._fast_extract_bio(body, 'benchmark', 'utf-8'), page_bodies),
+        ('extract_bio_from_content', lambda body: scraper._extract_bio_from_content(body, 'benchmark', 'utf-8'), page_bodies),
+        # The chardet + BeautifulSoup path that runs when the fast path finds nothing
+        ('soup_fallback_extract', lambda body: scraper._soup_extract_bio(body, 'benchmark'), page_bodies),
+        ('extract_bio_from_json', scraper._extract_bio_from_json, json_blobs),
+        ('extract_emails_with_context', scraper.extract_emails_with_context, bios),
+    ]
+    return [(name, func, inputs) for name, func, inputs in stages if inputs]
+
+
+def compare(results, baseline, threshold):
+    """Print the change against a saved baseline; returns the stages that regressed past threshold"""
+    previous = {stage['stage']: stage for stage in baseline.get('stages', [])}
+    regressions = []
+    print(f"\n{'Stage':<30} {'Baseline p50':>14} {'Current p50':>14} {'Change':>9}")
+    for stage in results:
+        before = previous.get(stage['stage'])
+        if not before or not before['p50_ms']:
+            print(f"{stage['stage']:<30} {'-':>14} {stage['p50_ms']:>12.3f}ms {'new':>9}")
+            continue
+        change = (stage['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100
+        flag = ' ❌' if change > threshold else ''
+        print(f"{stage['stage']:<30} {before['p50_ms']:>12.3f}ms {stage['p50_ms']:>12.3f}ms {change:>+8.1f}%{flag}")
+        if change > threshold:
+            regressions.append(stage['stage'])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark TikTok profile extraction offline')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help='Glob of saved HTML pages (default: data/*.html)')
+    parser.add_argument('--iterations', type=int, default=5, help='Passes over the corpus per stage (default: 5)')
+    parser.add_argument('--bios', type=int, default=500, help='Number of synthetic bios (default: 500)')
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, help='Write results as the new baseline JSON')
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, help='Compare against a baseline JSON')
+    parser.add_argument('--threshold', type=float, default=20.0, help='Allowed p50 slowdown in percent before failing (default: 20)')
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus)
+    if not pages:
+        print(f"❌ No pages matched {args.corpus}")
+        sys.exit(1)
+    bios = synthetic_bios(args.bios)
+
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    from src.app import TikTokScraper
+    scraper = TikTokScraper()
+
+    print(f"📊 Benchmarking {len(pages)} page(s) and {len(bios)} synthetic bios, {args.iterations} iteration(s)")
+    print("-" * 60)
+    results = []
+    for name, func, inputs in build_stages(scraper, pages, bios):
+        stage = run_stage(name, func, inputs, args.iterations)
+        results.append(stage)
+        print(f"{name:<30} p50 {stage['p50_ms']:>9.3f}ms  p95 {stage['p95_ms']:>9.3f}ms  "
+              f"{stage['ops_per_sec']:>9.1f} ops/s  peak {stage['peak_memory_mb']:>7.2f} MB")
+
+    report = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.platform(),
+        'corpus': [name for name, _ in pages],
+        'iterations': args.iterations,
+        'synthetic_bios': len(bios),
+        'stages': results,
+    }
+
+    exit_code = 0
+    if args.compare:
+        if not os.path.exists(args.compare):
+            print(f"⚠️ No baseline at {args.compare}, skipping comparison")
+        else:
+            with open(args.compare) as f:
+                regressions = compare(results, json.load(f), args.threshold)
+            if regressions:
+                print(f"\n❌ Regressions over {args.threshold}%: {', '.join(regressions)}")
+                exit_code = 1
+            else:
+                print(f"\n✅ No regressions over {args.threshold}%")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.save_baseline), exist_ok=True)
+        with open(args.save_baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Baseline saved to {args.save_baseline}")
+
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
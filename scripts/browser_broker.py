@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Shared browser broker - owns one bounded set of headless Chromes for every gunicorn worker on the host.
+Start it next to the app and set BROWSER_BROKER_ADDRESS=127.0.0.1:8790 so workers lease sessions from it
+instead of each running its own WebDriver pool.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from collections import deque
+from socketserver import StreamRequestHandler, ThreadingTCPServer
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+
+class BrowserBroker:
+    """Hands out at most max_browsers Chrome sessions; waiters queue until one is released"""
+
+    def __init__(self, max_browsers, create_driver):
+        self.max_browsers = max_browsers
+        self.create_driver = create_driver
+        self.idle = deque()
+        self.total = 0  # Browsers alive or being started, idle + leased
+        self.condition = threading.Condition()
+        self.leases = 0
+        self.lease_timeouts = 0
+        self.created = 0
+        self.discarded = 0
+        self.total_wait_seconds = 0.0
+
+    def _is_alive(self, driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def lease(self, timeout):
+        """Idle browser, a new one if under the limit, or None once timeout passes"""
+        started = time.monotonic()
+        deadline = started + timeout
+        with self.condition:
+            while True:
+                if self.idle:
+                    driver = self.idle.popleft()
+                    break
+                if self.total < self.max_browsers:
+                    self.total += 1  # Reserve the slot before starting Chrome outside the lock
+                    driver = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.lease_timeouts += 1
+                    return None
+                self.condition.wait(remaining)
+
+        if driver is not None and not self._is_alive(driver):
+            print("🔧 Idle browser died, replacing it")
+            self._quit(driver)
+            with self.condition:
+                self.discarded += 1
+            driver = None
+
+        if driver is None:
+            driver = self.create_driver()
+            if driver is None:
+                with self.condition:
+                    self.total -= 1
+                    self.condition.notify()
+                return None
+            with self.condition:
+                self.created += 1
+
+        with self.condition:
+            self.leases += 1
+            self.total_wait_seconds += time.monotonic() - started
+        return driver
+
+    def release(self, driver, discard=False):
+        if not discard and self._is_alive(driver):
+            with self.condition:
+                self.idle.append(driver)
+                self.condition.notify()
+            return
+
+        self._quit(driver)
+        with self.condition:
+            self.total -= 1
+            self.discarded += 1
+            self.condition.notify()
+
+    def close_all(self):
+        with self.condition:
+            drivers = list(self.idle)
+            self.idle.clear()
+            self.total -= len(drivers)
+        for driver in drivers:
+            self._quit(driver)
+
+    def get_stats(self):
+        with self.condition:
+            return {
+                'max_browsers': self.max_browsers,
+                'browsers': self.total,
+                'idle': len(self.idle),
+                'leased': self.total - len(self.idle),
+                'leases': self.leases,
+                'lease_timeouts': self.lease_timeouts,
+                'created': self.created,
+                'discarded': self.discarded,
+                'avg_wait_seconds': round(self.total_wait_seconds / self.leases, 3) if self.leases else 0.0,
+            }
+
+
+def make_handler(broker):
+    class BrokerHandler(StreamRequestHandler):
+        def handle(self):
+            driver = None  # One lease per connection
+            try:
+                for line in self.rfile:
+                    message = json.loads(line)
+                    op = message.get('op')
+                    if op == 'lease':
+                        if driver is not None:
+                            reply = {'ok': False, 'error': 'This connection already holds a lease'}
+                        else:
+                            driver = broker.lease(float(message.get('timeout', 30)))
+                            if driver is None:
+                                reply = {'ok': False, 'error': 'No browser available before timeout'}
+                            else:
+                                reply = {
+                                    'ok': True,
+                                    'executor_url': driver.command_executor._url,
+                                    'session_id': driver.session_id,
+                                    'capabilities': driver.capabilities,
+                                }
+                    elif op == 'release':
+                        if driver is not None:
+                            broker.release(driver, discard=bool(message.get('discard')))
+                            driver = None
+                        reply = {'ok': True}
+                    elif op == 'stats':
+                        reply = dict(broker.get_stats(), ok=True)
+                    else:
+                        reply = {'ok': False, 'error': f'Unknown op: {op}'}
+                    self.wfile.write(json.dumps(reply).encode('utf-8') + b'\n')
+                    self.wfile.flush()
+            except (OSError, ValueError):
+                pass  # Client went away or sent garbage
+            finally:
+                if driver is not None:
+                    # Worker died or timed out mid-lease - take the browser back
+                    broker.release(driver)
+
+    return BrokerHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Share one bounded pool of headless Chromes between app workers')
+    parser.add_argument('--host', default='127.0.0.1', help='Host to bind to (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8790, help='Port to bind to (default: 8790)')
+    parser.add_argument('--max-browsers', type=int, default=8, help='Most Chrome instances alive at once (default: 8)')
+    args = parser.parse_args()
+
+    # Same Chrome options and driver fallbacks as the app, without importing the app itself
+    # (quietly - only driver warnings and errors)
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s %(levelname)s %(message)s')
+    from src.webdriver_factory import create_driver
+
+    broker = BrowserBroker(args.max_browsers, create_driver)
+    ThreadingTCPServer.allow_reuse_address = True
+    server = ThreadingTCPServer((args.host, args.port), make_handler(broker))
+    server.daemon_threads = True
+
+    print(f"🔧 Browser broker on {args.host}:{args.port} (max {args.max_browsers} browsers)")
+    print(f"💡 Start the app with BROWSER_BROKER_ADDRESS={args.host}:{args.port}")
+    print("-" * 60)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Shutting down browser broker...")
+    finally:
+        server.server_close()
+        broker.close_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Load driver for the Flask app - replays /scrape or /bulk-scrape workloads and reports latency, throughput and tier mix.
+Run the app against scripts/mock_tiktok_server.py (TIKTOK_BASE_URL) to load-test without touching TikTok.
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+
+def build_workload(count, unique_ratio, prefix, seed):
+    """Username list where roughly (1 - unique_ratio) of entries repeat earlier names (cache hits)"""
+    rng = random.Random(seed)
+    distinct = max(1, int(count * unique_ratio))
+    names = [f"{prefix}{i}" for i in range(distinct)]
+    workload = list(names)
+    while len(workload) < count:
+        workload.append(rng.choice(names))
+    rng.shuffle(workload)
+    return workload[:count]
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def get_json(url, timeout=10):
+    try:
+        return requests.get(url, timeout=timeout).json()
+    except Exception:
+        return None
+
+
+def run_scrape(app_url, usernames, concurrency, timeout):
+    """One POST /scrape per username from a pool of client threads"""
+    latencies = []
+    outcomes = []
+    lock = threading.Lock()
+
+    def scrape_one(username):
+        started = time.perf_counter()
+        try:
+            response = requests.post(f"{app_url}/scrape", json={'username': username}, timeout=timeout)
+            success = bool(response.json().get('success'))
+        except Exception:
+            success = False
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            outcomes.append(success)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(scrape_one, username) for username in usernames]
+        for i, _ in enumerate(as_completed(futures), 1):
+            if i % 50 == 0 or i == len(futures):
+                print(f"📊 {i}/{len(futures)} completed")
+    return latencies, outcomes, None
+
+
+def run_bulk(app_url, usernames, concurrency, timeout, batch_size):
+    """Streamed /bulk-scrape batches; latency is time from batch start until each result line arrives"""
+    latencies = []
+    outcomes = []
+    first_results = []
+    lock = threading.Lock()
+    batches = [usernames[i:i + batch_size] for i in range(0, len(usernames), batch_size)]
+
+    def run_batch(batch):
+        started = time.perf_counter()
+        first = None
+        try:
+            with requests.post(f"{app_url}/bulk-scrape", json={'usernames': batch, 'stream': True},
+                               stream=True, timeout=timeout) as response:
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    message = json.loads(line)
+                    if message.get('type') != 'result':
+                        continue
+                    elapsed = time.perf_counter() - started
+                    if first is None:
+                        first = elapsed
+                    with lock:
+                        latencies.append(elapsed)
+                        outcomes.append(bool(message['result'].get('success')))
+        except Exception as e:
+            print(f"❌ Batch failed: {e}")
+        if first is not None:
+            with lock:
+                first_results.append(first)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for i, _ in enumerate(as_completed([executor.submit(run_batch, batch) for batch in batches]), 1):
+            print(f"📊 Batch {i}/{len(batches)} completed")
+    return latencies, outcomes, first_results
+
+
+def diff_counts(before, after):
+    before = before or {}
+    return {key: value - before.get(key, 0) for key, value in (after or {}).items() if value - before.get(key, 0)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the TikTok scraper app')
+    parser.add_argument('--app-url', default='http://127.0.0.1:5001', help='Flask app URL (default: http://127.0.0.1:5001)')
+    parser.add_argument('--mock-url', default=None, help='Mock TikTok server URL, to include its outcome counts')
+    parser.add_argument('--mode', choices=['scrape', 'bulk'], default='bulk', help='Endpoint to drive (default: bulk)')
+    parser.add_argument('--usernames', type=int, default=200, help='Total usernames to request (default: 200)')
+    parser.add_argument('--unique-ratio', type=float, default=1.0, help='Share of distinct usernames, <1 adds repeats (default: 1.0)')
+    parser.add_argument('--prefix', default=None, help='Username prefix (default: loadtest_<timestamp>_ so runs start uncached)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Concurrent client requests/batches (default: 4)')
+    parser.add_argument('--batch-size', type=int, default=100, help='Usernames per /bulk-scrape call (default: 100)')
+    parser.add_argument('--timeout', type=float, default=600, help='Per-request timeout in seconds (default: 600)')
+    parser.add_argument('--clear-cache', action='store_true', help='Call /clear-cache before starting')
+    parser.add_argument('--seed', type=int, default=42, help='Workload random seed (default: 42)')
+    parser.add_argument('--output', default=None, help='Write the report as JSON to this path')
+    args = parser.parse_args()
+
+    app_url = args.app_url.rstrip('/')
+    prefix = args.prefix or f"loadtest_{int(time.time())}_"
+    usernames = build_workload(args.usernames, args.unique_ratio, prefix, args.seed)
+
+    if args.clear_cache:
+        requests.post(f"{app_url}/clear-cache", timeout=30)
+
+    stats_before = get_json(f"{app_url}/system-stats") or {}
+    mock_before = get_json(f"{args.mock_url.rstrip('/')}/__stats") if args.mock_url else None
+
+    print(f"🚀 {args.mode} load test: {len(usernames)} usernames ({len(set(usernames))} distinct), concurrency {args.concurrency}")
+    print("-" * 60)
+    started = time.perf_counter()
+    if args.mode == 'scrape':
+        latencies, outcomes, first_results = run_scrape(app_url, usernames, args.concurrency, args.timeout)
+    else:
+        latencies, outcomes, first_results = run_bulk(app_url, usernames, args.concurrency, args.timeout, args.batch_size)
+    duration = time.perf_counter() - started
+
+    stats_after = get_json(f"{app_url}/system-stats") or {}
+    mock_after = get_json(f"{args.mock_url.rstrip('/')}/__stats") if args.mock_url else None
+
+    report = {
+        'mode': args.mode,
+        'usernames': len(usernames),
+        'distinct_usernames': len(set(usernames)),
+        'concurrency': args.concurrency,
+        'completed': len(outcomes),
+        'successful': sum(outcomes),
+        'duration_seconds': round(duration, 2),
+        'profiles_per_minute': round(len(outcomes) / duration * 60, 1) if duration else None,
+        'latency_seconds': {
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'max': max(latencies) if latencies else None,
+        },
+        # Tier counters are per app process - run against a single worker for an exact mix
+        'tier_mix': diff_counts(stats_before.get('tiers'), stats_after.get('tiers')),
+    }
+    if first_results:
+        report['time_to_first_result_seconds'] = percentile(first_results, 50)
+    if args.mock_url:
+        report['mock_outcomes'] = diff_counts(mock_before, mock_after)
+
+    print("-" * 60)
+    print(f"✅ Completed: {report['completed']}/{report['usernames']} ({report['successful']} successful) in {report['duration_seconds']}s")
+    print(f"⚡ Throughput: {report['profiles_per_minute']} profiles/min")
+    lat = report['latency_seconds']
+    if latencies:
+        print(f"⏱️  Latency: p50 {lat['p50']:.2f}s  p95 {lat['p95']:.2f}s  p99 {lat['p99']:.2f}s  max {lat['max']:.2f}s")
+    if first_results:
+        print(f"⏱️  Time to first result (p50 per batch): {report['time_to_first_result_seconds']:.2f}s")
+    print(f"🧭 Tier mix: {report['tier_mix']}")
+    if args.mock_url:
+        print(f"🎭 Mock outcomes: {report['mock_outcomes']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report saved to {args.output}")
+
+    sys.exit(0 if outcomes else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for TikTok profile pages - serves profiles, login walls, 429s, 5xx errors and slow responses.
+Point the scraper at it with TIKTOK_BASE_URL=http://127.0.0.1:8081
+"""
+import os
+import re
+import sys
+import gzip
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE_PAGE = os.path.join(ROOT_DIR, 'data', 'tiktok_page.html')
+
+LOGIN_WALL_PAGE = (
+    '<!DOCTYPE html><html lang="en"><head><meta charset="UTF-8" /><title>TikTok - Make Your Day</title></head><body>'
+    '<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">'
+    '{"__DEFAULT_SCOPE__":{"webapp.app-context":{"language":"en","region":"US"}}}</script>'
+    '<div id="app"><h1>Make Your Day</h1><p>Log in to follow creators, like videos, and view comments.</p>'
+    '<button>Log in</button><button>Sign up</button></div></body></html>'
+)
+NOT_FOUND_PAGE = (
+    '<!DOCTYPE html><html lang="en"><head><meta charset="UTF-8" /><title>TikTok</title></head><body>'
+    '<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">'
+    '{"__DEFAULT_SCOPE__":{"webapp.user-detail":{"statusCode":10221,"statusMsg":"user not exist"}}}</script>'
+    "<div id=\"app\"><p>Couldn't find this account</p></div></body></html>"
+)
+BIO_LINES = ['lifestyle • vibes', 'DM for collabs', '📍 NYC', 'new video every friday', 'business inquiries below 👇']
+
+
+class MockConfig:
+    def __init__(self, args):
+        self.latency_ms = args.latency_ms
+        self.jitter_ms = args.jitter_ms
+        self.login_wall_rate = args.login_wall_rate
+        self.rate_limit_rate = args.rate_limit_rate
+        self.error_rate = args.error_rate
+        self.not_found_rate = args.not_found_rate
+        self.slow_rate = args.slow_rate
+        self.slow_ms = args.slow_ms
+        self.email_rate = args.email_rate
+        self.retry_after = args.retry_after
+        self.rng = random.Random(args.seed)
+        self.rng_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.stats = {}
+
+        with open(TEMPLATE_PAGE, 'r', encoding='utf-8') as f:
+            template = f.read()
+        # Split the saved page around its signature value so each profile gets its own bio
+        match = re.search(r'"signature":"((?:[^"\\]|\\.)*)"', template)
+        if not match:
+            print(f"❌ No signature found in {TEMPLATE_PAGE}")
+            sys.exit(1)
+        self.page_prefix = template[:match.start(1)]
+        self.page_suffix = template[match.end(1):]
+
+    def roll(self):
+        with self.rng_lock:
+            return self.rng.random()
+
+    def latency(self):
+        with self.rng_lock:
+            delay = self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(0.0, delay) / 1000.0
+
+    def record(self, outcome):
+        with self.stats_lock:
+            self.stats[outcome] = self.stats.get(outcome, 0) + 1
+
+    def profile_page(self, username):
+        # Bios are stable per username so cache and repeat lookups see the same data
+        rng = random.Random(username)
+        lines = rng.sample(BIO_LINES, rng.randint(1, 3))
+        if rng.random() < self.email_rate:
+            lines.append(f"{username}@example.com")
+        signature = json.dumps('\n'.join(lines))[1:-1]
+        return self.page_prefix + signature + self.page_suffix
+
+
+def make_handler(config):
+    class MockTikTokHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass  # Keep the console quiet under load
+
+        def _send(self, status, body='', extra_headers=None):
+            payload = body.encode('utf-8')
+            accept_encoding = self.headers.get('Accept-Encoding', '')
+            content_encoding = None
+            # Low compression levels keep the mock itself from becoming the bottleneck
+            if payload and 'br' in accept_encoding and brotli is not None:
+                payload, content_encoding = brotli.compress(payload, quality=4), 'br'
+            elif payload and 'gzip' in accept_encoding:
+                payload, content_encoding = gzip.compress(payload, compresslevel=5), 'gzip'
+
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(payload)))
+            if content_encoding:
+                self.send_header('Content-Encoding', content_encoding)
+            for key, value in (extra_headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path == '/__stats':
+                with config.stats_lock:
+                    stats = dict(config.stats)
+                payload = json.dumps(stats)
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload.encode('utf-8'))
+                return
+
+            match = re.match(r'^/@([A-Za-z0-9._-]+)', self.path)
+            if not match:
+                config.record('bad_path')
+                self._send(404, 'Not found')
+                return
+            username = match.group(1)
+
+            delay = config.latency()
+            if config.roll() < config.slow_rate:
+                delay += config.slow_ms / 1000.0
+                config.record('slow')
+            time.sleep(delay)
+
+            if config.roll() < config.rate_limit_rate:
+                config.record('429')
+                self._send(429, 'Too Many Requests', {'Retry-After': str(config.retry_after)})
+            elif config.roll() < config.error_rate:
+                config.record('5xx')
+                self._send(config.rng.choice([500, 502, 503]), 'Server error')
+            elif config.roll() < config.login_wall_rate:
+                config.record('login_wall')
+                self._send(200, LOGIN_WALL_PAGE)
+            elif config.roll() < config.not_found_rate:
+                config.record('not_found')
+                self._send(200, NOT_FOUND_PAGE)
+            else:
+                config.record('profile')
+                self._send(200, config.profile_page(username))
+
+    return MockTikTokHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve mock TikTok profile pages for offline load tests')
+    parser.add_argument('--host', default='127.0.0.1', help='Host to bind to (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8081, help='Port to bind to (default: 8081)')
+    parser.add_argument('--latency-ms', type=float, default=150, help='Base response latency in ms (default: 150)')
+    parser.add_argument('--jitter-ms', type=float, default=50, help='Random +/- latency jitter in ms (default: 50)')
+    parser.add_argument('--slow-rate', type=float, default=0.02, help='Probability of a slow response (default: 0.02)')
+    parser.add_argument('--slow-ms', type=float, default=5000, help='Extra delay for slow responses in ms (default: 5000)')
+    parser.add_argument('--login-wall-rate', type=float, default=0.1, help='Probability of a login wall page (default: 0.1)')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.05, help='Probability of a 429 (default: 0.05)')
+    parser.add_argument('--retry-after', type=int, default=2, help='Retry-After seconds sent with 429s (default: 2)')
+    parser.add_argument('--error-rate', type=float, default=0.02, help='Probability of a 5xx error (default: 0.02)')
+    parser.add_argument('--not-found-rate', type=float, default=0.02, help='Probability of a missing account (default: 0.02)')
+    parser.add_argument('--email-rate', type=float, default=0.6, help='Share of profiles whose bio has an email (default: 0.6)')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for reproducible runs')
+    args = parser.parse_args()
+
+    config = MockConfig(args)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(config))
+    server.daemon_threads = True
+
+    print(f"🎭 Mock TikTok server on http://{args.host}:{args.port}")
+    print(f"💡 Start the app with TIKTOK_BASE_URL=http://{args.host}:{args.port}")
+    print(f"📊 Outcome counts: http://{args.host}:{args.port}/__stats")
+    print("-" * 60)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Shutting down mock server...")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -28,8 +28,10 @@ def main():
     print("-" * 60)
     
     # Gunicorn command with optimized settings
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     cmd = [
         'gunicorn',
+        '--config', os.path.join(root_dir, 'gunicorn.conf.py'),  # Worker boot hooks (background job runners)
         '--bind', f'{args.host}:{args.port}',
         '--workers', str(args.workers),
         '--threads', str(args.threads),
@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, render_template, request, jsonify, send_file, Response, stream_with_context
 from werkzeug.utils import secure_filename
 import requests
 from bs4 import BeautifulSoup
@@ -6,10 +6,6 @@ import re
 import time
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 import json
 import io
 from openpyxl import Workbook, load_workbook
@@ -34,6 +30,75 @@ import diskcache as dc
 
 app = Flask(__name__)
 
+# PERFORMANCE: Queue-based leveled logging - request threads only enqueue records;
+# one listener thread per process formats them and writes to stdout (captured by gunicorn)
+import sys
+import atexit
+import logging
+import logging.handlers
+from queue import Queue, Empty, Full
+
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()  # DEBUG adds per-step chatter for every profile
+LOG_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', 0.1))  # Share of per-profile summary lines that are kept
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))  # Records beyond this are dropped instead of blocking
+SAMPLED = {'sample': LOG_SAMPLE_RATE}  # Pass as extra= for high-volume per-profile messages
+
+class SamplingFilter(logging.Filter):
+    """Keeps a share of records logged with extra={'sample': rate}; everything else passes"""
+    def filter(self, record):
+        rate = getattr(record, 'sample', None)
+        return rate is None or rate >= 1 or random.random() < rate
+
+class BackgroundLogHandler(logging.handlers.QueueHandler):
+    """QueueHandler whose listener is (re)started per process, since gunicorn forks after --preload-app"""
+    def __init__(self, target, maxsize=LOG_QUEUE_SIZE):
+        super().__init__(Queue(maxsize))
+        self.target = target
+        self.maxsize = maxsize
+        self.listener = None
+        self.owner_pid = None
+        self.start_lock = Lock()
+        self.dropped = 0
+    
+    def _ensure_listener(self):
+        if self.owner_pid == os.getpid():
+            return
+        with self.start_lock:
+            if self.owner_pid == os.getpid():
+                return
+            # The parent's queue may have been locked by its listener at fork time - start clean
+            self.queue = Queue(self.maxsize)
+            self.listener = logging.handlers.QueueListener(self.queue, self.target, respect_handler_level=True)
+            self.listener.start()
+            self.owner_pid = os.getpid()
+    
+    def prepare(self, record):
+        # Same process, so the record can cross the queue as-is; formatting happens on the listener thread
+        return record
+    
+    def enqueue(self, record):
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+    
+    def stop(self):
+        if self.listener is not None and self.owner_pid == os.getpid():
+            self.listener.stop()  # Drains the queue
+            self.listener = None
+            self.owner_pid = None
+
+log = logging.getLogger('tiktok_scraper')
+log.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+log.propagate = False
+log.addFilter(SamplingFilter())  # Sampled-out records never reach the queue
+_stdout_handler = logging.StreamHandler(sys.stdout)
+_stdout_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s [%(process)d %(threadName)s] %(message)s'))
+log_handler = BackgroundLogHandler(_stdout_handler)
+log.addHandler(log_handler)
+atexit.register(log_handler.stop)  # Registered first, so it runs after the other exit hooks have logged
+
 # PERFORMANCE: Caching system with diskcache
 CACHE_DIR = "cache"
 if not os.path.exists(CACHE_DIR):
@@ -46,20 +111,669 @@ profile_cache = dc.Cache(CACHE_DIR,
                          cull_limit=2000,  # Number of items to cull when limit is reached
                          )
 
-# PERFORMANCE: WebDriver Pool for concurrent processing
-from queue import Queue
+# Small file-backed store that gunicorn workers on the same host use to coordinate
+coordination_cache = dc.Cache(os.path.join(CACHE_DIR, 'coordination'))
+
+# OBSERVABILITY: Prometheus-style metrics, aggregated across gunicorn workers.
+# Each process keeps its own values and snapshots them into a shared diskcache every few seconds;
+# /metrics merges the snapshots (counters of exited workers are folded into an archive so totals never drop).
+import socket
 import threading
 
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class Metric:
+    def __init__(self, registry, kind, name, documentation, labelnames=(), buckets=None, aggregate='sum'):
+        self.registry = registry
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) if buckets else None
+        self.aggregate = aggregate  # How gauges from several workers combine: sum or max
+    
+    def _key(self, labels):
+        return (self.name, tuple(str(labels.get(label, '')) for label in self.labelnames))
+    
+    def inc(self, amount=1, **labels):
+        self.registry._add(self._key(labels), amount)
+    
+    def dec(self, amount=1, **labels):
+        self.registry._add(self._key(labels), -amount)
+    
+    def set(self, value, **labels):
+        self.registry._set(self._key(labels), value)
+    
+    def observe(self, value, **labels):
+        self.registry._observe(self._key(labels), self.buckets, value)
+
+class MetricsRegistry:
+    def __init__(self, store, flush_interval=METRICS_FLUSH_INTERVAL):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.lock = Lock()
+        self.metrics = {}  # name -> Metric, in registration order
+        self.values = {}  # (name, label values) -> counter or gauge value
+        self.histograms = {}  # (name, label values) -> [per-bucket counts..., +Inf count, sum]
+        self.collectors = []  # Called before each snapshot to refresh gauges
+        self.global_collectors = []  # Host-wide values computed once per scrape, e.g. job queue depth
+        self.owner_pid = None
+    
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Metric(self, 'counter', name, documentation, labelnames))
+    
+    def gauge(self, name, documentation, labelnames=(), aggregate='sum'):
+        return self._register(Metric(self, 'gauge', name, documentation, labelnames, aggregate=aggregate))
+    
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        return self._register(Metric(self, 'histogram', name, documentation, labelnames, buckets=buckets))
+    
+    def _register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+    
+    def _add(self, key, amount):
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+    
+    def _set(self, key, value):
+        with self.lock:
+            self.values[key] = value
+    
+    def _observe(self, key, buckets, value):
+        with self.lock:
+            counts = self.histograms.get(key)
+            if counts is None:
+                counts = self.histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[len(buckets)] += 1
+            counts[-1] += value
+    
+    def ensure_started(self):
+        """Start the snapshot thread once per process (gunicorn forks after --preload-app)"""
+        if self.owner_pid == os.getpid():
+            return
+        with self.lock:
+            if self.owner_pid == os.getpid():
+                return
+            self.owner_pid = os.getpid()
+            threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True).start()
+    
+    def _flush_loop(self):
+        while self.owner_pid == os.getpid():
+            time.sleep(self.flush_interval)
+            self.flush()
+    
+    def _snapshot_key(self, pid=None):
+        return f'metrics:{socket.gethostname()}:{pid or os.getpid()}'
+    
+    def flush(self):
+        """Write this process's values to the shared store"""
+        for collector in self.collectors:
+            try:
+                collector()
+            except Exception as e:
+                log.warning("⚠️ Metrics collector failed: %s", e)
+        with self.lock:
+            snapshot = {'values': dict(self.values), 'histograms': {k: list(v) for k, v in self.histograms.items()}}
+        try:
+            self.store.set(self._snapshot_key(), snapshot)
+        except Exception as e:
+            log.warning("⚠️ Could not write metrics snapshot: %s", e)
+    
+    def _merge(self, target, snapshot, include_gauges):
+        for key, value in snapshot.get('values', {}).items():
+            metric = self.metrics.get(key[0])
+            if metric is None:
+                continue
+            if metric.kind == 'gauge':
+                if not include_gauges:
+                    continue
+                if metric.aggregate == 'max':
+                    target['values'][key] = max(target['values'].get(key, value), value)
+                    continue
+            target['values'][key] = target['values'].get(key, 0) + value
+        for key, counts in snapshot.get('histograms', {}).items():
+            merged = target['histograms'].get(key)
+            if merged is None:
+                target['histograms'][key] = list(counts)
+            else:
+                target['histograms'][key] = [a + b for a, b in zip(merged, counts)]
+    
+    def collect(self):
+        """Merged values from every worker on this host"""
+        self.flush()
+        merged = {'values': {}, 'histograms': {}}
+        prefix = f'metrics:{socket.gethostname()}:'
+        try:
+            with self.store.transact():
+                for key in list(self.store.iterkeys()):
+                    if not isinstance(key, str) or not key.startswith(prefix):
+                        continue
+                    snapshot = self.store.get(key)
+                    if snapshot is None:
+                        continue
+                    pid = int(key[len(prefix):])
+                    if pid == os.getpid() or psutil.pid_exists(pid):
+                        self._merge(merged, snapshot, include_gauges=True)
+                    else:
+                        # Worker exited (e.g. --max-requests recycling): keep its counters, drop its gauges
+                        archive = self.store.get('metrics:archive', default={'values': {}, 'histograms': {}})
+                        self._merge(archive, snapshot, include_gauges=False)
+                        self.store.set('metrics:archive', archive)
+                        self.store.delete(key)
+                self._merge(merged, self.store.get('metrics:archive', default={}), include_gauges=False)
+        except Exception as e:
+            log.warning("⚠️ Could not read metrics snapshots: %s", e)
+        
+        for collector in self.global_collectors:
+            try:
+                for key, value in collector():
+                    merged['values'][key] = value
+            except Exception as e:
+                log.warning("⚠️ Metrics collector failed: %s", e)
+        return merged
+    
+    def render(self):
+        """Prometheus text exposition format"""
+        merged = self.collect()
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            if metric.kind == 'histogram':
+                for (name, label_values), counts in sorted(merged['histograms'].items()):
+                    if name != metric.name:
+                        continue
+                    labels = list(zip(metric.labelnames, label_values))
+                    cumulative = 0
+                    for bound, count in zip(list(metric.buckets) + ['+Inf'], counts[:-1]):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{self._format_labels(labels + [("le", bound)])} {cumulative}')
+                    lines.append(f'{name}_sum{self._format_labels(labels)} {counts[-1]}')
+                    lines.append(f'{name}_count{self._format_labels(labels)} {cumulative}')
+            else:
+                for (name, label_values), value in sorted(merged['values'].items()):
+                    if name == metric.name:
+                        lines.append(f'{name}{self._format_labels(list(zip(metric.labelnames, label_values)))} {value}')
+        return '\n'.join(lines) + '\n'
+    
+    def _format_labels(self, labels):
+        if not labels:
+            return ''
+        escaped = [(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for k, v in labels]
+        return '{' + ','.join(f'{k}="{v}"' for k, v in escaped) + '}'
+
+metrics_store = dc.Cache(os.path.join(CACHE_DIR, 'metrics'))
+metrics = MetricsRegistry(metrics_store)
+
+RESULTS_TOTAL = metrics.counter('tiktok_scraper_results_total', 'Username lookups by where the answer came from', ['source'])
+OUTCOMES_TOTAL = metrics.counter('tiktok_scraper_outcomes_total', 'Fresh scrapes by cached outcome class', ['outcome'])
+TIER_ATTEMPTS_TOTAL = metrics.counter('tiktok_scraper_tier_attempts_total', 'Requests/Selenium tier attempts by result', ['tier', 'result'])
+TIER_LATENCY = metrics.histogram('tiktok_scraper_tier_latency_seconds', 'Time spent in each scraping tier', ['tier'])
+CACHE_LOOKUPS_TOTAL = metrics.counter('tiktok_scraper_cache_lookups_total', 'Profile cache lookups by layer and result', ['layer', 'result'])
+HTTP_RESPONSES_TOTAL = metrics.counter('tiktok_scraper_http_responses_total', 'TikTok HTTP responses by status code (error = no response)', ['code'])
+DOWNLOADED_BYTES_TOTAL = metrics.counter('tiktok_scraper_downloaded_bytes_total', 'Profile page bytes on the wire and after decompression', ['kind'])
+RATE_LIMIT_DELAYS_TOTAL = metrics.counter('tiktok_scraper_rate_limit_delays_total', 'Requests that had to wait for the shared rate limiter')
+RATE_LIMIT_WAIT_SECONDS_TOTAL = metrics.counter('tiktok_scraper_rate_limit_wait_seconds_total', 'Time requests spent waiting for the shared rate limiter')
+WEBDRIVER_LEASES_TOTAL = metrics.counter('tiktok_scraper_webdriver_leases_total', 'Browser leases by result', ['result'])
+WEBDRIVER_LEASE_WAIT = metrics.histogram('tiktok_scraper_webdriver_lease_wait_seconds', 'Time waited for a browser lease')
+WEBDRIVER_RECYCLED_TOTAL = metrics.counter('tiktok_scraper_webdriver_recycled_total', 'Drivers replaced by reason', ['reason'])
+WEBDRIVER_DRIVERS = metrics.gauge('tiktok_scraper_webdriver_drivers', 'Live drivers in the in-process pools', ['state'])
+CIRCUIT_BREAKER_STATE = metrics.gauge('tiktok_scraper_circuit_breaker_state', 'HTTP circuit breaker: 0 closed, 1 half-open, 2 open (worst worker)', aggregate='max')
+BULK_PENDING_USERNAMES = metrics.gauge('tiktok_scraper_bulk_pending_usernames', 'Usernames in running bulk requests not yet answered')
+JOB_QUEUE_ITEMS = metrics.gauge('tiktok_scraper_job_queue_items', 'Usernames of unfinished background jobs by status', ['status'])
+
+# OBSERVABILITY: Per-request tracing - cheap timed spans through the scrape path, recent traces kept in a ring buffer
+# (per worker) and served slowest-first by /debug/traces
+import itertools
+import contextvars
+from contextlib import contextmanager
+from collections import deque
+
+TRACE_BUFFER_SIZE = int(os.environ.get('TRACE_BUFFER_SIZE', 1000))  # Finished traces kept per worker
+TRACE_SAMPLE_RATE = float(os.environ.get('TRACE_SAMPLE_RATE', 1.0))  # Share of requests traced
+
+current_trace = contextvars.ContextVar('current_trace', default=None)
+
+class Trace:
+    __slots__ = ('trace_id', 'name', 'attrs', 'started_at', 'start', 'duration', 'spans', 'depth')
+    
+    def __init__(self, trace_id, name, attrs):
+        self.trace_id = trace_id
+        self.name = name
+        self.attrs = attrs
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.duration = None
+        self.spans = []  # (name, offset from trace start, duration, nesting depth), in finishing order
+        self.depth = 0
+    
+    def to_dict(self):
+        return {
+            'trace_id': self.trace_id,
+            'name': self.name,
+            'attrs': self.attrs,
+            'started_at': self.started_at,
+            'duration_ms': round(self.duration * 1000, 2) if self.duration is not None else None,
+            'spans': [{'name': name, 'offset_ms': round(offset * 1000, 2), 'duration_ms': round(duration * 1000, 2), 'depth': depth}
+                      for name, offset, duration, depth in sorted(self.spans, key=lambda span: span[1])]
+        }
+
+class Tracer:
+    def __init__(self, size=TRACE_BUFFER_SIZE, sample_rate=TRACE_SAMPLE_RATE):
+        self.traces = deque(maxlen=size)
+        self.sample_rate = sample_rate
+        self.lock = Lock()
+        self.ids = itertools.count(1)
+    
+    def start(self, name, **attrs):
+        """New trace that isn't bound to the current context (for generators and batch-level work); pass it to finish()"""
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return None
+        return Trace(f'{os.getpid()}-{next(self.ids)}', name, attrs)
+    
+    def finish(self, trace):
+        if trace is not None:
+            trace.duration = time.perf_counter() - trace.start
+            with self.lock:
+                self.traces.append(trace)
+    
+    @contextmanager
+    def trace(self, name, **attrs):
+        """Root span for one request; inside a running trace (e.g. scrape_bio in a bulk worker) it is just a span"""
+        if current_trace.get() is not None:
+            with self.span(name):
+                yield current_trace.get()
+            return
+        trace = self.start(name, **attrs)
+        if trace is None:
+            yield None
+            return
+        token = current_trace.set(trace)
+        try:
+            yield trace
+        finally:
+            current_trace.reset(token)
+            self.finish(trace)
+    
+    @contextmanager
+    def span(self, name, trace=None):
+        """Time a stage of the current trace (no-op when the request isn't traced)"""
+        trace = trace or current_trace.get()
+        if trace is None:
+            yield
+            return
+        started = time.perf_counter()
+        trace.depth += 1
+        try:
+            yield
+        finally:
+            trace.depth -= 1
+            trace.spans.append((name, started - trace.start, time.perf_counter() - started, trace.depth))
+    
+    def annotate(self, **attrs):
+        trace = current_trace.get()
+        if trace is not None:
+            trace.attrs.update(attrs)
+    
+    def slowest(self, limit=20, name=None):
+        with self.lock:
+            traces = [t for t in self.traces if name is None or t.name == name]
+        return [t.to_dict() for t in sorted(traces, key=lambda t: t.duration, reverse=True)[:limit]]
+    
+    def stage_summary(self):
+        """Per-stage time across the buffered traces - where the time goes on average and in the tail"""
+        with self.lock:
+            traces = list(self.traces)
+        durations = {}
+        for trace in traces:
+            for name, _, duration, _ in trace.spans:
+                durations.setdefault(name, []).append(duration)
+        summary = {}
+        for name, values in durations.items():
+            values.sort()
+            summary[name] = {
+                'count': len(values),
+                'total_ms': round(sum(values) * 1000, 1),
+                'p50_ms': round(values[len(values) // 2] * 1000, 2),
+                'p95_ms': round(values[min(len(values) - 1, int(len(values) * 0.95))] * 1000, 2),
+                'max_ms': round(values[-1] * 1000, 2)
+            }
+        return dict(sorted(summary.items(), key=lambda item: item[1]['total_ms'], reverse=True))
+
+tracer = Tracer()
+
+# OBSERVABILITY: Opt-in sampling profiler - samples every thread's stack for a time window and returns
+# collapsed stacks ("frame;frame;frame count"), the input format of flamegraph.pl and speedscope
+PROFILER_ENABLED = os.environ.get('PROFILER_ENABLED', '0') == '1'
+PROFILER_MAX_SECONDS = 60
+
+class SamplingProfiler:
+    def __init__(self):
+        self.lock = Lock()  # One profile at a time per worker
+    
+    def _frame_name(self, frame):
+        code = frame.f_code
+        return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+    
+    def profile(self, seconds, interval=0.005):
+        """Blocks for `seconds`; returns collapsed stacks or None if another profile is running"""
+        if not self.lock.acquire(blocking=False):
+            return None
+        try:
+            counts = {}
+            own_thread = threading.get_ident()
+            thread_names = {}
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                if len(thread_names) != threading.active_count():
+                    thread_names = {t.ident: t.name for t in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_thread:
+                        continue
+                    stack = []
+                    while frame is not None:
+                        stack.append(self._frame_name(frame))
+                        frame = frame.f_back
+                    # Group by thread pool name (ThreadPoolExecutor-0_3 -> ThreadPoolExecutor-0) so stacks merge
+                    root = re.sub(r'_\d+$', '', thread_names.get(thread_id, 'thread'))
+                    key = ';'.join([root] + stack[::-1])
+                    counts[key] = counts.get(key, 0) + 1
+                time.sleep(interval)
+            return '\n'.join(f'{stack} {count}' for stack, count in sorted(counts.items())) + '\n'
+        finally:
+            self.lock.release()
+
+sampling_profiler = SamplingProfiler()
+
+# PERFORMANCE: In-process L1 cache in front of profile_cache (skips SQLite + unpickling for repeat lookups)
+from collections import OrderedDict
+
+L1_CACHE_MAX_ITEMS = int(os.environ.get('L1_CACHE_MAX_ITEMS', 10000))
+L1_CACHE_TTL = float(os.environ.get('L1_CACHE_TTL', 300))  # Seconds; entries never outlive their L2 expiry
+L1_GENERATION_CHECK_INTERVAL = 1.0  # How often to look for a /clear-cache from another worker
+
+class MemoryCache:
+    def __init__(self, max_items=L1_CACHE_MAX_ITEMS, ttl=L1_CACHE_TTL, generation_store=coordination_cache,
+                 generation_key='profile_cache:generation'):
+        self.items = OrderedDict()  # key -> (value, expire_at), least recently used first
+        self.max_items = max_items
+        self.ttl = ttl
+        self.lock = Lock()
+        self.generation_store = generation_store
+        self.generation_key = generation_key
+        self.generation = None
+        self.generation_checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def _check_generation(self):
+        """Drop everything if any worker cleared the shared cache (called with the lock held)"""
+        now = time.monotonic()
+        if now - self.generation_checked_at < L1_GENERATION_CHECK_INTERVAL:
+            return
+        self.generation_checked_at = now
+        try:
+            generation = self.generation_store.get(self.generation_key, default=0)
+        except Exception:
+            return
+        if generation != self.generation:
+            self.items.clear()
+            self.generation = generation
+    
+    def get(self, key):
+        with self.lock:
+            self._check_generation()
+            entry = self.items.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expire_at = entry
+            if expire_at <= time.time():
+                del self.items[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.items.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key, value, expire_at=None):
+        """Store value until expire_at (absolute time, usually the L2 expiry), capped at the L1 TTL"""
+        expire_at = min(expire_at or float('inf'), time.time() + self.ttl)
+        with self.lock:
+            self._check_generation()
+            self.items[key] = (value, expire_at)
+            self.items.move_to_end(key)
+            while len(self.items) > self.max_items:
+                self.items.popitem(last=False)
+                self.evictions += 1
+    
+    def delete(self, key):
+        with self.lock:
+            self.items.pop(key, None)
+    
+    def clear(self):
+        """Clear this process and bump the shared generation so other workers clear too"""
+        with self.lock:
+            count = len(self.items)
+            self.items.clear()
+            try:
+                self.generation = self.generation_store.incr(self.generation_key)
+            except Exception as e:
+                log.warning("⚠️ Could not broadcast L1 cache clear: %s", e)
+            return count
+    
+    def get_stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'items': len(self.items),
+                'max_items': self.max_items,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate_percent': round(self.hits / lookups * 100, 1) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+profile_memory_cache = MemoryCache()
+
+def get_cached_profile(username):
+    """Cached profile dict from L1 memory, falling back to the diskcache L2; None on miss or expiry"""
+    cached = profile_memory_cache.get(username)
+    if cached is not None:
+        CACHE_LOOKUPS_TOTAL.inc(layer='memory', result='hit')
+        return cached
+    CACHE_LOOKUPS_TOTAL.inc(layer='memory', result='miss')
+    
+    # cached_result is a (value, expire_time) tuple
+    cached_result = profile_cache.get(username, expire_time=True)
+    if cached_result is not None and cached_result[0] is not None and cached_result[1] is not None and cached_result[1] > time.time():
+        CACHE_LOOKUPS_TOTAL.inc(layer='disk', result='hit')
+        profile_memory_cache.set(username, cached_result[0], cached_result[1])
+        return cached_result[0]
+    CACHE_LOOKUPS_TOTAL.inc(layer='disk', result='miss')
+    return None
+
+def get_cached_profiles(usernames):
+    """Batched get_cached_profile: {username: profile dict} for every hit, L2 misses read in one SQLite transaction"""
+    found = {}
+    disk_keys = []
+    for username in usernames:
+        cached = profile_memory_cache.get(username)
+        if cached is not None:
+            found[username] = cached
+        else:
+            disk_keys.append(username)
+    CACHE_LOOKUPS_TOTAL.inc(len(found), layer='memory', result='hit')
+    CACHE_LOOKUPS_TOTAL.inc(len(disk_keys), layer='memory', result='miss')
+    if not disk_keys:
+        return found
+    
+    now = time.time()
+    disk_found = {}  # username -> (value, expire_time)
+    with profile_cache.transact():
+        for username in disk_keys:
+            cached_result = profile_cache.get(username, expire_time=True)
+            if cached_result is not None and cached_result[0] is not None and cached_result[1] is not None and cached_result[1] > now:
+                disk_found[username] = cached_result
+    for username, (value, expire_at) in disk_found.items():
+        profile_memory_cache.set(username, value, expire_at)
+        found[username] = value
+    CACHE_LOOKUPS_TOTAL.inc(len(disk_found), layer='disk', result='hit')
+    CACHE_LOOKUPS_TOTAL.inc(len(disk_keys) - len(disk_found), layer='disk', result='miss')
+    return found
+
+def set_cached_profile(username, cache_data, expire):
+    """Write through to both cache layers"""
+    profile_cache.set(username, cache_data, expire=expire)
+    profile_memory_cache.set(username, cache_data, time.time() + expire)
+
+# PERFORMANCE: Outcome-aware cache TTLs - stable bios stay cached, failures come back quickly
+CACHE_TTLS = {
+    'success': int(os.environ.get('CACHE_TTL_SUCCESS', 86400)),
+    'no_bio': int(os.environ.get('CACHE_TTL_NO_BIO', 43200)),
+    'not_found': int(os.environ.get('CACHE_TTL_NOT_FOUND', 21600)),
+    'login_wall': int(os.environ.get('CACHE_TTL_LOGIN_WALL', 1800)),
+    'transient': int(os.environ.get('CACHE_TTL_TRANSIENT', 300)),
+}
+NEGATIVE_OUTCOMES = ('not_found', 'login_wall', 'transient')
+
+def cached_outcome(cache_data):
+    """Outcome of a cache entry (entries written before outcomes existed only have a bio)"""
+    return cache_data.get('outcome') or ('success' if cache_data.get('bio') else 'transient')
+
+def cache_scrape_result(username, bio, method_used, outcome):
+    """Cache a scrape result with the TTL for its outcome.
+    Negative results never replace a cached bio - a refresh that hits a 429 keeps the old data."""
+    OUTCOMES_TOTAL.inc(outcome=outcome)
+    ttl = CACHE_TTLS.get(outcome, CACHE_TTLS['transient'])
+    if ttl <= 0:
+        return
+    if outcome in NEGATIVE_OUTCOMES:
+        existing = get_cached_profile(username)
+        if existing is not None and cached_outcome(existing) not in NEGATIVE_OUTCOMES:
+            log.debug("💾 Keeping cached bio for %s (%s result not cached)", username, outcome)
+            return
+    
+    cache_data = {
+        'bio': bio if outcome not in NEGATIVE_OUTCOMES else None,
+        'scraped_at': time.time(),
+        'username': username,
+        'method': method_used,
+        'outcome': outcome
+    }
+    # set() is thread-safe and writes to disk/memory
+    set_cached_profile(username, cache_data, expire=ttl)
+
+# PERFORMANCE: WebDriver Pool for concurrent processing
+
+WEBDRIVER_POOL_SIZE = int(os.environ.get('WEBDRIVER_POOL_SIZE', 20))  # Hard cap on Chromes per process
+WEBDRIVER_PREWARM = int(os.environ.get('WEBDRIVER_PREWARM', 0))  # Drivers to keep started ahead of demand
+WEBDRIVER_MAX_PAGE_LOADS = int(os.environ.get('WEBDRIVER_MAX_PAGE_LOADS', 200))  # Recycle after this many leases
+WEBDRIVER_MAX_RSS_MB = int(os.environ.get('WEBDRIVER_MAX_RSS_MB', 1024))  # Recycle when chromedriver + Chrome use more
+WEBDRIVER_HEALTH_CHECK_INTERVAL = float(os.environ.get('WEBDRIVER_HEALTH_CHECK_INTERVAL', 30))
+SELENIUM_EXTRACT_TIMEOUT = float(os.environ.get('SELENIUM_EXTRACT_TIMEOUT', 5))  # Total seconds to wait for the bio after the page loads
+
+# PERFORMANCE: Chrome options, CDP resource blocking and driver creation live in a side-effect-free module,
+# so scripts/browser_broker.py can start drivers without importing the app
+try:
+    from src.webdriver_factory import SELENIUM_BLOCK_RESOURCES, blocked_url_category, create_driver
+except ImportError:  # Run as python src/app.py
+    from webdriver_factory import SELENIUM_BLOCK_RESOURCES, blocked_url_category, create_driver
+
+class BrowserResourceStats:
+    """Per-page and running totals of requests Chrome blocked, read from the driver's performance log"""
+    def __init__(self):
+        self.lock = Lock()
+        self.pages = 0
+        self.blocked = {}
+        self.transferred_bytes = 0
+    
+    def record_page(self, driver):
+        """Drain the driver's network log for the page just loaded; returns that page's summary"""
+        try:
+            entries = driver.get_log('performance')
+        except Exception:
+            return None
+        
+        urls = {}
+        blocked = {}
+        transferred = 0
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (ValueError, KeyError, TypeError):
+                continue
+            method = message.get('method')
+            params = message.get('params', {})
+            if method == 'Network.requestWillBeSent':
+                urls[params.get('requestId')] = params.get('request', {}).get('url', '')
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                category = blocked_url_category(urls.get(params.get('requestId'), ''))
+                blocked[category] = blocked.get(category, 0) + 1
+            elif method == 'Network.loadingFinished':
+                transferred += params.get('encodedDataLength') or 0
+        
+        with self.lock:
+            self.pages += 1
+            self.transferred_bytes += transferred
+            for category, count in blocked.items():
+                self.blocked[category] = self.blocked.get(category, 0) + count
+        return {'blocked': blocked, 'blocked_requests': sum(blocked.values()), 'transferred_bytes': transferred}
+    
+    def get_stats(self):
+        with self.lock:
+            blocked_requests = sum(self.blocked.values())
+            return {
+                'policy': SELENIUM_BLOCK_RESOURCES,
+                'pages': self.pages,
+                'blocked_requests': blocked_requests,
+                'blocked_by_category': dict(self.blocked),
+                'avg_blocked_per_page': round(blocked_requests / self.pages, 1) if self.pages else 0.0,
+                'transferred_mb': round(self.transferred_bytes / (1024 * 1024), 2),
+                'avg_transferred_kb_per_page': round(self.transferred_bytes / self.pages / 1024, 1) if self.pages else 0.0
+            }
+
+browser_resource_stats = BrowserResourceStats()
+
 class WebDriverPool:
-    def __init__(self, pool_size=10):
-        self.pool = Queue(maxsize=pool_size)
+    def __init__(self, pool_size=10, min_size=0, max_page_loads=WEBDRIVER_MAX_PAGE_LOADS,
+                 max_rss_mb=WEBDRIVER_MAX_RSS_MB, health_check_interval=WEBDRIVER_HEALTH_CHECK_INTERVAL):
+        self.pool = Queue(maxsize=pool_size)  # Idle drivers
         self.pool_size = pool_size
+        self.min_size = min(min_size, pool_size)
+        self.max_page_loads = max_page_loads
+        self.max_rss_mb = max_rss_mb
+        self.health_check_interval = health_check_interval
         self.drivers_created = 0
         self.pool_lock = Lock()
         
+        # BOUNDED: every live driver (idle ones included) is created under a lease slot,
+        # so there are never more than pool_size drivers
+        self.slots = threading.BoundedSemaphore(pool_size)
+        self.driver_info = {}  # id(driver) -> {'created_at', 'page_loads'}
+        self.owner_pid = None
+        
+        self.leases = 0
+        self.lease_timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.recycled = {'page_loads': 0, 'memory': 0, 'unhealthy': 0}
+        
         # LAZY LOADING: Don't pre-create drivers - create them on demand
         # This enables instant startup while maintaining functionality
-        print(f"WebDriver pool initialized (lazy loading, max {pool_size} drivers)")
+        log.info("WebDriver pool initialized (lazy loading, max %s drivers)", pool_size)
     
     def _is_driver_valid(self, driver):
         """Check if driver session is still valid"""
@@ -73,207 +787,1162 @@ class WebDriverPool:
             return False
     
     def _create_driver(self):
-        try:
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--disable-web-security')
-            chrome_options.add_argument('--allow-running-insecure-content')
-            chrome_options.add_argument('--disable-logging')
-            chrome_options.add_argument('--log-level=3')
-            chrome_options.add_argument('--disable-extensions')
-            chrome_options.add_argument('--disable-plugins')
-            chrome_options.add_argument('--disable-images')
-            # Removed --disable-javascript as it breaks TikTok functionality
-            chrome_options.add_argument('--disable-css')
-            chrome_options.add_argument('--enable-unsafe-swiftshader')
-            chrome_options.add_argument('--disable-webgl')
-            chrome_options.add_argument('--disable-accelerated-2d-canvas')
-            chrome_options.add_argument('--no-first-run')
-            chrome_options.add_argument('--disable-default-apps')
-            chrome_options.add_argument('--disable-background-timer-throttling')
-            chrome_options.add_argument('--disable-backgrounding-occluded-windows')
-            chrome_options.add_argument('--disable-renderer-backgrounding')
-            
-            # Additional speed optimizations
-            chrome_options.add_argument('--disable-background-networking')
-            chrome_options.add_argument('--disable-sync')
-            chrome_options.add_argument('--disable-translate')
-            chrome_options.add_argument('--disable-features=TranslateUI')
-            chrome_options.add_argument('--disable-features=VizDisplayCompositor')
-            chrome_options.add_argument('--disable-hang-monitor')
-            chrome_options.add_argument('--disable-prompt-on-repost')
-            chrome_options.add_argument('--disable-domain-reliability')
-            chrome_options.add_argument('--aggressive-cache-discard')
-            chrome_options.add_argument('--disable-component-extensions-with-background-pages')
-            chrome_options.add_argument('--disable-software-rasterizer')
-            chrome_options.add_argument('--disable-features=TranslateUI')
-            chrome_options.add_argument('--disable-ipc-flooding-protection')
-            chrome_options.add_argument('--hide-scrollbars')
-            chrome_options.add_argument('--mute-audio')
-            
-            # Try multiple methods to create driver
-            driver = None
-            
-            # Method 1: Try with ChromeDriverManager
-            try:
-                from selenium.webdriver.chrome.service import Service
-                service = Service(ChromeDriverManager().install())
-                driver = webdriver.Chrome(service=service, options=chrome_options)
-                print("WebDriver created with ChromeDriverManager")
-            except Exception as e:
-                print(f"ChromeDriverManager failed: {e}")
-                
-                # Method 2: Try without service (system PATH)
-                try:
-                    driver = webdriver.Chrome(options=chrome_options)
-                    print("WebDriver created with system Chrome")
-                except Exception as e2:
-                    print(f"System Chrome failed: {e2}")
-                    
-                    # Method 3: Try with different Chrome binary path
-                    try:
-                        chrome_options.binary_location = r"C:\Program Files\Google\Chrome\Application\chrome.exe"
-                        driver = webdriver.Chrome(options=chrome_options)
-                        print("WebDriver created with specific Chrome path")
-                    except Exception as e3:
-                        print(f"Specific Chrome path failed: {e3}")
-                        return None
-            
-            if driver:
-                driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        driver = create_driver()
+        if driver:
+            with self.pool_lock:
                 self.drivers_created += 1
-                return driver
-            else:
-                return None
-                
-        except Exception as e:
-            print(f"Failed to create WebDriver: {e}")
-            return None
+        return driver
+    
+    def ensure_started(self):
+        """Start the health-check thread once per process (gunicorn forks after --preload-app)"""
+        if self.owner_pid == os.getpid():
+            return
+        with self.pool_lock:
+            if self.owner_pid == os.getpid():
+                return
+            self.owner_pid = os.getpid()
+            threading.Thread(target=self._maintain, name='webdriver-pool-health', daemon=True).start()
     
     def get_driver(self, timeout=30):
+        """Lease a driver, waiting up to timeout seconds for a free slot; None if none frees up"""
+        self.ensure_started()
+        started = time.monotonic()
+        if not self.slots.acquire(timeout=timeout):
+            with self.pool_lock:
+                self.lease_timeouts += 1
+            WEBDRIVER_LEASES_TOTAL.inc(result='timeout')
+            browser_concurrency.signal_congestion('lease_timeout')
+            log.warning("⏳ WebDriver pool exhausted (%s drivers busy), gave up after %ss", self.pool_size, timeout)
+            return None
+        waited = time.monotonic() - started
+        with self.pool_lock:
+            self.leases += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        WEBDRIVER_LEASES_TOTAL.inc(result='leased')
+        WEBDRIVER_LEASE_WAIT.observe(waited)
+        
         try:
-            # Try to get existing driver from pool
-            driver = self.pool.get(timeout=timeout)
-            
-            # Validate the driver before returning it
-            if self._is_driver_valid(driver):
-                return driver
-            else:
-                # Driver is invalid, close it and create a new one
-                print("Driver session invalid, creating new one")
+            driver = self.pool.get_nowait()
+        except Empty:
+            driver = None
+        
+        # Validate the driver before returning it
+        if driver is not None and not self._is_driver_valid(driver):
+            log.warning("Driver session invalid, creating new one")
+            self._retire(driver, 'unhealthy')
+            driver = None
+        
+        if driver is None:
+            # LAZY LOADING: Create driver on demand, inside the slot we hold
+            driver = self._create_tracked_driver()
+            if driver is None:
+                self.slots.release()
+        return driver
+    
+    def return_driver(self, driver):
+        """Give a leased driver back; recycles it once it has served max_page_loads leases"""
+        if not driver:
+            return
+        with self.pool_lock:
+            info = self.driver_info.get(id(driver))
+            if info:
+                info['page_loads'] += 1
+        if info and info['page_loads'] >= self.max_page_loads:
+            log.info("♻️ Recycling WebDriver after %s page loads", info['page_loads'])
+            self._retire(driver, 'page_loads')
+        else:
+            self.pool.put_nowait(driver)
+        self.slots.release()
+    
+    def discard_driver(self, driver):
+        """Drop a leased driver whose session broke, freeing its slot"""
+        if driver:
+            self._retire(driver, 'unhealthy')
+            self.slots.release()
+    
+    def _create_tracked_driver(self):
+        driver = self._create_driver()
+        if driver is not None:
+            with self.pool_lock:
+                self.driver_info[id(driver)] = {'created_at': time.time(), 'page_loads': 0}
+        return driver
+    
+    def _retire(self, driver, reason):
+        with self.pool_lock:
+            self.driver_info.pop(id(driver), None)
+            self.recycled[reason] += 1
+        WEBDRIVER_RECYCLED_TOTAL.inc(reason=reason)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    
+    def _process_tree_rss_mb(self, driver):
+        """RSS of the driver's chromedriver process plus every Chrome process under it"""
+        try:
+            root = psutil.Process(driver.service.process.pid)
+            total = 0
+            for proc in [root] + root.children(recursive=True):
                 try:
-                    driver.quit()
-                except:
+                    total += proc.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
                     pass
-                return self._create_driver()
-        except:
-            # LAZY LOADING: Create driver on demand if pool is empty
-            if self.drivers_created < self.pool_size:
-                driver = self._create_driver()
-                if driver:
-                    return driver
+            return total / (1024 * 1024)
+        except Exception:
+            return None
+    
+    def _maintain(self):
+        """Background loop: health-check and memory-check idle drivers, then top up to min_size"""
+        while self.owner_pid == os.getpid():
+            self._check_idle_drivers()
+            self._prewarm()
+            time.sleep(self.health_check_interval)
+    
+    def _check_idle_drivers(self):
+        for _ in range(self.pool.qsize()):
+            # Hold a slot while a driver is out of the idle queue so leases can't create a replacement meanwhile
+            if not self.slots.acquire(blocking=False):
+                return
+            try:
+                driver = self.pool.get_nowait()
+            except Empty:
+                self.slots.release()
+                return
             
-            # If we've reached max drivers, create temporary one
-            return self._create_driver()
+            if not self._is_driver_valid(driver):
+                log.warning("🩺 Idle WebDriver failed health check, dropping it")
+                self._retire(driver, 'unhealthy')
+            else:
+                rss_mb = self._process_tree_rss_mb(driver)
+                if rss_mb is not None and rss_mb > self.max_rss_mb:
+                    log.info("♻️ Recycling WebDriver using %.0f MB (limit %s MB)", rss_mb, self.max_rss_mb)
+                    self._retire(driver, 'memory')
+                else:
+                    self.pool.put_nowait(driver)
+            self.slots.release()
     
-    def return_driver(self, driver):
-        if driver:
+    def _prewarm(self):
+        while len(self.driver_info) < self.min_size:
+            if not self.slots.acquire(blocking=False):
+                return
             try:
-                # Try to return driver to pool if there's space
+                driver = self._create_tracked_driver()
+                if driver is None:
+                    return
                 self.pool.put_nowait(driver)
+            finally:
+                self.slots.release()
+    
+    def get_stats(self):
+        with self.pool_lock:
+            return {
+                'mode': 'local',
+                'max_drivers': self.pool_size,
+                'drivers': len(self.driver_info),
+                'idle': self.pool.qsize(),
+                'min_size': self.min_size,
+                'drivers_created': self.drivers_created,
+                'leases': self.leases,
+                'lease_timeouts': self.lease_timeouts,
+                'avg_wait_seconds': round(self.total_wait_seconds / self.leases, 3) if self.leases else 0.0,
+                'max_wait_seconds': round(self.max_wait_seconds, 3),
+                'recycled': dict(self.recycled)
+            }
+    
+    def close_all(self):
+        """Enhanced cleanup method to prevent threading issues"""
+        self.owner_pid = None  # Stops the health-check loop
+        while not self.pool.empty():
+            try:
+                driver = self.pool.get_nowait()
+                driver.quit()
             except:
-                # Pool is full, close the driver
+                break
+        with self.pool_lock:
+            self.driver_info.clear()
+        
+        # Additional cleanup for any lingering Chrome processes
+        try:
+            import psutil
+            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
                 try:
-                    driver.quit()
-                except:
+                    if proc.info['name'] and 'chrome' in proc.info['name'].lower():
+                        cmdline = proc.info.get('cmdline', [])
+                        if cmdline and any('headless' in str(arg).lower() for arg in cmdline):
+                            proc.terminate()
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
                     pass
+        except ImportError:
+            pass  # psutil not available
+        except Exception:
+            pass  # Ignore any cleanup errors
+
+# PERFORMANCE: Shared browser broker - one bounded set of Chromes for all gunicorn workers on the host
+BROWSER_BROKER_ADDRESS = os.environ.get('BROWSER_BROKER_ADDRESS', '')  # host:port of scripts/browser_broker.py, empty = in-process pool
+
+class BrokerConnection:
+    """Newline-delimited JSON over a local TCP socket; one connection holds at most one lease"""
+    def __init__(self, address, timeout=5):
+        host, port = address.rsplit(':', 1)
+        self.sock = socket.create_connection((host, int(port)), timeout=timeout)
+        self.file = self.sock.makefile('rwb')
+    
+    def call(self, message, timeout=None):
+        self.sock.settimeout(timeout)
+        self.file.write(json.dumps(message).encode('utf-8') + b'\n')
+        self.file.flush()
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError('browser broker closed the connection')
+        return json.loads(line)
+    
+    def close(self):
+        for closable in (self.file, self.sock):
+            try:
+                closable.close()
+            except Exception:
+                pass
+
+class BrokeredDriver(webdriver.Remote):
+    """Remote driver attached to a Chrome session leased from the browser broker"""
+    def __init__(self, lease, connection):
+        self._lease = lease
+        self._broker_connection = connection
+        super().__init__(command_executor=lease['executor_url'], options=Options())
+    
+    def start_session(self, capabilities):
+        # Attach to the broker's session instead of launching a browser
+        self.session_id = self._lease['session_id']
+        self.caps = self._lease.get('capabilities') or {}
+    
+    def release(self, discard=False):
+        """Give the session back to the broker (discard=True makes it replace the browser)"""
+        connection, self._broker_connection = self._broker_connection, None
+        if connection is None:
+            return
+        try:
+            connection.call({'op': 'release', 'discard': discard}, timeout=5)
+        except Exception as e:
+            log.warning("⚠️ Browser broker release failed: %s", e)
+        finally:
+            connection.close()
+            self.command_executor.close()
+    
+    def quit(self):
+        # The broker owns the browser process - quitting here means "this session is broken"
+        self.release(discard=True)
+
+class BrowserBrokerPool:
+    """WebDriverPool interface backed by scripts/browser_broker.py"""
+    def __init__(self, address=BROWSER_BROKER_ADDRESS, connect_timeout=5):
+        self.address = address
+        self.connect_timeout = connect_timeout
+        log.info("WebDriver pool using browser broker at %s", address)
+    
+    def get_driver(self, timeout=30):
+        connection = None
+        started = time.monotonic()
+        try:
+            connection = BrokerConnection(self.address, self.connect_timeout)
+            lease = connection.call({'op': 'lease', 'timeout': timeout}, timeout=timeout + self.connect_timeout)
+            if not lease.get('ok'):
+                log.warning("Browser broker lease failed: %s", lease.get('error'))
+                WEBDRIVER_LEASES_TOTAL.inc(result='timeout')
+                browser_concurrency.signal_congestion('lease_timeout')
+                connection.close()
+                return None
+            WEBDRIVER_LEASES_TOTAL.inc(result='leased')
+            WEBDRIVER_LEASE_WAIT.observe(time.monotonic() - started)
+            return BrokeredDriver(lease, connection)
+        except Exception as e:
+            log.error("Browser broker unavailable: %s", e)
+            WEBDRIVER_LEASES_TOTAL.inc(result='error')
+            if connection:
+                connection.close()
+            return None
+    
+    def _create_driver(self):
+        return self.get_driver()
+    
+    def return_driver(self, driver):
+        if driver:
+            driver.release()
+    
+    def discard_driver(self, driver):
+        if driver:
+            driver.release(discard=True)
+    
+    def get_stats(self):
+        connection = None
+        try:
+            connection = BrokerConnection(self.address, self.connect_timeout)
+            return dict(connection.call({'op': 'stats'}, timeout=self.connect_timeout), mode='broker')
+        except Exception as e:
+            return {'ok': False, 'error': str(e)}
+        finally:
+            if connection:
+                connection.close()
     
     def close_all(self):
-        """Enhanced cleanup method to prevent threading issues"""
-        while not self.pool.empty():
+        pass  # Browsers belong to the broker process
+
+# Playwright browser pool removed
+
+# Initialize WebDriver pool with error handling
+try:
+    if BROWSER_BROKER_ADDRESS:
+        webdriver_pool = BrowserBrokerPool(BROWSER_BROKER_ADDRESS)
+    else:
+        webdriver_pool = WebDriverPool(pool_size=WEBDRIVER_POOL_SIZE, min_size=WEBDRIVER_PREWARM)
+    log.info("WebDriver pool initialized successfully")
+except Exception as e:
+    log.error("WebDriver pool initialization failed: %s", e)
+    log.warning("App will run in requests-only mode (no Selenium fallback)")
+    webdriver_pool = None
+
+def collect_webdriver_metrics():
+    if isinstance(webdriver_pool, WebDriverPool):
+        with webdriver_pool.pool_lock:
+            drivers = len(webdriver_pool.driver_info)
+        idle = webdriver_pool.pool.qsize()
+        WEBDRIVER_DRIVERS.set(idle, state='idle')
+        WEBDRIVER_DRIVERS.set(max(0, drivers - idle), state='leased')
+
+metrics.collectors.append(collect_webdriver_metrics)
+
+app = Flask(__name__)
+
+# PERFORMANCE: Flask optimization for better threading
+app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0  # Disable caching for development
+
+# PERFORMANCE: CPU Monitoring System (no throttling) - one background thread per process samples CPU, memory,
+# disk and process counts into a ring buffer; hot paths and /system-stats only read the latest snapshot
+SYSTEM_SAMPLE_INTERVAL = float(os.environ.get('SYSTEM_SAMPLE_INTERVAL', 1.0))  # Seconds between samples
+SYSTEM_SAMPLE_HISTORY = int(os.environ.get('SYSTEM_SAMPLE_HISTORY', 60))  # Samples kept
+
+class CPUMonitor:
+    def __init__(self, check_interval=SYSTEM_SAMPLE_INTERVAL, max_history=SYSTEM_SAMPLE_HISTORY):
+        self.check_interval = check_interval
+        self.samples = deque(maxlen=max_history)
+        self.lock = Lock()
+        self.owner_pid = None
+    
+    def ensure_started(self):
+        """Start the sampler thread once per process (gunicorn forks after --preload-app)"""
+        if self.owner_pid == os.getpid():
+            return
+        with self.lock:
+            if self.owner_pid == os.getpid():
+                return
+            self.owner_pid = os.getpid()
+            psutil.cpu_percent(interval=None)  # Prime the counters; later calls measure since the previous one
+            threading.Thread(target=self._run, name='system-sampler', daemon=True).start()
+    
+    def _run(self):
+        while self.owner_pid == os.getpid():
+            time.sleep(self.check_interval)
+            try:
+                self._sample()
+            except Exception as e:
+                log.warning("⚠️ System sampling failed: %s", e)
+    
+    def _sample(self):
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage('/')
+        process = psutil.Process()
+        sample = {
+            'time': time.time(),
+            'cpu_percent': psutil.cpu_percent(interval=None),  # Average since the previous sample, never blocks
+            'memory': memory,
+            'disk': disk,
+            'process_count': len(psutil.pids()),
+            'process_rss_mb': round(process.memory_info().rss / (1024 * 1024), 1),
+            'process_threads': process.num_threads(),
+            'boot_time': psutil.boot_time()
+        }
+        with self.lock:
+            self.samples.append(sample)
+        return sample
+    
+    def latest(self):
+        """Most recent snapshot; the first call in a process takes one (CPU reads 0 until the sampler has run)"""
+        self.ensure_started()
+        with self.lock:
+            if self.samples:
+                return self.samples[-1]
+        return self._sample()
+    
+    def get_cpu_usage(self):
+        """Get current CPU usage percentage"""
+        return self.latest()['cpu_percent']
+    
+    def get_cpu_history(self):
+        """Get CPU usage history for monitoring"""
+        self.ensure_started()
+        with self.lock:
+            return [sample['cpu_percent'] for sample in self.samples]
+    
+    def get_optimal_workers(self, base_workers=None):
+        """Worker threads for a bulk run: enough to fill the current HTTP and browser concurrency limits.
+        The limits themselves are enforced per tier, so extra threads just wait for a slot."""
+        return max(1, int(http_concurrency.limit) + int(browser_concurrency.limit))
+    
+    def under_pressure(self):
+        """'cpu' or 'memory' when the latest sample is above its AIMD threshold, else None"""
+        with self.lock:
+            sample = self.samples[-1] if self.samples else None
+        if sample is None:
+            return None
+        if sample['cpu_percent'] >= AIMD_CPU_HIGH:
+            return 'cpu'
+        if sample['memory'].percent >= AIMD_MEMORY_HIGH:
+            return 'memory'
+        return None
+
+# Initialize CPU monitor
+cpu_monitor = CPUMonitor()
+
+# PERFORMANCE: AIMD adaptive concurrency - like TCP congestion control, each tier's limit grows by about one slot
+# per limit's worth of healthy completions and is cut multiplicatively on 429s, errors, timeouts, slow calls or
+# CPU/memory pressure (at most once per typical call duration, so one burst of failures counts as one signal)
+AIMD_HTTP_INITIAL = float(os.environ.get('AIMD_HTTP_INITIAL', 10))
+AIMD_HTTP_MIN = int(os.environ.get('AIMD_HTTP_MIN', 1))
+AIMD_HTTP_MAX = int(os.environ.get('AIMD_HTTP_MAX', 20))
+AIMD_HTTP_LATENCY_TARGET = float(os.environ.get('AIMD_HTTP_LATENCY_TARGET', 5))  # Slower requests count as congestion
+AIMD_BROWSER_INITIAL = float(os.environ.get('AIMD_BROWSER_INITIAL', 4))
+AIMD_BROWSER_MIN = int(os.environ.get('AIMD_BROWSER_MIN', 1))
+AIMD_BROWSER_MAX = int(os.environ.get('AIMD_BROWSER_MAX', WEBDRIVER_POOL_SIZE))
+AIMD_BROWSER_LATENCY_TARGET = float(os.environ.get('AIMD_BROWSER_LATENCY_TARGET', 20))
+AIMD_DECREASE_FACTOR = float(os.environ.get('AIMD_DECREASE_FACTOR', 0.7))
+AIMD_CPU_HIGH = float(os.environ.get('AIMD_CPU_HIGH', 90))  # Percent
+AIMD_MEMORY_HIGH = float(os.environ.get('AIMD_MEMORY_HIGH', 90))  # Percent
+AIMD_HISTORY = 100  # Limit changes kept for /system-stats
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(self, name, initial, min_limit, max_limit, latency_target, decrease_factor=AIMD_DECREASE_FACTOR):
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.condition = threading.Condition()
+        self.in_flight = 0
+        self.latency_ewma = None
+        self.last_decrease = 0.0
+        self.history = deque(maxlen=AIMD_HISTORY)  # (time, limit, reason)
+        self.acquired = 0
+        self.waited = 0
+        self.total_wait_seconds = 0.0
+        self.decreases = {}
+    
+    def acquire(self):
+        """Block until in-flight calls are under the current limit"""
+        started = time.monotonic()
+        with self.condition:
+            waited = False
+            while self.in_flight >= int(self.limit):
+                waited = True
+                self.condition.wait()
+            self.in_flight += 1
+            self.acquired += 1
+            if waited:
+                self.waited += 1
+                self.total_wait_seconds += time.monotonic() - started
+    
+    def release(self, latency=None, congested=None):
+        """Finish a call; congested is a reason string (e.g. 'error') or None for a normal completion"""
+        with self.condition:
+            self.in_flight -= 1
+            if latency is not None:
+                self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+                if congested is None and latency > self.latency_target:
+                    congested = 'latency'
+            if congested is None:
+                congested = cpu_monitor.under_pressure()
+            if congested:
+                self._decrease(congested)
+            elif self.in_flight + 1 >= int(self.limit):
+                # Only grow while the limit is actually the bottleneck
+                before = int(self.limit)
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+                if int(self.limit) != before:
+                    self.history.append((time.time(), int(self.limit), 'increase'))
+            self.condition.notify_all()
+    
+    def signal_congestion(self, reason):
+        """Congestion seen outside a release, e.g. a 429 mid-request or a browser lease timeout"""
+        with self.condition:
+            self._decrease(reason)
+    
+    def _decrease(self, reason):
+        # Called with the condition held
+        now = time.time()
+        cooldown = max(1.0, self.latency_ewma or 0.0)
+        if now - self.last_decrease < cooldown:
+            return
+        self.last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+        self.decreases[reason] = self.decreases.get(reason, 0) + 1
+        self.history.append((now, int(self.limit), reason))
+        log.info("📉 CONCURRENCY: %s limit cut to %s (%s)", self.name, int(self.limit), reason)
+    
+    def get_stats(self):
+        with self.condition:
+            return {
+                'limit': int(self.limit),
+                'limit_exact': round(self.limit, 2),
+                'min': self.min_limit,
+                'max': self.max_limit,
+                'in_flight': self.in_flight,
+                'acquired': self.acquired,
+                'waited': self.waited,
+                'avg_wait_seconds': round(self.total_wait_seconds / self.waited, 3) if self.waited else 0.0,
+                'latency_ewma_seconds': round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+                'decreases': dict(self.decreases),
+                'history': [{'time': t, 'limit': limit, 'reason': reason} for t, limit, reason in self.history]
+            }
+
+http_concurrency = AdaptiveConcurrencyLimiter('http', AIMD_HTTP_INITIAL, AIMD_HTTP_MIN, AIMD_HTTP_MAX, AIMD_HTTP_LATENCY_TARGET)
+browser_concurrency = AdaptiveConcurrencyLimiter('browser', AIMD_BROWSER_INITIAL, AIMD_BROWSER_MIN, AIMD_BROWSER_MAX, AIMD_BROWSER_LATENCY_TARGET)
+
+CONCURRENCY_LIMIT = metrics.gauge('tiktok_scraper_concurrency_limit', 'Current AIMD concurrency limit per tier', ['tier'])
+metrics.collectors.append(lambda: [CONCURRENCY_LIMIT.set(int(limiter.limit), tier=limiter.name)
+                                   for limiter in (http_concurrency, browser_concurrency)])
+
+# PERFORMANCE: Shared token-bucket rate limiter (all threads in a process, all gunicorn workers on a host)
+RATE_LIMIT_RATE = float(os.environ.get('RATE_LIMIT_RATE', 5.0))  # Tokens (requests) per second
+RATE_LIMIT_BURST = float(os.environ.get('RATE_LIMIT_BURST', 10))  # Bucket size
+
+class TokenBucketRateLimiter:
+    def __init__(self, rate=RATE_LIMIT_RATE, burst=RATE_LIMIT_BURST, store=coordination_cache, key='rate_limiter:tiktok'):
+        self.rate = rate
+        self.burst = burst
+        self.store = store
+        self.key = key
+        self.lock = Lock()  # Serialise threads before they touch the shared store
+        # Fallback state if the shared store is unavailable
+        self.local_tokens = burst
+        self.local_updated = time.time()
+        self.stats = {'acquired': 0, 'delayed': 0, 'total_wait_seconds': 0.0}
+    
+    def _refill(self, tokens, updated, now):
+        return min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+    
+    def reserve(self):
+        """Take one token and return how long the caller must wait before using it (0 if budget is left)"""
+        if self.rate <= 0:
+            return 0.0
+        with self.lock:
+            now = time.time()  # Wall clock so every process agrees
+            try:
+                with self.store.transact():
+                    tokens, updated = self.store.get(self.key, default=(self.burst, now))
+                    tokens = self._refill(tokens, updated, now) - 1
+                    self.store.set(self.key, (tokens, now))
+            except Exception as e:
+                log.warning("⚠️ Shared rate limiter store unavailable, using process-local bucket: %s", e)
+                tokens = self._refill(self.local_tokens, self.local_updated, now) - 1
+                self.local_tokens, self.local_updated = tokens, now
+            
+            # A negative balance is a queue of reservations; each one waits its turn
+            wait = -tokens / self.rate if tokens < 0 else 0.0
+            self.stats['acquired'] += 1
+            if wait > 0:
+                self.stats['delayed'] += 1
+                self.stats['total_wait_seconds'] += wait
+                RATE_LIMIT_DELAYS_TOTAL.inc()
+                RATE_LIMIT_WAIT_SECONDS_TOTAL.inc(wait)
+            return wait
+    
+    def acquire(self):
+        """Block until a token is available; returns the time spent waiting"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    def remaining(self):
+        """Tokens currently left in the shared bucket"""
+        now = time.time()
+        try:
+            tokens, updated = self.store.get(self.key, default=(self.burst, now))
+        except Exception:
+            tokens, updated = self.local_tokens, self.local_updated
+        return max(0.0, self._refill(tokens, updated, now))
+    
+    def get_stats(self):
+        return {
+            'rate_per_second': self.rate,
+            'burst': self.burst,
+            'remaining_tokens': round(self.remaining(), 2),
+            **self.stats,
+            'total_wait_seconds': round(self.stats['total_wait_seconds'], 2),
+        }
+
+request_rate_limiter = TokenBucketRateLimiter()
+
+# PERFORMANCE: Circuit breaker - stop sending HTTP requests into an active rate limit
+from email.utils import parsedate_to_datetime
+
+BREAKER_WINDOW_SECONDS = float(os.environ.get('BREAKER_WINDOW_SECONDS', 30))  # Sliding window for the failure rate
+BREAKER_MIN_REQUESTS = int(os.environ.get('BREAKER_MIN_REQUESTS', 10))  # Responses in the window before it can trip
+BREAKER_FAILURE_RATE = float(os.environ.get('BREAKER_FAILURE_RATE', 0.5))  # Share of 429/5xx responses that trips it
+BREAKER_OPEN_SECONDS = float(os.environ.get('BREAKER_OPEN_SECONDS', 30))  # Cool-down when TikTok sent no Retry-After
+BREAKER_MAX_OPEN_SECONDS = float(os.environ.get('BREAKER_MAX_OPEN_SECONDS', 600))  # Cap on honoring Retry-After
+BREAKER_HALF_OPEN_PROBES = int(os.environ.get('BREAKER_HALF_OPEN_PROBES', 3))  # Trial requests that must succeed to close
+MAX_RETRY_WAIT_SECONDS = 10  # Longer Retry-After waits are left to the circuit breaker
+
+def parse_retry_after(value):
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class CircuitBreaker:
+    """Process-wide breaker for the HTTP tier.
+    closed: requests flow, 429/5xx responses are counted over a sliding window.
+    open: requests fail fast (the scrape falls through to Selenium) until the cool-down or Retry-After passes.
+    half_open: a few trial requests go out; all succeeding closes the breaker, any failure reopens it."""
+    def __init__(self, window_seconds=BREAKER_WINDOW_SECONDS, min_requests=BREAKER_MIN_REQUESTS, failure_rate=BREAKER_FAILURE_RATE,
+                 open_seconds=BREAKER_OPEN_SECONDS, max_open_seconds=BREAKER_MAX_OPEN_SECONDS, half_open_probes=BREAKER_HALF_OPEN_PROBES):
+        self.window_seconds = window_seconds
+        self.min_requests = min_requests
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.half_open_probes = half_open_probes
+        self.lock = Lock()
+        self.state = 'closed'
+        self.window = deque()  # (time, failed)
+        self.open_until = 0.0
+        self.half_open_since = 0.0
+        self.probes_in_flight = 0
+        self.probe_successes = 0
+        self.trips = 0
+        self.rejected = 0
+        self.last_retry_after = None
+    
+    def allow_request(self):
+        """True if a request may go out now; every allowed request must be followed by record()"""
+        with self.lock:
+            if self.state == 'open':
+                if time.time() < self.open_until:
+                    self.rejected += 1
+                    return False
+                self.state = 'half_open'
+                self.half_open_since = time.time()
+                self.probes_in_flight = 0
+                self.probe_successes = 0
+                log.info("🔌 CIRCUIT: Half-open, sending trial requests")
+            if self.state == 'half_open':
+                if self.probes_in_flight >= self.half_open_probes and time.time() - self.half_open_since > self.open_seconds:
+                    # Trial requests never reported back (e.g. cancelled) - allow a fresh round
+                    self.half_open_since = time.time()
+                    self.probes_in_flight = 0
+                if self.probes_in_flight >= self.half_open_probes:
+                    self.rejected += 1
+                    return False
+                self.probes_in_flight += 1
+            return True
+    
+    def record(self, status, retry_after=None):
+        """Outcome of an allowed request - HTTP status, or None when there was no response"""
+        failed = status is not None and (status == 429 or status >= 500)
+        now = time.time()
+        with self.lock:
+            if retry_after is not None:
+                self.last_retry_after = retry_after
+            if self.state == 'half_open':
+                self.probes_in_flight = max(0, self.probes_in_flight - 1)
+                if failed:
+                    self._trip(retry_after)
+                elif status is not None:
+                    self.probe_successes += 1
+                    if self.probe_successes >= self.half_open_probes:
+                        self.state = 'closed'
+                        self.window.clear()
+                        log.info("🔌 CIRCUIT: Closed, HTTP tier recovered")
+                return
+            if self.state == 'open' or status is None:
+                return
+            
+            self.window.append((now, failed))
+            while self.window and self.window[0][0] < now - self.window_seconds:
+                self.window.popleft()
+            failures = sum(1 for _, f in self.window if f)
+            if len(self.window) >= self.min_requests and failures / len(self.window) >= self.failure_rate:
+                self._trip(retry_after)
+    
+    def _trip(self, retry_after=None):
+        """Open the breaker (called with the lock held), honoring Retry-After when it asks for longer"""
+        open_for = min(max(self.open_seconds, retry_after or 0), self.max_open_seconds)
+        self.state = 'open'
+        self.open_until = time.time() + open_for
+        self.trips += 1
+        self.window.clear()
+        log.warning("🔌 CIRCUIT: Open for %.0fs - HTTP tier is rate limited or failing", open_for)
+    
+    def get_stats(self):
+        with self.lock:
+            failures = sum(1 for _, f in self.window if f)
+            return {
+                'state': self.state,
+                'open_seconds_remaining': round(max(0.0, self.open_until - time.time()), 1) if self.state == 'open' else 0.0,
+                'window_requests': len(self.window),
+                'window_failure_rate': round(failures / len(self.window), 3) if self.window else 0.0,
+                'trips': self.trips,
+                'rejected': self.rejected,
+                'last_retry_after_seconds': self.last_retry_after
+            }
+
+http_circuit_breaker = CircuitBreaker()
+
+def record_http_response(status, retry_after=None, adaptive=True):
+    """Feed a TikTok response (None = no response) to the circuit breaker and the metrics.
+    adaptive=False keeps it away from http_concurrency, for traffic that limit doesn't gate (the async engine)"""
+    HTTP_RESPONSES_TOTAL.inc(code=status if status is not None else 'error')
+    http_circuit_breaker.record(status, retry_after)
+    if not adaptive:
+        return
+    if status is None:
+        http_concurrency.signal_congestion('error')
+    elif status == 429:
+        http_concurrency.signal_congestion('rate_limited')
+    elif status >= 500:
+        http_concurrency.signal_congestion('server_error')
+
+BREAKER_STATE_VALUES = {'closed': 0, 'half_open': 1, 'open': 2}
+metrics.collectors.append(lambda: CIRCUIT_BREAKER_STATE.set(BREAKER_STATE_VALUES[http_circuit_breaker.state]))
+
+# PERFORMANCE: Compressed transfers - negotiate gzip/brotli and track wire vs decoded bytes
+import zlib
+try:
+    import brotli
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    brotli = None
+    ACCEPT_ENCODING = 'gzip, deflate'  # Only offer br when we can decode it
+
+def decode_content_encoding(body, content_encoding):
+    """Decode a response body according to its Content-Encoding header"""
+    for coding in reversed([c.strip().lower() for c in (content_encoding or '').split(',') if c.strip()]):
+        if coding in ('gzip', 'x-gzip'):
+            body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        elif coding == 'deflate':
+            try:
+                body = zlib.decompress(body)
+            except zlib.error:
+                body = zlib.decompress(body, -zlib.MAX_WBITS)  # Raw deflate without zlib header
+        elif coding == 'br' and brotli is not None:
+            body = brotli.decompress(body)
+        elif coding != 'identity':
+            raise ValueError(f"Unsupported Content-Encoding: {coding}")
+    return body
+
+class TransferStats:
+    def __init__(self):
+        self.lock = Lock()
+        self.responses = 0
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        self.by_encoding = {}
+    
+    def record(self, wire_bytes, decoded_bytes, content_encoding=None):
+        encoding = (content_encoding or 'identity').lower()
+        with self.lock:
+            self.responses += 1
+            self.wire_bytes += wire_bytes
+            self.decoded_bytes += decoded_bytes
+            self.by_encoding[encoding] = self.by_encoding.get(encoding, 0) + 1
+        DOWNLOADED_BYTES_TOTAL.inc(wire_bytes, kind='wire')
+        DOWNLOADED_BYTES_TOTAL.inc(decoded_bytes, kind='decoded')
+    
+    def get_stats(self):
+        with self.lock:
+            saved = self.decoded_bytes - self.wire_bytes
+            return {
+                'accept_encoding': ACCEPT_ENCODING,
+                'responses': self.responses,
+                'wire_mb': round(self.wire_bytes / (1024 * 1024), 2),
+                'decoded_mb': round(self.decoded_bytes / (1024 * 1024), 2),
+                'saved_percent': round(saved / self.decoded_bytes * 100, 1) if self.decoded_bytes else 0.0,
+                'responses_by_encoding': dict(self.by_encoding)
+            }
+
+transfer_stats = TransferStats()
+
+# PERFORMANCE: Async fetch engine - keeps hundreds of profile fetches in flight on one event loop
+import asyncio
+import aiohttp
+
+ASYNC_FETCH_ENABLED = os.environ.get('ASYNC_FETCH_ENABLED', '1') == '1'
+ASYNC_FETCH_CONCURRENCY = int(os.environ.get('ASYNC_FETCH_CONCURRENCY', 200))  # Max fetches in flight
+ASYNC_FETCH_TIMEOUT = float(os.environ.get('ASYNC_FETCH_TIMEOUT', 10))  # Per-request timeout (seconds)
+
+class AsyncFetchEngine:
+    def __init__(self, concurrency=ASYNC_FETCH_CONCURRENCY, timeout=ASYNC_FETCH_TIMEOUT, rate_limiter=request_rate_limiter):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.loop = None
+        self.loop_thread = None
+        self.owner_pid = None
+        self.session = None
+        self.semaphore = None
+        self.start_lock = Lock()
+        self.stats = {'fetched': 0, 'rate_limited': 0, 'server_errors': 0, 'failed': 0, 'circuit_open': 0}
+
+    def _ensure_loop(self):
+        """Start the background event loop lazily (and again after a gunicorn fork)"""
+        with self.start_lock:
+            if self.loop is not None and self.owner_pid == os.getpid():
+                return self.loop
+
+            # Threads don't survive fork(), so each worker process gets its own loop
+            self.loop = asyncio.new_event_loop()
+            self.loop_thread = threading.Thread(target=self.loop.run_forever, name='async-fetch-loop', daemon=True)
+            self.loop_thread.start()
+            self.owner_pid = os.getpid()
+            self.session = None
+            self.semaphore = None
+            log.info("⚡ ASYNC: Fetch engine started (concurrency %s)", self.concurrency)
+            return self.loop
+
+    def _ensure_session(self):
+        """Create the pooled client session on the loop thread"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.concurrency,  # Connection pool size
+                ttl_dns_cache=300,       # Avoid a DNS lookup per fetch
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                auto_decompress=False,  # Decode ourselves so wire bytes can be measured
+            )
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+        return self.session
+
+    async def _wait_for_slot(self):
+        """Cooperative rate limiting: reserve a shared token, then sleep without blocking the loop"""
+        # The reservation touches the shared store, so keep that disk I/O off the loop thread
+        wait = await asyncio.get_running_loop().run_in_executor(None, self.rate_limiter.reserve)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def _fetch_one(self, url, headers, max_retries=3):
+        """Fetch a single URL with the same 429/5xx backoff as make_request_with_backoff.
+        Returns (status, body, charset, elapsed); elapsed covers retries and rate-limit waits but not the semaphore queue"""
+        session = self._ensure_session()
+        async with self.semaphore:
+            started = time.perf_counter()
+            for attempt in range(max_retries):
+                # CIRCUIT BREAKER: Fail fast while TikTok is rate limiting us
+                if not http_circuit_breaker.allow_request():
+                    self.stats['circuit_open'] += 1
+                    break
+                await self._wait_for_slot()
+                try:
+                    async with session.get(url, headers=headers) as response:
+                        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                        # ADAPTIVE CONCURRENCY: Not gated by http_concurrency (the semaphore, token bucket and
+                        # circuit breaker pace this engine), so its responses must not cut that limit either
+                        record_http_response(response.status, retry_after, adaptive=False)
+                        if response.status == 429:  # Too Many Requests
+                            self.stats['rate_limited'] += 1
+                            await asyncio.sleep(min(retry_after if retry_after is not None else (2 ** attempt) + random.uniform(1, 3), MAX_RETRY_WAIT_SECONDS))
+                            continue
+                        if response.status >= 500:  # Server errors
+                            self.stats['server_errors'] += 1
+                            await asyncio.sleep((2 ** attempt) + random.uniform(0.5, 1.5))
+                            continue
+                        wire_body = await response.read()
+                        content_encoding = response.headers.get('Content-Encoding')
+                        body = decode_content_encoding(wire_body, content_encoding)
+                        transfer_stats.record(len(wire_body), len(body), content_encoding)
+                        self.stats['fetched'] += 1
+                        return response.status, body, response.charset, time.perf_counter() - started
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    record_http_response(None, adaptive=False)
+                    if attempt == max_retries - 1:
+                        log.warning("⚡ ASYNC: Request error for %s: %s", url, e)
+                        break
+                    await asyncio.sleep((2 ** attempt) + random.uniform(0.5, 1.0))
+            self.stats['failed'] += 1
+            return None, None, None, time.perf_counter() - started
+
+    def fetch_iter(self, requests_list):
+        """Fetch [(url, headers), ...] concurrently, yielding (index, status, body, charset, elapsed) as each one completes"""
+        if not requests_list:
+            return
+        loop = self._ensure_loop()
+        completed = Queue()
+
+        async def fetch_into_queue(index, url, headers):
             try:
-                driver = self.pool.get_nowait()
-                driver.quit()
-            except:
-                break
-        
-        # Additional cleanup for any lingering Chrome processes
+                status, body, charset, elapsed = await self._fetch_one(url, headers)
+            except Exception as e:
+                log.warning("⚡ ASYNC: Fetch failed for %s: %s", url, e)
+                status, body, charset, elapsed = None, None, None, None
+            completed.put((index, status, body, charset, elapsed))
+
+        async def fetch_all():
+            await asyncio.gather(*(fetch_into_queue(i, url, headers) for i, (url, headers) in enumerate(requests_list)))
+
+        asyncio.run_coroutine_threadsafe(fetch_all(), loop)
+
+        # Bodies are handed over one at a time so the caller can extract and drop them
+        for _ in range(len(requests_list)):
+            yield completed.get()
+
+    def close(self):
+        if self.loop is None or self.owner_pid != os.getpid():
+            return
         try:
-            import psutil
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    if proc.info['name'] and 'chrome' in proc.info['name'].lower():
-                        cmdline = proc.info.get('cmdline', [])
-                        if cmdline and any('headless' in str(arg).lower() for arg in cmdline):
-                            proc.terminate()
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-        except ImportError:
-            pass  # psutil not available
+            if self.session is not None:
+                asyncio.run_coroutine_threadsafe(self.session.close(), self.loop).result(timeout=5)
+            self.loop.call_soon_threadsafe(self.loop.stop)
         except Exception:
-            pass  # Ignore any cleanup errors
+            pass
+        self.loop = None
 
-# Playwright browser pool removed
+async_fetch_engine = AsyncFetchEngine()
 
-# Initialize WebDriver pool with error handling
-try:
-    webdriver_pool = WebDriverPool(pool_size=20)
-    print("WebDriver pool initialized successfully")
-except Exception as e:
-    print(f"WebDriver pool initialization failed: {e}")
-    print("App will run in requests-only mode (no Selenium fallback)")
-    webdriver_pool = None
+# Where scraped profiles come from - point this at scripts/mock_tiktok_server.py for load tests
+TIKTOK_BASE_URL = os.environ.get('TIKTOK_BASE_URL', 'https://www.tiktok.com').rstrip('/')
 
-app = Flask(__name__)
+def profile_url(username):
+    return f"{TIKTOK_BASE_URL}/@{username}"
 
-# PERFORMANCE: Flask optimization for better threading
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
-app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0  # Disable caching for development
+class TierStats:
+    """Which tier produced each scrape_bio result (cache, coalesced, requests, selenium or failed)"""
+    def __init__(self):
+        self.lock = Lock()
+        self.counts = {'cache': 0, 'coalesced': 0, 'requests': 0, 'selenium': 0, 'failed': 0}
+    
+    def record(self, tier):
+        with self.lock:
+            self.counts[tier] = self.counts.get(tier, 0) + 1
+        RESULTS_TOTAL.inc(source=tier)
+    
+    def get_stats(self):
+        with self.lock:
+            return dict(self.counts)
 
-# PERFORMANCE: CPU Monitoring System (no throttling)
-class CPUMonitor:
-    def __init__(self, check_interval=1.0):
-        self.check_interval = check_interval
-        self.cpu_history = []
-        self.max_history = 10  # Keep last 10 CPU readings
-        
-    def get_cpu_usage(self):
-        """Get current CPU usage percentage"""
-        try:
-            return psutil.cpu_percent(interval=0.1)
-        except:
-            return 0
+tier_stats = TierStats()
+
+# PERFORMANCE: Single-flight coalescing - one scrape per username at a time, per host
+
+SCRAPE_LEASE_SECONDS = int(os.environ.get('SCRAPE_LEASE_SECONDS', 120))  # Longest a requests + Selenium scrape should take
+SCRAPE_LEASE_POLL_INTERVAL = 0.2
+
+class ScrapeCoalescer:
+    """Threads asking for a username that is already being scraped wait for that scrape instead of starting their own.
+    In-process followers wait on the leader's Event; other gunicorn workers see the leader's lease in the
+    coordination cache and wait for the result to land in profile_cache."""
+    def __init__(self, store=coordination_cache, lease_seconds=SCRAPE_LEASE_SECONDS, poll_interval=SCRAPE_LEASE_POLL_INTERVAL):
+        self.store = store
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.lock = Lock()
+        self.in_flight = {}  # username -> {'event', 'result', 'error'}
+        self.leaders = 0
+        self.local_followers = 0
+        self.remote_followers = 0
     
-    def get_cpu_history(self):
-        """Get CPU usage history for monitoring"""
-        current_cpu = self.get_cpu_usage()
+    def run(self, username, scrape):
+        """Return scrape() for username, sharing the result with concurrent callers"""
+        with self.lock:
+            call = self.in_flight.get(username)
+            is_leader = call is None
+            if is_leader:
+                call = {'event': Event(), 'result': None, 'error': None}
+                self.in_flight[username] = call
+                self.leaders += 1
+            else:
+                self.local_followers += 1
         
-        # Add to history
-        self.cpu_history.append(current_cpu)
-        if len(self.cpu_history) > self.max_history:
-            self.cpu_history.pop(0)
+        if not is_leader:
+            log.debug("🔗 COALESCED %s - waiting for the in-flight scrape", username)
+            tier_stats.record('coalesced')
+            with tracer.span('coalesce_wait'):
+                call['event'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
         
-        return self.cpu_history
+        try:
+            call['result'] = self._run_with_lease(username, scrape)
+            return call['result']
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self.lock:
+                self.in_flight.pop(username, None)
+            call['event'].set()
     
-    def get_optimal_workers(self, base_workers=None):
-        """Calculate optimal number of workers based on CPU cores"""
-        import os
-        cpu_count = os.cpu_count() or 4  # Default to 4 if detection fails
+    def _run_with_lease(self, username, scrape):
+        lease_key = f'scrape_lease:{username}'
+        owner = f'{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}'
+        started = time.time()
+        deadline = started + self.lease_seconds
+        waited = False
         
-        # Use 5 workers maximum for better resource management
-        optimal_workers = 20
-        
-        return optimal_workers
+        while True:
+            try:
+                acquired = self.store.add(lease_key, owner, expire=self.lease_seconds)
+            except Exception as e:
+                log.warning("⚠️ Scrape lease unavailable, scraping %s without it: %s", username, e)
+                return scrape()
+            
+            if acquired:
+                try:
+                    return scrape()
+                finally:
+                    self._release(lease_key, owner)
+            
+            # Another worker is scraping this username - wait for its lease to go away
+            if not waited:
+                waited = True
+                with self.lock:
+                    self.remote_followers += 1
+                tier_stats.record('coalesced')
+                log.debug("🔗 COALESCED %s - another worker is scraping it", username)
+            with tracer.span('coalesce_wait'):
+                while time.time() < deadline and self.store.get(lease_key) is not None:
+                    time.sleep(self.poll_interval)
+            
+            # Read the disk cache directly, this worker's L1 can hold an older entry
+            profile_memory_cache.delete(username)
+            cached = get_cached_profile(username)
+            if cached is not None and cached.get('scraped_at', 0) >= started:
+                return cached.get('bio')
+            if time.time() >= deadline:
+                return scrape()
+            # Lease released without a fresh result (e.g. uncached transient failure) - try to take it
+    
+    def _release(self, lease_key, owner):
+        try:
+            with self.store.transact():
+                if self.store.get(lease_key) == owner:
+                    self.store.delete(lease_key)
+        except Exception as e:
+            log.warning("⚠️ Could not release scrape lease %s: %s", lease_key, e)
+    
+    def get_stats(self):
+        with self.lock:
+            return {
+                'in_flight': len(self.in_flight),
+                'leaders': self.leaders,
+                'local_followers': self.local_followers,
+                'remote_followers': self.remote_followers
+            }
 
-# Initialize CPU monitor
-cpu_monitor = CPUMonitor()
+scrape_coalescer = ScrapeCoalescer()
+
+# PERFORMANCE: Adaptive tier routing - skip the requests tier while it mostly hits login walls
+ROUTER_ENABLED = os.environ.get('ROUTER_ENABLED', '1') == '1'
+ROUTER_WINDOW = int(os.environ.get('ROUTER_WINDOW', 50))  # Recent outcomes kept per tier
+ROUTER_SAMPLE_MAX_AGE = float(os.environ.get('ROUTER_SAMPLE_MAX_AGE', 600))  # Seconds before an outcome stops counting
+ROUTER_MIN_SAMPLES = int(os.environ.get('ROUTER_MIN_SAMPLES', 20))  # Outcomes needed per tier before routing changes
+ROUTER_PROBE_RATE = float(os.environ.get('ROUTER_PROBE_RATE', 0.1))  # Share of Selenium-routed lookups that still try requests first
+ROUTER_USER_MEMORY = int(os.environ.get('ROUTER_USER_MEMORY', 10000))  # Usernames remembered as Selenium-only
+
+class TierRouter:
+    """Picks which tier to try first from recent success rates and latencies.
+    Expected cost of a first tier is its latency plus the other tier's latency times its failure rate;
+    usernames that only Selenium could read go straight to Selenium. A share of lookups keeps probing
+    the requests tier so routing recovers once TikTok stops walling anonymous traffic."""
+    DEFAULT_LATENCY = {'requests': 1.0, 'selenium': 5.0}
+    
+    def __init__(self, window=ROUTER_WINDOW, min_samples=ROUTER_MIN_SAMPLES, probe_rate=ROUTER_PROBE_RATE, user_memory=ROUTER_USER_MEMORY):
+        self.lock = Lock()
+        self.outcomes = {tier: deque(maxlen=window) for tier in self.DEFAULT_LATENCY}  # (recorded_at, success, latency or None)
+        self.min_samples = min_samples
+        self.probe_rate = probe_rate
+        self.user_memory = user_memory
+        self.selenium_users = OrderedDict()
+        self.routed = {'requests': 0, 'selenium': 0, 'probes': 0}
+        self.unavailable = {tier: 0 for tier in self.DEFAULT_LATENCY}  # Attempts that never reached the tier
+        self.rng = random.Random()
+    
+    def record(self, tier, success, latency=None, username=None):
+        with self.lock:
+            self.outcomes[tier].append((time.time(), success, latency))
+            if username and tier == 'requests' and success:
+                self.selenium_users.pop(username, None)
+            elif username and tier == 'selenium' and success:
+                self.selenium_users[username] = time.time()
+                self.selenium_users.move_to_end(username)
+                while len(self.selenium_users) > self.user_memory:
+                    self.selenium_users.popitem(last=False)
+    
+    def record_unavailable(self, tier):
+        """An attempt that couldn't start (no browser lease, broker down) - counted, but not a latency/success sample"""
+        with self.lock:
+            self.unavailable[tier] += 1
+    
+    def _estimate(self, tier):
+        """(success rate, average latency, samples) over the recent window (called with the lock held)"""
+        cutoff = time.time() - ROUTER_SAMPLE_MAX_AGE
+        outcomes = [(success, latency) for recorded_at, success, latency in self.outcomes[tier] if recorded_at >= cutoff]
+        latencies = [latency for _, latency in outcomes if latency is not None]
+        success_rate = sum(1 for success, _ in outcomes if success) / len(outcomes) if outcomes else 1.0
+        latency = sum(latencies) / len(latencies) if latencies else self.DEFAULT_LATENCY[tier]
+        return success_rate, latency, len(outcomes)
+    
+    def choose(self, username, record=True):
+        """'requests' or 'selenium' - the tier to try first for this username"""
+        if not ROUTER_ENABLED or not webdriver_pool:
+            return 'requests'
+        with self.lock:
+            route = 'requests'
+            if username in self.selenium_users:
+                route = 'selenium'
+            else:
+                p_requests, l_requests, n_requests = self._estimate('requests')
+                p_selenium, l_selenium, n_selenium = self._estimate('selenium')
+                if n_requests >= self.min_samples and n_selenium >= self.min_samples:
+                    requests_first = l_requests + (1 - p_requests) * l_selenium
+                    selenium_first = l_selenium + (1 - p_selenium) * l_requests
+                    if selenium_first < requests_first:
+                        route = 'selenium'
+            
+            probe = route == 'selenium' and self.rng.random() < self.probe_rate
+            if probe:
+                route = 'requests'
+            if record:
+                self.routed[route] += 1
+                if probe:
+                    self.routed['probes'] += 1
+            return route
+    
+    def get_stats(self):
+        with self.lock:
+            tiers = {}
+            for tier in self.outcomes:
+                success_rate, latency, samples = self._estimate(tier)
+                tiers[tier] = {'success_rate': round(success_rate, 3), 'avg_latency_seconds': round(latency, 3), 'samples': samples,
+                               'unavailable': self.unavailable[tier]}
+            return {
+                'enabled': ROUTER_ENABLED,
+                'tiers': tiers,
+                'routed': dict(self.routed),
+                'selenium_only_usernames': len(self.selenium_users)
+            }
+
+tier_router = TierRouter()
 
 class TikTokScraper:
     def __init__(self):
@@ -290,7 +1959,7 @@ class TikTokScraper:
         self.headers = {
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': ACCEPT_ENCODING,
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
             'Sec-Fetch-Dest': 'document',
@@ -302,7 +1971,6 @@ class TikTokScraper:
         
         # Request tracking for rate limiting
         self.request_count = 0
-        self.last_request_time = 0
         # PERFORMANCE: Shared session for connection reuse
         self.session = requests.Session()
         self.session.headers.update(self.headers)
@@ -310,43 +1978,39 @@ class TikTokScraper:
         adapter = requests.adapters.HTTPAdapter(
             pool_connections=20,  # Number of connection pools
             pool_maxsize=20,      # Max connections per pool
-            max_retries=3,        # Retry failed requests
+            # Retry connection failures only - a bare max_retries=3 also makes urllib3 silently retry 429s that carry
+            # Retry-After, hiding them from the backoff loop, circuit breaker and concurrency controller
+            max_retries=requests.adapters.Retry(total=3, respect_retry_after_header=False),
             pool_block=False      # Don't block when pool is full
         )
         self.session.mount('http://', adapter)
         self.session.mount('https://', adapter)
+        
+        # PERFORMANCE: Bios fetched ahead of time by the async engine (username -> bio or None)
+        self.prefetched_bios = {}
+        self.fetch_outcomes = {}  # Why the requests tier came back without a bio, per username
+        self.prefetch_latencies = {}  # Seconds each async prefetch took, for the router's requests-tier estimate
+        self.browser_unavailable = set()  # Usernames whose Selenium attempt never got a browser
+        self.prefetch_lock = Lock()
     
     def get_random_user_agent(self):
         """Get a random user agent for request rotation"""
         return random.choice(self.user_agents)
     
     def add_request_delay(self):
-        """Add intelligent delay between requests to avoid rate limiting"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        # Base delay between 0.5-2 seconds
-        base_delay = random.uniform(0.5, 2.0)
-        
-        # Increase delay if we're making requests too fast
-        if time_since_last < 1.0:
-            base_delay += random.uniform(1.0, 3.0)
-        
-        # Add worker-specific delay to stagger requests
-        worker_delay = random.uniform(0.1, 0.5)
-        
-        total_delay = base_delay + worker_delay
-        
-        if total_delay > 0:
-            print(f"⏳ Rate limiting delay: {total_delay:.2f}s")
-            time.sleep(total_delay)
-        
-        self.last_request_time = time.time()
+        """Wait for the shared rate limiter - only sleeps once the request budget is used up"""
+        with tracer.span('rate_limit_wait'):
+            waited = request_rate_limiter.acquire()
+        if waited > 0:
+            log.debug("⏳ Rate limiting delay: %.2fs", waited)
         self.request_count += 1
     
-    def make_request_with_backoff(self, url, max_retries=3):
+    def make_request_with_backoff(self, url, max_retries=3, stream=False):
         """Make request with exponential backoff for rate limit errors"""
         for attempt in range(max_retries):
+            # CIRCUIT BREAKER: Fail fast (and let the scrape fall through to Selenium) while TikTok is rate limiting us
+            if not http_circuit_breaker.allow_request():
+                raise Exception("Circuit breaker open - skipping HTTP request")
             try:
                 # Add delay before request
                 self.add_request_delay()
@@ -355,29 +2019,36 @@ class TikTokScraper:
                 headers = self.headers.copy()
                 headers['User-Agent'] = self.get_random_user_agent()
                 
-                response = self.session.get(url, headers=headers, timeout=10)
+                with tracer.span('http_request'):
+                    response = self.session.get(url, headers=headers, timeout=10, stream=stream)
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                record_http_response(response.status_code, retry_after)
                 
                 # Handle rate limiting
                 if response.status_code == 429:  # Too Many Requests
-                    wait_time = (2 ** attempt) + random.uniform(1, 3)
-                    print(f"🚫 Rate limited (429), waiting {wait_time:.1f}s before retry {attempt + 1}/{max_retries}")
+                    response.close()
+                    # Honor Retry-After when TikTok sends one; long waits are left to the circuit breaker
+                    wait_time = min(retry_after if retry_after is not None else (2 ** attempt) + random.uniform(1, 3), MAX_RETRY_WAIT_SECONDS)
+                    log.warning("🚫 Rate limited (429), waiting %.1fs before retry %s/%s", wait_time, attempt + 1, max_retries)
                     time.sleep(wait_time)
                     continue
                 
                 # Handle other HTTP errors
                 if response.status_code >= 500:  # Server errors
+                    response.close()
                     wait_time = (2 ** attempt) + random.uniform(0.5, 1.5)
-                    print(f"⚠️ Server error {response.status_code}, waiting {wait_time:.1f}s before retry")
+                    log.warning("⚠️ Server error %s, waiting %.1fs before retry", response.status_code, wait_time)
                     time.sleep(wait_time)
                     continue
                 
                 return response
                 
             except requests.exceptions.RequestException as e:
+                record_http_response(None)
                 if attempt == max_retries - 1:
                     raise e
                 wait_time = (2 ** attempt) + random.uniform(0.5, 1.0)
-                print(f"⚠️ Request error: {e}, waiting {wait_time:.1f}s before retry")
+                log.warning("⚠️ Request error: %s, waiting %.1fs before retry", e, wait_time)
                 time.sleep(wait_time)
         
         raise Exception(f"Failed to make request after {max_retries} attempts")
@@ -477,136 +2148,378 @@ class TikTokScraper:
     def scrape_with_requests(self, username):
         """Try to scrape using requests first (faster)"""
         try:
-            # CPU MONITORING: Track CPU usage
-            cpu_monitor.get_cpu_history()
-            
             # Clean username
             username = username.replace('@', '').strip()
-            url = f"https://www.tiktok.com/@{username}"
-            print(f"🌐 REQUESTS: Fetching URL: {url}")
+            url = profile_url(username)
+            log.debug("🌐 REQUESTS: Fetching URL: %s", url)
             
             # PERFORMANCE: Use shared session for connection reuse
-            # Remove gzip from headers to avoid encoding issues
-            headers = self.headers.copy()
-            headers['Accept-Encoding'] = 'identity'  # No compression
-            self.session.headers.update(headers)
+            # (headers incl. Accept-Encoding are set per request in make_request_with_backoff)
+            response = self.make_request_with_backoff(url, max_retries=3, stream=True)
+            log.debug("🌐 REQUESTS: Response status code: %s", response.status_code)
+            try:
+                if response.status_code != 200:
+                    self._record_outcome(username, 'not_found' if response.status_code == 404 else 'transient')
+                    return None
+                charset = self._charset_from_headers(response.headers)
+                # EARLY ABORT: Stop downloading once the profile data (or a login wall) is complete
+                with tracer.span('download'):
+                    content, bio_text, parsed_until = self._read_until_profile_data(response, username, charset)
+                transfer_stats.record(response.raw.tell() or len(content), len(content), response.headers.get('Content-Encoding'))
+            finally:
+                response.close()
             
-            response = self.make_request_with_backoff(url, max_retries=3)
-            print(f"🌐 REQUESTS: Response status code: {response.status_code}")
-            if response.status_code == 200:
-                # Get raw content and decode properly
-                content = response.content
-                
-                # Try to detect encoding
-                try:
-                    import chardet
-                    detected = chardet.detect(content)
-                    encoding = detected.get('encoding', 'utf-8')
-                except ImportError:
-                    encoding = 'utf-8'
-                
-                try:
-                    text_content = content.decode(encoding, errors='ignore')
-                except:
-                    text_content = content.decode('utf-8', errors='ignore')
-                
-                soup = BeautifulSoup(text_content, 'html.parser')
-                
-                # Updated selectors based on current TikTok structure
-                bio_selectors = [
-                    '[data-e2e="user-bio"]',
-                    'h2[data-e2e="user-bio"]',
-                    '[data-testid="user-bio"]',
-                    '.css-1mf3iq5-H2ShareDesc',
-                    '.tiktok-1mf3iq5-H2ShareDesc',
-                    'h2.tiktok-1mf3iq5-H2ShareDesc',
-                    '.user-bio',
-                    '.profile-bio'
-                ]
-                
-                bio_text = ""
-                for selector in bio_selectors:
-                    bio_elements = soup.select(selector)
-                    for bio_element in bio_elements:
-                        # FIXED: Use separator='\n' to preserve newlines like Selenium does
-                        text = bio_element.get_text(separator='\n', strip=True)
-                        if text and len(text) > 0:
-                            bio_text = text
-                            break
-                    if bio_text:
-                        break
-                
-                # Check for JSON data in various script tags
-                if not bio_text:
-                    scripts = soup.find_all('script')
-                    for script in scripts:
-                        if script.string and ('signature' in script.string or 'bio' in script.string.lower() or 'userInfo' in script.string):
-                            try:
-                                # Try to extract JSON data
-                                script_content = script.string.strip()
-                                
-                                # Look for userInfo data that contains the signature/bio
-                                if 'webapp.user-detail' in script_content:
-                                    # Extract the userInfo data
-                                    import re
-                                    pattern = r'"signature":"([^"]*)"'
-                                    match = re.search(pattern, script_content)
-                                    if match:
-                                        bio_text = match.group(1)
-                                        # Decode escape sequences
-                                        bio_text = bio_text.replace('\\n', '\n').replace('\\"', '"')
-                                        print(f"🌐 REQUESTS: Found bio in JSON data: '{bio_text[:100]}{'...' if len(bio_text) > 100 else ''}'")
-                                        break
-                                
-                                # Fallback to old method
-                                if not bio_text and script_content.startswith('window.__INITIAL_STATE__'):
-                                    json_str = script_content.replace('window.__INITIAL_STATE__=', '').rstrip(';')
-                                    data = json.loads(json_str)
-                                elif not bio_text and script_content.startswith('{') and script_content.endswith('}'):
-                                    data = json.loads(script_content)
-                                else:
-                                    continue
-                                
-                                # Search for signature/bio in the JSON structure
-                                if not bio_text:
-                                    bio_text = self._extract_bio_from_json(data)
-                                    if bio_text:
-                                        break
-                            except Exception as e:
-                                print(f"🌐 REQUESTS: JSON parsing error: {e}")
-                                continue
-                
-                # Get page text for login detection and fallback search
-                page_text = soup.get_text()
-                
-                # Also search in all text content for email patterns as fallback
-                if not bio_text:
-                    # Look for potential bio sections in page text
-                    lines = page_text.split('\n')
-                    for i, line in enumerate(lines):
-                        line = line.strip()
-                        # Skip common non-bio text
-                        if line in ['Signature (Required):', 'Sign up', 'Log in', 'Following', 'Followers', 'Likes']:
-                            continue
-                        if '@' in line and '.' in line and len(line) < 200:  # Potential bio with email
-                            bio_text = line
-                            break
-                    
-                    # If still no bio but we found "Signature (Required):", it means no bio set
-                    if not bio_text and 'Signature (Required):' in page_text:
-                        bio_text = "No bio set (Signature Required)"
-                    
-                # Check if we got the login page instead of profile
-                if 'Make Your Day' in page_text and not bio_text:
-                    bio_text = "TikTok_LOGIN_REQUIRED"
-                    print(f"🌐 REQUESTS: Login page detected for {username}")
-                
-                print(f"🌐 REQUESTS: Bio extracted for {username}: '{bio_text[:100]}{'...' if len(bio_text) > 100 else ''}'")
+            if bio_text:
                 return bio_text
+            with tracer.span('extract'):
+                bio_text = self._extract_bio_from_content(content, username, charset, parsed_until)
+                if not bio_text:
+                    self._record_outcome(username, self._page_outcome(content, charset))
+            return bio_text
         except Exception as e:
-            print(f"Requests method failed: {str(e)}")
+            log.debug("Requests method failed: %s", e)
+            self._record_outcome(username, 'transient')
             return None
     
+    def prefetch_with_async(self, usernames, use_cache=True):
+        """PERFORMANCE: Run the requests tier for many usernames at once on the async fetch engine"""
+        return self.prefetch_planned(self.plan_prefetch(usernames, use_cache))
+    
+    def plan_prefetch(self, usernames, use_cache=True):
+        """Normalized, deduplicated usernames worth prefetching: not cached and not routed straight to Selenium"""
+        pending = []
+        seen = set()
+        for username in usernames:
+            username = username.replace('@', '').strip().lower()
+            if not username or username in seen:
+                continue
+            seen.add(username)
+            if use_cache and get_cached_profile(username) is not None:
+                continue
+            # ADAPTIVE ROUTING: Don't prefetch profiles the router will send straight to Selenium
+            if tier_router.choose(username, record=False) == 'selenium':
+                continue
+            pending.append(username)
+        return pending
+    
+    def prefetch_planned(self, pending, on_result=None):
+        """Fetch a plan_prefetch() list; on_result(username) is called as each prefetched result is stored"""
+        if not pending:
+            return 0
+        
+        log.info("⚡ ASYNC: Prefetching %s profiles", len(pending))
+        requests_list = []
+        for username in pending:
+            headers = self.headers.copy()
+            headers['User-Agent'] = self.get_random_user_agent()
+            requests_list.append((profile_url(username), headers))
+        
+        for index, status, body, charset, elapsed in async_fetch_engine.fetch_iter(requests_list):
+            username = pending[index]
+            bio = None
+            outcome = 'not_found' if status == 404 else 'transient'
+            if status == 200 and body:
+                try:
+                    bio = self._extract_bio_from_content(body, username, charset)
+                    if not bio:
+                        outcome = self._page_outcome(body, charset)
+                except Exception as e:
+                    log.warning("⚡ ASYNC: Extraction failed for %s: %s", username, e)
+            with self.prefetch_lock:
+                self.prefetched_bios[username] = bio
+                self.prefetch_latencies[username] = elapsed
+                if not bio:
+                    self.fetch_outcomes[username] = outcome
+            if on_result is not None:
+                on_result(username)
+        
+        return len(pending)
+    
+    def _scrape_requests_tier(self, username):
+        """Use the async-prefetched bio if there is one, otherwise fetch with requests now"""
+        with self.prefetch_lock:
+            if username in self.prefetched_bios:
+                return self.prefetched_bios.pop(username)
+        return self.scrape_with_requests(username)
+    
+    def has_prefetched(self, username):
+        with self.prefetch_lock:
+            return username in self.prefetched_bios
+    
+    def _record_outcome(self, username, outcome):
+        with self.prefetch_lock:
+            self.fetch_outcomes[username] = outcome
+    
+    def _record_browser_unavailable(self, username):
+        with self.prefetch_lock:
+            self.browser_unavailable.add(username.replace('@', '').strip())
+    
+    def _pop_browser_unavailable(self, username):
+        username = username.replace('@', '').strip()
+        with self.prefetch_lock:
+            if username in self.browser_unavailable:
+                self.browser_unavailable.discard(username)
+                return True
+            return False
+    
+    def _pop_outcome(self, username):
+        with self.prefetch_lock:
+            return self.fetch_outcomes.pop(username, None)
+    
+    def _classify_outcome(self, username, bio, requests_bio):
+        """Cache outcome class for a finished scrape: success, no_bio, not_found, login_wall or transient"""
+        requests_outcome = self._pop_outcome(username)
+        if bio and bio != "TikTok_LOGIN_REQUIRED":
+            return 'no_bio' if bio == "No bio set (Signature Required)" else 'success'
+        if requests_outcome in ('not_found', 'no_bio'):
+            return requests_outcome
+        if requests_bio == "TikTok_LOGIN_REQUIRED" or bio == "TikTok_LOGIN_REQUIRED" or requests_outcome == 'login_wall':
+            return 'login_wall'
+        return 'transient'
+    
+    # PERFORMANCE: Markers of the embedded JSON blobs that carry the profile data
+    JSON_BLOB_MARKERS = (
+        (b'id="__UNIVERSAL_DATA_FOR_REHYDRATION__"', 'rehydration'),
+        (b'id="SIGI_STATE"', 'sigi'),
+    )
+    
+    def _charset_from_headers(self, headers):
+        """Charset declared in the Content-Type header, or None"""
+        match = re.search(r'charset=["\']?([\w.:-]+)', headers.get('Content-Type', ''), re.IGNORECASE)
+        return match.group(1) if match else None
+    
+    def _iter_json_blobs(self, content, charset=None, start=0):
+        """Yield (kind, data) for each embedded profile JSON blob at or after `start` that parses"""
+        for marker, kind in self.JSON_BLOB_MARKERS:
+            marker_pos = content.find(marker, start)
+            if marker_pos == -1:
+                continue
+            start = content.find(b'>', marker_pos)
+            end = content.find(b'</script>', start)
+            if start == -1 or end == -1:
+                continue
+            try:
+                yield kind, json.loads(content[start + 1:end].decode(charset or 'utf-8', errors='replace'))
+            except (ValueError, LookupError):
+                continue
+    
+    def _page_outcome(self, content, charset=None):
+        """Why a fetched page gave no bio: not_found, no_bio, login_wall, or transient when it can't tell"""
+        for kind, data in self._iter_json_blobs(content, charset):
+            try:
+                if kind == 'rehydration':
+                    detail = data['__DEFAULT_SCOPE__'].get('webapp.user-detail')
+                    if detail is None:
+                        continue
+                    if (detail.get('userInfo') or {}).get('user'):
+                        return 'no_bio'
+                    if detail.get('statusCode'):
+                        return 'not_found'
+                else:
+                    return 'no_bio' if data['UserModule']['users'] else 'not_found'
+            except (LookupError, AttributeError, TypeError):
+                continue
+        if b'Make Your Day' in content:
+            return 'login_wall'
+        return 'transient'
+    
+    def _fast_extract_bio(self, content, username, charset=None, start=0):
+        """PERFORMANCE: Find the user-detail JSON by byte search and parse only that slice.
+        Returns None when the page doesn't carry a usable signature, so callers fall back to BeautifulSoup."""
+        for kind, data in self._iter_json_blobs(content, charset, start):
+            try:
+                if kind == 'rehydration':
+                    user = data['__DEFAULT_SCOPE__']['webapp.user-detail']['userInfo']['user']
+                else:
+                    users = data['UserModule']['users']
+                    user = users.get(username) or users.get(username.lower()) or next(iter(users.values()))
+            except (LookupError, StopIteration, AttributeError, TypeError):
+                continue
+            
+            signature = user.get('signature') if isinstance(user, dict) else None
+            if isinstance(signature, str) and signature.strip():
+                return signature.strip()
+        return None
+    
+    STREAM_CHUNK_SIZE = 16 * 1024
+    DRAIN_LIMIT_BYTES = 64 * 1024  # Read small remainders so the connection can go back to the pool
+    
+    def _read_until_profile_data(self, response, username, charset=None):
+        """EARLY ABORT: Read the body chunk by chunk and stop as soon as the embedded profile JSON is complete.
+        Returns (content, bio, parsed_until) - bio is the signature, TikTok_LOGIN_REQUIRED, or None if the full
+        page was read and needs the regular extraction pass; parsed_until is where the blobs already
+        checked by the fast path end, so that pass doesn't parse them again."""
+        buffer = bytearray()
+        blob_start = -1
+        scanned = 0
+        parsed_until = 0
+        
+        for chunk in response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE):
+            buffer.extend(chunk)
+            
+            if blob_start == -1:
+                # Overlap the previous chunk so markers split across chunk boundaries are still found
+                search_from = max(0, scanned - 64)
+                for marker, _ in self.JSON_BLOB_MARKERS:
+                    pos = buffer.find(marker, search_from)
+                    if pos != -1:
+                        blob_start = pos
+                        break
+            
+            if blob_start >= 0:
+                blob_end = buffer.find(b'</script>', max(blob_start, scanned - 16))
+                if blob_end != -1:
+                    content = bytes(buffer)
+                    bio_text = self._fast_extract_bio(content, username, charset)
+                    if not bio_text and b'webapp.user-detail' not in content[blob_start:blob_end] and b'Make Your Day' in content:
+                        # Data blob finished without any user detail: this is the login wall
+                        bio_text = "TikTok_LOGIN_REQUIRED"
+                    if bio_text:
+                        content_length = response.headers.get('Content-Length')
+                        remaining = int(content_length) - response.raw.tell() if content_length and content_length.isdigit() else None
+                        if remaining is not None and remaining <= self.DRAIN_LIMIT_BYTES:
+                            for _ in response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE):
+                                pass
+                        else:
+                            log.debug("🌐 REQUESTS: Profile data complete after %s bytes, stopping download for %s", len(content), username)
+                        if bio_text == "TikTok_LOGIN_REQUIRED":
+                            log.debug("🌐 REQUESTS: Login page detected for %s", username)
+                        else:
+                            log.debug("🌐 REQUESTS: Found bio in JSON data (streamed): %.100r", bio_text)
+                        return content, bio_text, len(content)
+                    # Blob didn't have what we need - the rest of the page goes to the full extractor
+                    blob_start = -2
+                    parsed_until = blob_end
+            
+            scanned = len(buffer)
+        
+        return bytes(buffer), None, parsed_until
+    
+    def _extract_bio_from_content(self, content, username, charset=None, parsed_until=0):
+        """Extract bio from a raw profile page body (shared by the requests and async fetch paths).
+        Blobs ending before parsed_until were already checked by the streaming fast path."""
+        # PERFORMANCE: Byte-level fast path - skips chardet and BeautifulSoup for normal profile pages
+        with tracer.span('fast_path'):
+            bio_text = self._fast_extract_bio(content, username, charset, parsed_until)
+        if bio_text:
+            log.debug("🌐 REQUESTS: Found bio in JSON data (fast path): %.100r", bio_text)
+            return bio_text
+        return self._soup_extract_bio(content, username, charset)
+    
+    def _soup_extract_bio(self, content, username, charset=None):
+        """Fallback: full decode + BeautifulSoup pass, for pages the fast path can't read"""
+        if charset:
+            encoding = charset
+        else:
+            # Try to detect encoding
+            try:
+                import chardet
+                with tracer.span('charset_detect'):
+                    detected = chardet.detect(content)
+                encoding = detected.get('encoding') or 'utf-8'
+            except ImportError:
+                encoding = 'utf-8'
+        
+        try:
+            text_content = content.decode(encoding, errors='ignore')
+        except:
+            text_content = content.decode('utf-8', errors='ignore')
+        
+        with tracer.span('beautifulsoup'):
+            soup = BeautifulSoup(text_content, 'html.parser')
+        
+        # Updated selectors based on current TikTok structure
+        bio_selectors = [
+            '[data-e2e="user-bio"]',
+            'h2[data-e2e="user-bio"]',
+            '[data-testid="user-bio"]',
+            '.css-1mf3iq5-H2ShareDesc',
+            '.tiktok-1mf3iq5-H2ShareDesc',
+            'h2.tiktok-1mf3iq5-H2ShareDesc',
+            '.user-bio',
+            '.profile-bio'
+        ]
+        
+        bio_text = ""
+        for selector in bio_selectors:
+            bio_elements = soup.select(selector)
+            for bio_element in bio_elements:
+                # FIXED: Use separator='\n' to preserve newlines like Selenium does
+                text = bio_element.get_text(separator='\n', strip=True)
+                if text and len(text) > 0:
+                    bio_text = text
+                    break
+            if bio_text:
+                break
+        
+        # Check for JSON data in various script tags
+        if not bio_text:
+            scripts = soup.find_all('script')
+            for script in scripts:
+                if script.string and ('signature' in script.string or 'bio' in script.string.lower() or 'userInfo' in script.string):
+                    try:
+                        # Try to extract JSON data
+                        script_content = script.string.strip()
+                        
+                        # Look for userInfo data that contains the signature/bio
+                        if 'webapp.user-detail' in script_content:
+                            # Extract the userInfo data
+                            import re
+                            pattern = r'"signature":"([^"]*)"'
+                            match = re.search(pattern, script_content)
+                            if match:
+                                bio_text = match.group(1)
+                                # Decode escape sequences
+                                bio_text = bio_text.replace('\\n', '\n').replace('\\"', '"')
+                                log.debug("🌐 REQUESTS: Found bio in JSON data: %.100r", bio_text)
+                                break
+                        
+                        # Fallback to old method
+                        if not bio_text and script_content.startswith('window.__INITIAL_STATE__'):
+                            json_str = script_content.replace('window.__INITIAL_STATE__=', '').rstrip(';')
+                            data = json.loads(json_str)
+                        elif not bio_text and script_content.startswith('{') and script_content.endswith('}'):
+                            data = json.loads(script_content)
+                        else:
+                            continue
+                        
+                        # Search for signature/bio in the JSON structure
+                        if not bio_text:
+                            bio_text = self._extract_bio_from_json(data)
+                            if bio_text:
+                                break
+                    except Exception as e:
+                        log.debug("🌐 REQUESTS: JSON parsing error: %s", e)
+                        continue
+        
+        # Get page text for login detection and fallback search
+        page_text = soup.get_text()
+        
+        # Also search in all text content for email patterns as fallback
+        if not bio_text:
+            # Look for potential bio sections in page text
+            lines = page_text.split('\n')
+            for i, line in enumerate(lines):
+                line = line.strip()
+                # Skip common non-bio text
+                if line in ['Signature (Required):', 'Sign up', 'Log in', 'Following', 'Followers', 'Likes']:
+                    continue
+                if '@' in line and '.' in line and len(line) < 200:  # Potential bio with email
+                    bio_text = line
+                    break
+            
+            # If still no bio but we found "Signature (Required):", it means no bio set
+            if not bio_text and 'Signature (Required):' in page_text:
+                bio_text = "No bio set (Signature Required)"
+            
+        # Check if we got the login page instead of profile
+        if 'Make Your Day' in page_text and not bio_text:
+            bio_text = "TikTok_LOGIN_REQUIRED"
+            log.debug("🌐 REQUESTS: Login page detected for %s", username)
+        
+        log.debug("🌐 REQUESTS: Bio extracted for %s: %.100r", username, bio_text)
+        return bio_text
+    
     def _extract_bio_from_json(self, data):
         """Recursively search for bio/signature in JSON data"""
         if isinstance(data, dict):
@@ -627,130 +2540,145 @@ class TikTokScraper:
     
 # Playwright scraping method removed
     
+    SELENIUM_BIO_SELECTORS = [
+        '[data-e2e="user-bio"]',
+        'h2[data-e2e="user-bio"]',
+        '[data-testid="user-bio"]',
+        '.css-1mf3iq5-H2ShareDesc',
+        '.tiktok-1mf3iq5-H2ShareDesc',
+        'h2.tiktok-1mf3iq5-H2ShareDesc',
+        '.user-bio',
+        '.profile-bio',
+        '[data-e2e="user-subtitle"]'
+    ]
+    
+    # Resolves with {bio, source} as soon as the profile data is in the page, or {bio: null, text} at the deadline.
+    # An empty bio with source 'json' means the profile has no bio (or doesn't exist) - no point waiting for one.
+    SELENIUM_EXTRACT_SCRIPT = """
+        const selectors = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+        function readBio() {
+            for (const id of ['__UNIVERSAL_DATA_FOR_REHYDRATION__', 'SIGI_STATE']) {
+                const el = document.getElementById(id);
+                if (!el || !el.textContent) continue;
+                try {
+                    const data = JSON.parse(el.textContent);
+                    let user = null;
+                    if (id === 'SIGI_STATE') {
+                        user = Object.values((data.UserModule || {}).users || {})[0] || null;
+                    } else {
+                        const detail = (data.__DEFAULT_SCOPE__ || {})['webapp.user-detail'];
+                        if (!detail) continue;
+                        user = (detail.userInfo || {}).user || null;
+                        if (!user && detail.statusCode) return {bio: '', source: 'json'};
+                    }
+                    if (user && typeof user.signature === 'string') {
+                        return {bio: user.signature.trim(), source: 'json'};
+                    }
+                } catch (e) {}
+            }
+            for (const selector of selectors) {
+                for (const el of document.querySelectorAll(selector)) {
+                    const text = (el.innerText || '').trim();
+                    if (text) return {bio: text, source: selector};
+                }
+            }
+            return null;
+        }
+        let finished = false, scheduled = false;
+        const observer = new MutationObserver(() => {
+            if (!scheduled) { scheduled = true; setTimeout(check, 50); }
+        });
+        const timer = setTimeout(() => finish({bio: null, text: document.body ? document.body.innerText : ''}), timeoutMs);
+        function finish(result) {
+            if (finished) return;
+            finished = true;
+            observer.disconnect();
+            clearTimeout(timer);
+            done(result);
+        }
+        function check() {
+            scheduled = false;
+            const result = readBio();
+            if (result) finish(result);
+        }
+        const first = readBio();
+        if (first) finish(first);
+        else observer.observe(document.documentElement || document, {childList: true, subtree: true, characterData: true});
+    """
+    
     def scrape_with_selenium(self, username):
         """PERFORMANCE: Use WebDriver pool for Selenium scraping"""
         driver = None
         try:
-            # CPU MONITORING: Track CPU usage
-            cpu_monitor.get_cpu_history()
-            
             # Check if WebDriver pool is available
             if not webdriver_pool:
-                print("WebDriver pool not available, skipping Selenium method")
+                log.warning("WebDriver pool not available, skipping Selenium method")
+                self._record_browser_unavailable(username)
                 return None
                 
             username = username.replace('@', '').strip()
-            url = f"https://www.tiktok.com/@{username}"
+            url = profile_url(username)
             
             # Get driver from pool
-            driver = webdriver_pool.get_driver(timeout=5)
+            with tracer.span('driver_lease'):
+                driver = webdriver_pool.get_driver(timeout=5)
             if not driver:
+                self._record_browser_unavailable(username)
                 return None
             
             # Validate driver session before using
             try:
                 driver.current_url  # Test if session is valid
             except Exception as e:
-                print(f"Driver session invalid, creating new one: {e}")
-                try:
-                    driver.quit()
-                except:
-                    pass
-                driver = webdriver_pool._create_driver()
+                log.warning("Driver session invalid, creating new one: %s", e)
+                webdriver_pool.discard_driver(driver)
+                with tracer.span('driver_lease'):
+                    driver = webdriver_pool.get_driver(timeout=5)
                 if not driver:
+                    self._record_browser_unavailable(username)
                     return None
             
-            driver.get(url)
-            print(f"🔧 SELENIUM: Loaded URL: {url}")
-
-            # Reduced wait time for faster processing
-            time.sleep(0.5)  # Optimized for maximum speed
-            print(f"🔧 SELENIUM: Waiting for page to load...")
-            
-            # Try multiple selectors with different waiting strategies
-            bio_selectors = [
-                '[data-e2e="user-bio"]',
-                'h2[data-e2e="user-bio"]',
-                '[data-testid="user-bio"]',
-                '.css-1mf3iq5-H2ShareDesc',
-                '.tiktok-1mf3iq5-H2ShareDesc',
-                'h2.tiktok-1mf3iq5-H2ShareDesc',
-                '.user-bio',
-                '.profile-bio',
-                '[data-e2e="user-subtitle"]'
-            ]
-            
-            bio_text = ""
-            
-            # First, try to find elements that are immediately available
-            print(f"🔧 SELENIUM: Searching for bio elements with {len(bio_selectors)} selectors")
-            for i, selector in enumerate(bio_selectors):
-                try:
-                    elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                    print(f"🔧 SELENIUM: Selector {i+1}/{len(bio_selectors)} '{selector}' found {len(elements)} elements")
-                    for element in elements:
-                        text = element.text.strip()
-                        if text and len(text) > 0:
-                            bio_text = text
-                            print(f"🔧 SELENIUM: Found bio with selector '{selector}': '{text[:50]}{'...' if len(text) > 50 else ''}'")
-                            break
-                    if bio_text:
-                        break
-                except Exception as e:
-                    print(f"🔧 SELENIUM: Error with selector '{selector}': {e}")
-                    continue
+            with tracer.span('page_load'):
+                driver.get(url)
+            log.debug("🔧 SELENIUM: Loaded URL: %s", url)
             
-            # If no bio found, try waiting for elements to appear (reduced timeout)
-            if not bio_text:
-                print(f"🔧 SELENIUM: No immediate bio found, trying WebDriverWait...")
-                for i, selector in enumerate(bio_selectors):
-                    try:
-                        element = WebDriverWait(driver, 1).until(  # Optimized for speed
-                            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                        )
-                        bio_text = element.text.strip()
-                        if bio_text:
-                            print(f"🔧 SELENIUM: Found bio with WebDriverWait selector '{selector}': '{bio_text[:50]}{'...' if len(bio_text) > 50 else ''}'")
-                            break
-                    except Exception as e:
-                        print(f"🔧 SELENIUM: WebDriverWait failed for selector '{selector}': {e}")
-                        continue
+            # PERFORMANCE: One in-page script reads the profile JSON or every bio selector, and if nothing is there yet
+            # waits for DOM mutations until a single deadline - no fixed sleeps or per-selector waits
+            driver.set_script_timeout(SELENIUM_EXTRACT_TIMEOUT + 5)
+            started = time.perf_counter()
+            with tracer.span('extract_script'):
+                result = driver.execute_async_script(self.SELENIUM_EXTRACT_SCRIPT, self.SELENIUM_BIO_SELECTORS, int(SELENIUM_EXTRACT_TIMEOUT * 1000)) or {}
+            log.debug("🔧 SELENIUM: Extraction finished in %.2fs (source: %s)", time.perf_counter() - started, result.get('source') or 'none')
+            if SELENIUM_BLOCK_RESOURCES:
+                with tracer.span('resource_stats'):
+                    page_resources = browser_resource_stats.record_page(driver)
+                if page_resources:
+                    log.debug("🔧 SELENIUM: Blocked %s requests %s, transferred %.0f KB", page_resources['blocked_requests'], page_resources['blocked'], page_resources['transferred_bytes'] / 1024)
             
-            # If still no bio, try to extract from page source
-            if not bio_text:
-                print(f"🔧 SELENIUM: No bio found with selectors, trying page source extraction...")
-                page_source = driver.page_source
-                soup = BeautifulSoup(page_source, 'html.parser')
-                
-                # Look for any text that might contain emails
-                all_text = soup.get_text()
-                lines = all_text.split('\n')
-                print(f"🔧 SELENIUM: Searching through {len(lines)} lines of page source...")
-                for line in lines:
+            bio_text = (result.get('bio') or '').strip()
+            if not bio_text and result.get('text'):
+                # Deadline passed without profile data - look for a bio-like line with an email in the page text
+                for line in result['text'].split('\n'):
                     line = line.strip()
                     if '@' in line and '.' in line and len(line) < 200:
-                        # Check if it looks like a bio (contains email and reasonable length)
                         if re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', line):
                             bio_text = line
-                            print(f"🔧 SELENIUM: Found bio in page source: '{bio_text[:50]}{'...' if len(bio_text) > 50 else ''}'")
+                            log.debug("🔧 SELENIUM: Found bio in page text: %.50r", bio_text)
                             break
             
             if bio_text:
-                print(f"🔧 SELENIUM: Final bio result for {username}: '{bio_text[:100]}{'...' if len(bio_text) > 100 else ''}'")
+                log.debug("🔧 SELENIUM: Final bio result for %s: %.100r", username, bio_text)
             else:
-                print(f"🔧 SELENIUM: No bio found for {username} with any method")
+                log.debug("🔧 SELENIUM: No bio found for %s with any method", username)
             
             return bio_text
             
         except Exception as e:
-            print(f"Selenium method failed: {str(e)}")
+            log.warning("Selenium method failed: %s", e)
+            browser_concurrency.signal_congestion('error')
             # If it's a session error, mark driver as invalid
             if "invalid session id" in str(e).lower() or "session" in str(e).lower():
-                try:
-                    if driver:
-                        driver.quit()
-                except:
-                    pass
+                webdriver_pool.discard_driver(driver)
                 driver = None  # Don't return invalid driver to pool
             return None
         finally:
@@ -762,224 +2690,362 @@ class TikTokScraper:
         """PERFORMANCE: Main method with caching and OPTIMIZED scraping order"""
         username = username.replace('@', '').strip().lower()
         
-        print(f"🔍 Starting scrape for username: {username}")
-        
-        # 1. Check cache first (fastest)
-        cached_result = profile_cache.get(username, expire_time=True)
-        
-        # cached_result is a (value, expire_time) tuple
-        if cached_result is not None and cached_result[0] is not None and cached_result[1] is not None and cached_result[1] > time.time():
-            print(f"✅ CACHE HIT for {username} - returning cached result")
-            return cached_result[0].get('bio', '')  # [0] is the value
-            
-        print(f"❌ CACHE MISS for {username} - starting fresh scrape")
+        log.debug("🔍 Starting scrape for username: %s", username)
         
+        with tracer.trace('scrape_bio', username=username):
+            # 1. Check cache first (fastest) - L1 memory, then diskcache
+            with tracer.span('cache_lookup'):
+                cached_data = get_cached_profile(username)
+            if cached_data is not None:
+                log.debug("✅ CACHE HIT for %s - returning cached result (%s)", username, cached_outcome(cached_data))
+                tracer.annotate(source='cache')
+                tier_stats.record('cache')
+                return cached_data.get('bio', '')
+                
+            log.debug("❌ CACHE MISS for %s - starting fresh scrape", username)
+            # PERFORMANCE: Concurrent requests for the same username share one scrape
+            return scrape_coalescer.run(username, lambda: self._scrape_fresh(username))
+    
+    def _scrape_fresh(self, username):
+        """Run the requests and Selenium tiers for one username, in the order the router picks, and cache the outcome"""
         bio = None
         method_used = None
+        requests_bio = None
         
-        # 2. Try requests first (lightweight and very fast)
-        print(f"🌐 Attempting requests method for {username}")
-        try:
-            bio = self.scrape_with_requests(username)
+        # ADAPTIVE ROUTING: Skip straight to Selenium when requests is likely to hit a login wall
+        # (an already-prefetched requests result is free, so it always goes first)
+        selenium_first = not self.has_prefetched(username) and tier_router.choose(username) == 'selenium'
+        if selenium_first:
+            log.debug("🧭 ROUTER: Sending %s straight to Selenium", username)
+            bio = self._run_selenium_tier(username)
             if bio:
+                method_used = "selenium"
+        
+        # 2. Try requests (lightweight and very fast)
+        if not bio:
+            bio = requests_bio = self._run_requests_tier(username)
+            if bio and bio != "TikTok_LOGIN_REQUIRED":
                 method_used = "requests"
-                print(f"✅ REQUESTS SUCCESS for {username} - bio length: {len(bio) if bio else 0}")
-            else:
-                print(f"⚠️ REQUESTS RETURNED EMPTY for {username}")
-        except Exception as e:
-            print(f"❌ REQUESTS FAILED for {username}: {e}")
-            bio = None  # Ensure it's None so Selenium runs
             
-        # 3. If requests failed or got a login page, escalate to Selenium
-        #    (Selenium is the slow, heavy, but more reliable fallback)
-        if not bio or bio == "TikTok_LOGIN_REQUIRED":
-            if not bio:
-                print(f"🚀 ESCALATING TO SELENIUM for {username} (requests returned empty)")
-            else:
-                print(f"🚀 ESCALATING TO SELENIUM for {username} (login page detected)")
-                
-            try:
-                print(f"🔧 Attempting Selenium method for {username}")
-                bio = self.scrape_with_selenium(username)
+            # 3. If requests failed or got a login page, escalate to Selenium
+            #    (Selenium is the slow, heavy, but more reliable fallback)
+            if (not bio or bio == "TikTok_LOGIN_REQUIRED") and not selenium_first:
+                if not bio:
+                    log.debug("🚀 ESCALATING TO SELENIUM for %s (requests returned empty)", username)
+                else:
+                    log.debug("🚀 ESCALATING TO SELENIUM for %s (login page detected)", username)
+                bio = self._run_selenium_tier(username)
                 if bio:
                     method_used = "selenium"
-                    print(f"✅ SELENIUM SUCCESS for {username} - bio length: {len(bio) if bio else 0}")
-                else:
-                    print(f"⚠️ SELENIUM RETURNED EMPTY for {username}")
-            except Exception as e:
-                print(f"❌ SELENIUM FAILED for {username}: {e}")
-                bio = None
+            elif bio == "TikTok_LOGIN_REQUIRED":
+                bio = None  # Selenium already failed for this profile
 
         # 4. Final result logging
         if bio:
-            print(f"🎉 FINAL SUCCESS for {username} using {method_used} method - bio: '{bio[:100]}{'...' if len(bio) > 100 else ''}'")
+            log.info("🎉 FINAL SUCCESS for %s using %s method - bio: %.100r", username, method_used, bio, extra=SAMPLED)
             
-            # Check for emails in the bio
-            email_data = self.extract_emails_with_context(bio)
-            emails = [item['email'] for item in email_data]
-            print(f"📧 EMAIL DETECTION for {username}: found {len(emails)} emails - {emails}")
+            # Check for emails in the bio (only for the debug log - callers extract them again)
+            if log.isEnabledFor(logging.DEBUG):
+                emails = [item['email'] for item in self.extract_emails_with_context(bio)]
+                log.debug("📧 EMAIL DETECTION for %s: found %s emails - %s", username, len(emails), emails)
         else:
-            print(f"💥 FINAL FAILURE for {username} - both methods failed")
+            log.info("💥 FINAL FAILURE for %s - both methods failed", username, extra=SAMPLED)
+        tier_stats.record(method_used if bio else 'failed')
 
-        # 5. Cache the result (even if it's None, to prevent re-scraping failures)
-        cache_data = {
-            'bio': bio,  # bio will be None if both methods failed
-            'scraped_at': time.time(),
-            'username': username
-        }
-        # set() is thread-safe and writes to disk/memory
-        profile_cache.set(username, cache_data, expire=86400)  # 86400 seconds = 24 hours
+        # 5. Cache the result - failures too, but with short outcome-specific TTLs
+        outcome = self._classify_outcome(username, bio, requests_bio)
+        tracer.annotate(source=method_used or 'failed', outcome=outcome)
+        with tracer.span('cache_write'):
+            cache_scrape_result(username, bio, method_used, outcome)
         
         return bio
     
+    def _run_requests_tier(self, username):
+        log.debug("🌐 Attempting requests method for %s", username)
+        prefetched = self.has_prefetched(username)
+        if not prefetched:
+            # ADAPTIVE CONCURRENCY: Only a prefetched result is free; live requests wait for an HTTP slot
+            with tracer.span('concurrency_wait'):
+                http_concurrency.acquire()
+        started = time.perf_counter()
+        try:
+            with tracer.span('requests_tier'):
+                bio = self._scrape_requests_tier(username)
+            if bio:
+                log.debug("✅ REQUESTS SUCCESS for %s - bio length: %s", username, len(bio) if bio else 0)
+            else:
+                log.debug("⚠️ REQUESTS RETURNED EMPTY for %s", username)
+        except Exception as e:
+            log.debug("❌ REQUESTS FAILED for %s: %s", username, e)
+            bio = None  # Ensure it's None so Selenium runs
+        if not prefetched:
+            http_concurrency.release(time.perf_counter() - started)  # 429s and errors were already signalled per response
+        
+        # A definitive "no bio" or "no such account" answer counts as the tier working
+        with self.prefetch_lock:
+            outcome = self.fetch_outcomes.get(username)
+            latency = self.prefetch_latencies.pop(username, None) if prefetched else time.perf_counter() - started
+        success = (bool(bio) and bio != "TikTok_LOGIN_REQUIRED") or outcome in ('no_bio', 'not_found')
+        tier_router.record('requests', success, latency, username)
+        TIER_ATTEMPTS_TOTAL.inc(tier='requests', result='success' if success else 'failure')
+        if latency is not None:
+            TIER_LATENCY.observe(latency, tier='requests')
+        return bio
+    
+    def _run_selenium_tier(self, username):
+        log.debug("🔧 Attempting Selenium method for %s", username)
+        # ADAPTIVE CONCURRENCY: Browser lookups have their own, much smaller limit
+        with tracer.span('concurrency_wait'):
+            browser_concurrency.acquire()
+        started = time.perf_counter()
+        try:
+            with tracer.span('selenium_tier'):
+                bio = self.scrape_with_selenium(username)
+            if bio:
+                log.debug("✅ SELENIUM SUCCESS for %s - bio length: %s", username, len(bio) if bio else 0)
+            else:
+                log.debug("⚠️ SELENIUM RETURNED EMPTY for %s", username)
+        except Exception as e:
+            log.debug("❌ SELENIUM FAILED for %s: %s", username, e)
+            bio = None
+        latency = time.perf_counter() - started
+        if self._pop_browser_unavailable(username):
+            # No browser was leased (pool exhausted, broker unreachable): the fast failure says nothing
+            # about how Selenium lookups perform, so it stays out of the latency and success samples
+            browser_concurrency.release()  # Lease timeouts were already signalled
+            tier_router.record_unavailable('selenium')
+            TIER_ATTEMPTS_TOTAL.inc(tier='selenium', result='unavailable')
+            return bio
+        browser_concurrency.release(latency)  # Driver errors were already signalled
+        tier_router.record('selenium', bool(bio), latency, username)
+        TIER_ATTEMPTS_TOTAL.inc(tier='selenium', result='success' if bio else 'failure')
+        TIER_LATENCY.observe(latency, tier='selenium')
+        return bio
+    
     def scrape_bio_force_refresh(self, username):
         """Scrape bio with cache bypass for fresh data"""
         username = username.replace('@', '').strip().lower()
         
-        print(f"Force refresh for {username} - bypassing cache")
-        
-        bio = None
-        
-        # 2. Try requests first (lightweight and very fast)
-        try:
-            bio = self.scrape_with_requests(username)
-        except Exception as e:
-            print(f"Requests method failed outright: {e}")
-            bio = None
-            
-        # 3. If requests failed or got a login page, escalate to Selenium
-        if not bio or bio == "TikTok_LOGIN_REQUIRED":
-            if not bio:
-                print(f"Requests failed for {username}. Escalating to Selenium.")
-            else:
-                print(f"Requests got login page for {username}. Escalating to Selenium.")
-                
-            try:
-                bio = self.scrape_with_selenium(username)
-            except Exception as e:
-                print(f"Selenium method also failed: {e}")
-                bio = None
-
-        # Cache the result for future use (even with force refresh, we still cache the new result)
-        cache_data = {
-            'bio': bio,
-            'scraped_at': time.time(),
-            'username': username
-        }
-        profile_cache.set(username, cache_data, expire=86400)
-        
-        return bio
+        log.debug("Force refresh for %s - bypassing cache", username)
+        with tracer.trace('scrape_bio', username=username, force_refresh=True):
+            return scrape_coalescer.run(username, lambda: self._scrape_fresh(username))
 
 # PERFORMANCE: Concurrent bulk processing function with memory optimization and CPU throttling
-def process_username_batch(usernames, max_workers=20, force_refresh=False):
+def process_username_batch(usernames, max_workers=None, force_refresh=False, use_async=ASYNC_FETCH_ENABLED):
     """Process multiple usernames concurrently with memory optimization and CPU throttling"""
-    results = []
+    results = list(iter_username_batch(usernames, max_workers=max_workers, force_refresh=force_refresh, use_async=use_async))
+    log.info("📊 BULK PROCESSING COMPLETE: %s results collected from %s usernames", len(results), len(usernames))
+    return results
+
+# PERFORMANCE: Bulk pre-pass planner - normalize and dedupe the list, answer cache hits from one batched read
+# and hand only true misses to the scheduler
+def normalize_username(username):
+    return str(username).replace('@', '').strip().lower()
+
+def plan_username_batch(usernames, use_cache=True):
+    """Split a bulk list into (positions, cached, misses): input positions per normalized username ('' collects
+    blank entries), cached profile dicts by username, and the usernames that still need a scrape, in list order"""
+    positions = {}
+    for index, username in enumerate(usernames):
+        positions.setdefault(normalize_username(username), []).append(index)
+    distinct = [username for username in positions if username]
+    cached = get_cached_profiles(distinct) if use_cache else {}
+    misses = [username for username in distinct if username not in cached]
+    return positions, cached, misses
+
+# PERFORMANCE: Sliding-window scheduler - one long-lived executor per process; each bulk run keeps up to
+# get_optimal_workers() usernames in flight and starts the next one the moment a slot frees up
+BULK_EXECUTOR_THREADS = int(os.environ.get('BULK_EXECUTOR_THREADS', AIMD_HTTP_MAX + AIMD_BROWSER_MAX))
+
+class BulkExecutor:
+    """Thread pool shared by all bulk runs in a process, created lazily (gunicorn forks after --preload-app)"""
+    def __init__(self, max_workers=BULK_EXECUTOR_THREADS):
+        self.max_workers = max_workers
+        self.executor = None
+        self.owner_pid = None
+        self.lock = Lock()
+    
+    def submit(self, fn, *args):
+        if self.owner_pid != os.getpid():
+            with self.lock:
+                if self.owner_pid != os.getpid():
+                    self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='bulk')
+                    self.owner_pid = os.getpid()
+        return self.executor.submit(fn, *args)
+    
+    def shutdown(self):
+        if self.executor is not None and self.owner_pid == os.getpid():
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+bulk_executor = BulkExecutor()
+
+def iter_username_batch(usernames, max_workers=None, force_refresh=False, use_async=ASYNC_FETCH_ENABLED):
+    """STREAMING: Yield each username's result as soon as it completes - no batch barriers, a freed slot
+    immediately starts the next username. max_workers caps this run's window below the adaptive limit
+    (None: no extra cap)"""
     # PERFORMANCE: Create shared scraper instance for session reuse
     scraper = TikTokScraper()
+    # TRACING: Generators can't hold a context-bound trace across yields, so the batch trace is passed explicitly
+    batch_trace = tracer.start('process_username_batch', usernames=len(usernames), force_refresh=force_refresh)
+    events = Queue()  # ('ready', index) once a username may start, ('done', index, future) once it finished
     
-    # RATE LIMITING: Process in smaller batches to avoid detection
-    batch_size = 25  # Process 25 usernames per batch
-    
-    # CPU MONITORING: Calculate optimal workers based on CPU cores
-    optimal_workers = cpu_monitor.get_optimal_workers()
-    print(f"🔄 Using {optimal_workers} workers (limited to 20 for resource management)")
+    def username_result(username, bio):
+        if bio:
+            if bio == "TikTok_LOGIN_REQUIRED":
+                return {
+                    'username': username,
+                    'success': False,
+                    'error': 'TikTok requires login to view profiles',
+                    'suggestion': f'Manual URL: https://www.tiktok.com/@{username}'
+                }
+            
+            # MEMORY OPTIMIZATION: Extract emails without storing full bio in memory
+            email_data = scraper.extract_emails_with_context(bio)
+            emails = [item['email'] for item in email_data]
+            
+            # MEMORY OPTIMIZATION: Only store essential data
+            result = {
+                'username': username,
+                'success': True,
+                'bio': bio,  # Keep bio for now, but could be optimized further
+                'emails': emails,
+                'email_data': email_data,
+                'email_count': len(emails)
+            }
+            
+            log.debug("✅ USERNAME %s COMPLETED SUCCESSFULLY - Found %s emails: %s", username, len(emails), emails)
+            
+            # MEMORY OPTIMIZATION: Clear bio from memory after processing
+            bio = None
+            return result
+        log.debug("❌ USERNAME %s FAILED - Could not retrieve bio", username)
+        return {
+            'username': username,
+            'success': False,
+            'error': 'Could not retrieve bio'
+        }
     
     def process_single_username(username):
-        print(f"📋 PROCESSING USERNAME: {username}")
+        log.debug("📋 PROCESSING USERNAME: %s", username)
         try:
-            # CPU MONITORING: Track CPU usage
-            cpu_monitor.get_cpu_history()
-            
             # Use force_refresh to bypass cache if requested
             if force_refresh:
-                print(f"🔄 FORCE REFRESH enabled for {username}")
+                log.debug("🔄 FORCE REFRESH enabled for %s", username)
                 bio = scraper.scrape_bio_force_refresh(username)
             else:
                 bio = scraper.scrape_bio(username)
-            if bio:
-                if bio == "TikTok_LOGIN_REQUIRED":
-                    return {
-                        'username': username,
-                        'success': False,
-                        'error': 'TikTok requires login to view profiles',
-                        'suggestion': f'Manual URL: https://www.tiktok.com/@{username}'
-                    }
-                
-                # MEMORY OPTIMIZATION: Extract emails without storing full bio in memory
-                email_data = scraper.extract_emails_with_context(bio)
-                emails = [item['email'] for item in email_data]
-                
-                # MEMORY OPTIMIZATION: Only store essential data
-                result = {
-                    'username': username,
-                    'success': True,
-                    'bio': bio,  # Keep bio for now, but could be optimized further
-                    'emails': emails,
-                    'email_data': email_data,
-                    'email_count': len(emails)
-                }
-                
-                print(f"✅ USERNAME {username} COMPLETED SUCCESSFULLY - Found {len(emails)} emails: {emails}")
-                
-                # MEMORY OPTIMIZATION: Clear bio from memory after processing
-                bio = None
-                return result
-            else:
-                print(f"❌ USERNAME {username} FAILED - Could not retrieve bio")
-                return {
-                    'username': username,
-                    'success': False,
-                    'error': 'Could not retrieve bio'
-                }
+            return username_result(username, bio)
         except Exception as e:
-            print(f"💥 USERNAME {username} EXCEPTION: {str(e)}")
+            log.error("💥 USERNAME %s EXCEPTION: %s", username, e)
             return {
                 'username': username,
                 'success': False,
                 'error': f'Error: {str(e)}'
             }
     
-    # RATE LIMITING: Process usernames in batches with breaks
-    total_batches = (len(usernames) + batch_size - 1) // batch_size
-    print(f"📊 Processing {len(usernames)} usernames in {total_batches} batches of {batch_size}")
+    def traced_single_username(username):
+        with tracer.trace('bulk_username', username=username, batch=batch_trace.trace_id if batch_trace else None):
+            return process_single_username(username)
     
-    for batch_num in range(total_batches):
-        start_idx = batch_num * batch_size
-        end_idx = min(start_idx + batch_size, len(usernames))
-        batch_usernames = usernames[start_idx:end_idx]
-        
-        print(f"🔄 Processing batch {batch_num + 1}/{total_batches} ({len(batch_usernames)} usernames)")
-        
-        # Process current batch
-        with ThreadPoolExecutor(max_workers=optimal_workers) as executor:
-            # Submit batch tasks
-            future_to_username = {executor.submit(process_single_username, username): username for username in batch_usernames}
+    # PERFORMANCE: Plan first - duplicates and @/case variants share one lookup, cache hits never reach a thread
+    with tracer.span('plan', trace=batch_trace):
+        positions, cached, misses = plan_username_batch(usernames, use_cache=not force_refresh)
+    if batch_trace is not None:
+        batch_trace.attrs.update(distinct=len(cached) + len(misses), cached=len(cached))
+    log.info("🗂️ PLAN: %s usernames -> %s distinct, %s cached, %s to scrape",
+             len(usernames), len(cached) + len(misses), len(cached), len(misses))
+    if '' in positions:
+        events.put(('invalid', ''))
+    for username in cached:
+        events.put(('cached', username))
+    
+    # PERFORMANCE: Pipelined async prefetch - the HTTP tier for every miss runs on the async engine in the
+    # background and each username is dispatched as soon as its page is in; usernames routed straight to
+    # Selenium start right away
+    waiting = set()
+    if use_async and misses:
+        try:
+            waiting = set(scraper.plan_prefetch(misses, use_cache=False))
+        except Exception as e:
+            log.warning("⚡ ASYNC: Prefetch planning failed, falling back to per-thread requests: %s", e)
+    for username in misses:
+        if username not in waiting:
+            events.put(('ready', username))
+    
+    def release_prefetched(username):
+        if username in waiting:
+            waiting.discard(username)
+            events.put(('ready', username))
+    
+    def run_prefetch():
+        try:
+            with tracer.span('async_prefetch', trace=batch_trace):
+                scraper.prefetch_planned(list(waiting), on_result=release_prefetched)
+        except Exception as e:
+            log.warning("⚡ ASYNC: Prefetch failed, falling back to per-thread requests: %s", e)
+        finally:
+            for username in list(waiting):
+                release_prefetched(username)
+    
+    if waiting:
+        threading.Thread(target=run_prefetch, name='bulk-prefetch', daemon=True).start()
+    
+    def window_size():
+        # ADAPTIVE CONCURRENCY: The window follows the current HTTP + browser limits
+        window = min(cpu_monitor.get_optimal_workers(), BULK_EXECUTOR_THREADS)
+        return min(window, max_workers) if max_workers else window
+    
+    if misses:
+        log.info("📊 Processing %s usernames, up to %s at a time", len(misses), window_size())
+    
+    ready = deque()
+    in_flight = 0
+    completed = 0
+    remaining = len(usernames)
+    BULK_PENDING_USERNAMES.inc(remaining)
+    try:
+        while completed < len(usernames):
+            window = window_size()
+            while ready and in_flight < window:
+                username = ready.popleft()
+                future = bulk_executor.submit(traced_single_username, username)
+                future.add_done_callback(lambda f, username=username: events.put(('done', username, f)))
+                in_flight += 1
+            
+            event = events.get()
+            kind, username = event[0], event[1]
+            if kind == 'ready':
+                ready.append(username)
+                continue
             
-            # Collect results as they complete
-            batch_completed = 0
-            for future in as_completed(future_to_username):
-                username = future_to_username[future]
-                batch_completed += 1
-                total_completed = start_idx + batch_completed
-                print(f"📊 COMPLETED {total_completed}/{len(usernames)}: {username}")
+            if kind == 'cached':
+                tier_stats.record('cache')
+                result = username_result(username, cached[username].get('bio', ''))
+            elif kind == 'invalid':
+                result = {'username': username, 'success': False, 'error': 'Invalid username'}
+            else:
+                in_flight -= 1
                 try:
-                    result = future.result()
-                    results.append(result)
-                    print(f"✅ RESULT ADDED for {username}: success={result.get('success', False)}")
-                        
+                    result = event[2].result()
+                    log.debug("✅ RESULT READY for %s: success=%s", username, result.get('success', False))
                 except Exception as e:
-                    error_result = {
+                    result = {
                         'username': username,
                         'success': False,
                         'error': f'Processing error: {str(e)}'
                     }
-                    results.append(error_result)
-                    print(f"❌ ERROR RESULT ADDED for {username}: {str(e)}")
-        
-        # Continue to next batch immediately (no rate limiting break)
-    
-    print(f"📊 BULK PROCESSING COMPLETE: {len(results)} results collected from {len(usernames)} usernames")
-    return results
+                    log.error("❌ ERROR RESULT READY for %s: %s", username, e)
+            
+            # One result per input entry, under the username exactly as it was given
+            for index in positions[username]:
+                completed += 1
+                log.debug("📊 COMPLETED %s/%s: %s", completed, len(usernames), usernames[index])
+                remaining -= 1
+                BULK_PENDING_USERNAMES.dec()
+                yield dict(result, username=usernames[index])
+    finally:
+        BULK_PENDING_USERNAMES.dec(remaining)  # Client disconnected or the job was cancelled mid-run
+        tracer.finish(batch_trace)
 
 @app.route('/')
 def index():
@@ -994,12 +3060,12 @@ def scrape_bio():
         if not username:
             return jsonify({'error': 'Please provide a TikTok username'})
         
-        print(f"Scraping bio for username: {username}")  # Debug log
+        log.debug("Scraping bio for username: %s", username)
         
         scraper = TikTokScraper()
         bio = scraper.scrape_bio(username)
         
-        print(f"Retrieved bio: {bio[:100] if bio else 'None'}...")  # Debug log
+        log.debug("Retrieved bio: %.100r", bio)
         
         if bio:
             # Check if TikTok is requiring login
@@ -1013,7 +3079,7 @@ def scrape_bio():
             # Get emails with context
             email_data = scraper.extract_emails_with_context(bio)
             emails = [item['email'] for item in email_data]
-            print(f"Extracted emails with context: {email_data}")  # Debug log
+            log.debug("Extracted emails with context: %s", email_data)
             
             return jsonify({
                 'success': True,
@@ -1030,12 +3096,50 @@ def scrape_bio():
             })
     
     except Exception as e:
-        print(f"Error in scrape_bio: {str(e)}")  # Debug log
+        log.error("Error in scrape_bio: %s", e)
         return jsonify({
             'success': False,
             'error': f'An error occurred: {str(e)}'
         })
 
+def format_bulk_result(result):
+    """Format a process_username_batch result for the frontend"""
+    if result['success']:
+        return {
+            'username': result['username'],
+            'success': True,
+            'emails': result['emails'],
+            'email_data': result['email_data'],
+            'bio': result['bio']
+        }
+    return {
+        'username': result['username'],
+        'success': False,
+        'error': result['error'],
+        'suggestion': result.get('suggestion')
+    }
+
+def stream_bulk_results(usernames, force_refresh=False):
+    """STREAMING: NDJSON generator - one 'result' line per username, then a 'done' summary line"""
+    total = len(usernames)
+    completed = 0
+    successful = 0
+    try:
+        for result in iter_username_batch(usernames, force_refresh=force_refresh):
+            completed += 1
+            if result['success']:
+                successful += 1
+            yield json.dumps({
+                'type': 'result',
+                'result': format_bulk_result(result),
+                'completed': completed,
+                'total': total
+            }) + '\n'
+        yield json.dumps({'type': 'done', 'success': True, 'total': completed, 'successful': successful}) + '\n'
+    except Exception as e:
+        log.error("Error in bulk_scrape stream: %s", e)
+        yield json.dumps({'type': 'error', 'success': False, 'error': f'Bulk processing failed: {str(e)}'}) + '\n'
+
 @app.route('/bulk-scrape', methods=['POST'])
 def bulk_scrape():
     """PERFORMANCE: Concurrent bulk processing endpoint"""
@@ -1043,6 +3147,7 @@ def bulk_scrape():
         data = request.get_json()
         usernames = data.get('usernames', [])
         force_refresh = data.get('force_refresh', False)  # Cache-busting parameter
+        stream = data.get('stream', False)  # Stream results as NDJSON instead of one JSON response
         
         if not usernames:
             return jsonify({'error': 'Please provide usernames'})
@@ -1054,34 +3159,24 @@ def bulk_scrape():
                 'error': f'Too many usernames for single batch. Processing {len(usernames)} usernames in batches of {BATCH_SIZE}.',
                 'batch_size': BATCH_SIZE,
                 'total_usernames': len(usernames),
-                'suggestion': f'Please split your request into batches of {BATCH_SIZE} usernames or fewer.'
+                'suggestion': f'Please split your request into batches of {BATCH_SIZE} usernames or fewer, or submit the full list to /jobs for background processing.'
             })
         
-        print(f"Processing {len(usernames)} usernames concurrently...")
+        log.info("Processing %s usernames concurrently...", len(usernames))
         if force_refresh:
-            print("🔄 Force refresh enabled - bypassing cache for fresh data")
+            log.info("🔄 Force refresh enabled - bypassing cache for fresh data")
+        
+        # STREAMING: Send each result as an NDJSON line as soon as it completes
+        if stream:
+            return Response(stream_with_context(stream_bulk_results(usernames, force_refresh)),
+                            mimetype='application/x-ndjson',
+                            headers={'X-Accel-Buffering': 'no', 'Cache-Control': 'no-cache'})
         
         # Process concurrently (3-5x faster than sequential)
-        results = process_username_batch(usernames, max_workers=20, force_refresh=force_refresh)
+        results = process_username_batch(usernames, force_refresh=force_refresh)
         
         # Format results for frontend
-        processed_results = []
-        for result in results:
-            if result['success']:
-                processed_results.append({
-                    'username': result['username'],
-                    'success': True,
-                    'emails': result['emails'],
-                    'email_data': result['email_data'],
-                    'bio': result['bio']
-                })
-            else:
-                processed_results.append({
-                    'username': result['username'],
-                    'success': False,
-                    'error': result['error'],
-                    'suggestion': result.get('suggestion')
-                })
+        processed_results = [format_bulk_result(result) for result in results]
         
         return jsonify({
             'success': True,
@@ -1091,12 +3186,496 @@ def bulk_scrape():
         })
         
     except Exception as e:
-        print(f"Error in bulk_scrape: {str(e)}")
+        log.error("Error in bulk_scrape: %s", e)
         return jsonify({
             'success': False,
             'error': f'Bulk processing failed: {str(e)}'
         })
 
+# PERFORMANCE: Persistent background job queue for bulk scrapes (survives restarts and worker recycling)
+import sqlite3
+import uuid
+from collections import defaultdict
+
+JOBS_DB_PATH = os.path.join(CACHE_DIR, 'jobs.db')
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))  # Background runner threads per process
+JOB_CHUNK_SIZE = int(os.environ.get('JOB_CHUNK_SIZE', 25))  # Usernames claimed per runner at a time
+JOB_MAX_IN_FLIGHT = int(os.environ.get('JOB_MAX_IN_FLIGHT', 10))  # Per-runner cap on bulk executor slots, so /bulk-scrape keeps the rest
+JOB_LEASE_SECONDS = int(os.environ.get('JOB_LEASE_SECONDS', 600))  # Claims not renewed for this long are re-queued
+JOB_HEARTBEAT_INTERVAL = float(os.environ.get('JOB_HEARTBEAT_INTERVAL', JOB_LEASE_SECONDS / 4))  # How often runners renew their claims
+JOB_SWEEP_INTERVAL = float(os.environ.get('JOB_SWEEP_INTERVAL', JOB_LEASE_SECONDS))  # Stale-claim sweeps per process, plus one at startup
+JOB_RETENTION_SECONDS = int(os.environ.get('JOB_RETENTION_SECONDS', 7 * 86400))  # Finished jobs are purged after this
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 2.0))
+JOB_MAX_USERNAMES = int(os.environ.get('JOB_MAX_USERNAMES', 100000))
+
+class JobStore:
+    def __init__(self, path=JOBS_DB_PATH):
+        self.path = path
+        conn = self._connect()
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')  # Readers don't block the runners
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    force_refresh INTEGER NOT NULL DEFAULT 0,
+                    total INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    finished_at REAL,
+                    done_count INTEGER NOT NULL DEFAULT 0,
+                    success_count INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS job_items (
+                    job_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    username TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    success INTEGER,
+                    result TEXT,
+                    claimed_by TEXT,
+                    claimed_at REAL,
+                    PRIMARY KEY (job_id, position)
+                );
+                CREATE INDEX IF NOT EXISTS idx_job_items_status ON job_items (job_id, status);
+                CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+                CREATE INDEX IF NOT EXISTS idx_job_items_claimed ON job_items (claimed_by, claimed_at) WHERE status = 'claimed';
+                CREATE INDEX IF NOT EXISTS idx_jobs_finished ON jobs (finished_at) WHERE finished_at IS NOT NULL;
+            ''')
+            # Databases created before the counter columns existed: add them and backfill from the items
+            columns = [row['name'] for row in conn.execute('PRAGMA table_info(jobs)')]
+            for column, condition in (('done_count', "i.status = 'done'"), ('success_count', 'i.success = 1')):
+                if column not in columns:
+                    conn.execute('BEGIN IMMEDIATE')
+                    conn.execute(f'ALTER TABLE jobs ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0')
+                    conn.execute(f'UPDATE jobs SET {column} = (SELECT COUNT(*) FROM job_items i WHERE i.job_id = jobs.id AND {condition})')
+                    conn.execute('COMMIT')
+        finally:
+            conn.close()
+    
+    def _connect(self):
+        # Autocommit mode; multi-statement changes use explicit BEGIN IMMEDIATE
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def create_job(self, usernames, force_refresh=False):
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('INSERT INTO jobs (id, status, force_refresh, total, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+                         (job_id, 'queued', int(bool(force_refresh)), len(usernames), now, now))
+            conn.executemany('INSERT INTO job_items (job_id, position, username) VALUES (?, ?, ?)',
+                             ((job_id, position, username) for position, username in enumerate(usernames)))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        return job_id
+    
+    def get_job(self, job_id):
+        """Job row plus item counts, or None if the job doesn't exist"""
+        conn = self._connect()
+        try:
+            job = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            if job is None:
+                return None
+            # PERFORMANCE: Completed/successful come from the job row; only the claimed items
+            # (at most a few chunks) are counted, so polling a large job stays cheap
+            in_progress = conn.execute(
+                "SELECT COUNT(*) FROM job_items WHERE job_id = ? AND status = 'claimed'", (job_id,)).fetchone()[0]
+        finally:
+            conn.close()
+        
+        completed = job['done_count']
+        return {
+            'job_id': job['id'],
+            'status': job['status'],
+            'force_refresh': bool(job['force_refresh']),
+            'total': job['total'],
+            'completed': completed,
+            'in_progress': in_progress,
+            'pending': max(0, job['total'] - completed - in_progress),
+            'successful': job['success_count'],
+            'percent': round(completed / job['total'] * 100, 1) if job['total'] else 100.0,
+            'created_at': job['created_at'],
+            'updated_at': job['updated_at'],
+            'finished_at': job['finished_at']
+        }
+    
+    def get_results(self, job_id, offset, limit):
+        """Finished results in input order"""
+        conn = self._connect()
+        try:
+            rows = conn.execute('SELECT result FROM job_items WHERE job_id = ? AND status = ? ORDER BY position LIMIT ? OFFSET ?',
+                                (job_id, 'done', limit, offset)).fetchall()
+        finally:
+            conn.close()
+        return [json.loads(row['result']) for row in rows]
+    
+    def cancel_job(self, job_id):
+        """Stop a queued/running job; returns False if it doesn't exist or already finished"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            cursor = conn.execute("UPDATE jobs SET status = 'cancelled', updated_at = ?, finished_at = ? WHERE id = ? AND status IN ('queued', 'running')",
+                                  (now, now, job_id))
+            return cursor.rowcount > 0
+        finally:
+            conn.close()
+    
+    def is_cancelled(self, job_id):
+        conn = self._connect()
+        try:
+            row = conn.execute('SELECT status FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        finally:
+            conn.close()
+        return row is None or row['status'] == 'cancelled'
+    
+    def claim_items(self, owner, limit):
+        """Atomically claim up to `limit` pending usernames from the oldest active job"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            job = conn.execute("""SELECT j.id, j.force_refresh FROM jobs j
+                                  WHERE j.status IN ('queued', 'running')
+                                    AND EXISTS (SELECT 1 FROM job_items i WHERE i.job_id = j.id AND i.status = 'pending')
+                                  ORDER BY j.created_at LIMIT 1""").fetchone()
+            if job is None:
+                conn.execute('COMMIT')
+                return None
+            items = conn.execute("SELECT position, username FROM job_items WHERE job_id = ? AND status = 'pending' ORDER BY position LIMIT ?",
+                                 (job['id'], limit)).fetchall()
+            conn.executemany("UPDATE job_items SET status = 'claimed', claimed_by = ?, claimed_at = ? WHERE job_id = ? AND position = ?",
+                             ((owner, now, job['id'], item['position']) for item in items))
+            conn.execute("UPDATE jobs SET status = 'running', updated_at = ? WHERE id = ?", (now, job['id']))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        return job['id'], bool(job['force_refresh']), [(item['position'], item['username']) for item in items]
+    
+    def complete_item(self, job_id, position, result):
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            # Only the first completion of an item counts (a re-queued item can finish twice)
+            success = int(bool(result.get('success')))
+            newly_done = conn.execute("UPDATE job_items SET status = 'done', success = ?, result = ?, claimed_by = NULL WHERE job_id = ? AND position = ? AND status != 'done'",
+                                      (success, json.dumps(result), job_id, position)).rowcount
+            # PERFORMANCE: Count completions on the job row instead of counting unfinished items every time
+            # (SET expressions see the old row, so done_count + 1 is the new count)
+            conn.execute("""UPDATE jobs SET done_count = done_count + ?, success_count = success_count + ?, updated_at = ?,
+                                status = CASE WHEN status = 'running' AND done_count + ? >= total THEN 'completed' ELSE status END,
+                                finished_at = CASE WHEN status = 'running' AND done_count + ? >= total THEN ? ELSE finished_at END
+                            WHERE id = ?""",
+                         (newly_done, newly_done * success, now, newly_done, newly_done, now, job_id))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+    
+    def renew_claims(self, job_id, owner, positions):
+        """HEARTBEAT: Push back the lease on usernames this runner is still working on"""
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.executemany("UPDATE job_items SET claimed_at = ? WHERE job_id = ? AND position = ? AND status = 'claimed' AND claimed_by = ?",
+                             ((time.time(), job_id, position, owner) for position in positions))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+    
+    def release_items(self, job_id, positions):
+        """Put claimed usernames back in the queue"""
+        conn = self._connect()
+        try:
+            conn.executemany("UPDATE job_items SET status = 'pending', claimed_by = NULL, claimed_at = NULL WHERE job_id = ? AND position = ? AND status = 'claimed'",
+                             ((job_id, position) for position in positions))
+        finally:
+            conn.close()
+    
+    def release_stale_claims(self):
+        """RESUME: Re-queue items whose runner died (recycled/restarted worker) or whose lease expired"""
+        hostname = socket.gethostname()
+        conn = self._connect()
+        try:
+            owners = [row['claimed_by'] for row in conn.execute(
+                "SELECT DISTINCT claimed_by FROM job_items WHERE status = 'claimed'")]
+            dead_owners = []
+            for owner in owners:
+                host, _, pid = (owner or '').rpartition(':')
+                if host == hostname and pid.isdigit() and not psutil.pid_exists(int(pid)):
+                    dead_owners.append(owner)
+            released = 0
+            for owner in dead_owners:
+                released += conn.execute("UPDATE job_items SET status = 'pending', claimed_by = NULL, claimed_at = NULL WHERE status = 'claimed' AND claimed_by = ?",
+                                         (owner,)).rowcount
+            released += conn.execute("UPDATE job_items SET status = 'pending', claimed_by = NULL, claimed_at = NULL WHERE status = 'claimed' AND claimed_at < ?",
+                                     (time.time() - JOB_LEASE_SECONDS,)).rowcount
+        finally:
+            conn.close()
+        if released:
+            log.info("♻️ JOBS: Re-queued %s usernames from interrupted runners", released)
+        return released
+    
+    def queue_depth(self):
+        """Item counts by status across unfinished jobs"""
+        conn = self._connect()
+        try:
+            return {row['status']: row['count'] for row in conn.execute(
+                """SELECT i.status, COUNT(*) AS count FROM job_items i JOIN jobs j ON j.id = i.job_id
+                   WHERE j.status IN ('queued', 'running') AND i.status IN ('pending', 'claimed')
+                   GROUP BY i.status""")}
+        finally:
+            conn.close()
+
+    def purge_finished_jobs(self, older_than=JOB_RETENTION_SECONDS):
+        """RETENTION: Delete completed/cancelled jobs (and their items) that finished more than older_than seconds ago"""
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            job_ids = [row['id'] for row in conn.execute('SELECT id FROM jobs WHERE finished_at < ?', (time.time() - older_than,))]
+            for job_id in job_ids:
+                conn.execute('DELETE FROM job_items WHERE job_id = ?', (job_id,))
+                conn.execute('DELETE FROM jobs WHERE id = ?', (job_id,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        if job_ids:
+            log.info("🧹 JOBS: Purged %s finished jobs older than %ss", len(job_ids), older_than)
+        return len(job_ids)
+
+class JobRunner:
+    def __init__(self, store, workers=JOB_WORKERS, chunk_size=JOB_CHUNK_SIZE):
+        self.store = store
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.owner_pid = None
+        self.owner_id = None
+        self.start_lock = Lock()
+        self.wake_event = Event()
+        self.swept_at = 0.0
+        self.sweep_lock = Lock()
+        self.in_flight = {}  # runner thread -> (job_id, positions it still holds), renewed by the heartbeat
+        self.in_flight_lock = Lock()
+    
+    def ensure_started(self):
+        """Start the runner threads lazily, once per process (gunicorn forks after --preload-app)"""
+        if self.owner_pid == os.getpid():
+            return
+        with self.start_lock:
+            if self.owner_pid == os.getpid():
+                return
+            self.owner_pid = os.getpid()
+            self.owner_id = f"{socket.gethostname()}:{self.owner_pid}"
+            self.wake_event = Event()
+            self.swept_at = 0.0  # Sweep right away - this process may be replacing one that died mid-job
+            for i in range(self.workers):
+                threading.Thread(target=self._run, name=f'job-runner-{i}', daemon=True).start()
+            threading.Thread(target=self._heartbeat, name='job-heartbeat', daemon=True).start()
+            log.info("📦 JOBS: Started %s background runners in process %s", self.workers, self.owner_pid)
+    
+    def notify(self):
+        """Wake idle runners in this process (e.g. right after a job is submitted)"""
+        self.wake_event.set()
+    
+    def _maybe_sweep(self):
+        """Re-queue stale claims and purge old jobs at most once per JOB_SWEEP_INTERVAL in this process"""
+        with self.sweep_lock:
+            if self.swept_at and time.monotonic() - self.swept_at < JOB_SWEEP_INTERVAL:
+                return
+            self.swept_at = time.monotonic()
+        self.store.release_stale_claims()
+        self.store.purge_finished_jobs()
+    
+    def _heartbeat(self):
+        """Renew this process's in-flight claims so chunks that outlast JOB_LEASE_SECONDS aren't re-queued and scraped twice"""
+        while True:
+            time.sleep(JOB_HEARTBEAT_INTERVAL)
+            with self.in_flight_lock:
+                claims = [(job_id, list(positions)) for job_id, positions in self.in_flight.values() if positions]
+            for job_id, positions in claims:
+                try:
+                    self.store.renew_claims(job_id, self.owner_id, positions)
+                except Exception as e:
+                    log.error("❌ JOBS: Failed to renew claims for job %s: %s", job_id, e)
+    
+    def _run(self):
+        while True:
+            try:
+                self._maybe_sweep()
+                claim = self.store.claim_items(self.owner_id, self.chunk_size)
+                if claim is None:
+                    self.wake_event.wait(JOB_POLL_INTERVAL)
+                    self.wake_event.clear()
+                    continue
+                self._process_claim(*claim)
+            except Exception as e:
+                log.error("❌ JOBS: Runner error: %s", e)
+                time.sleep(JOB_POLL_INTERVAL)
+    
+    def _process_claim(self, job_id, force_refresh, items):
+        # Map results back to queue positions (the same username can appear more than once)
+        positions = defaultdict(deque)
+        for position, username in items:
+            positions[username].append(position)
+        pending = {position for position, _ in items}
+        thread_id = threading.get_ident()
+        with self.in_flight_lock:
+            self.in_flight[thread_id] = (job_id, pending)
+        # PERFORMANCE: Poll for cancellation at most once per JOB_POLL_INTERVAL instead of once per username
+        checked_at = time.monotonic()
+        
+        try:
+            for result in iter_username_batch([username for _, username in items], max_workers=JOB_MAX_IN_FLIGHT, force_refresh=force_refresh):
+                position = positions[result['username']].popleft()
+                self.store.complete_item(job_id, position, format_bulk_result(result))
+                with self.in_flight_lock:
+                    pending.discard(position)
+                if time.monotonic() - checked_at >= JOB_POLL_INTERVAL:
+                    checked_at = time.monotonic()
+                    if self.store.is_cancelled(job_id):
+                        log.info("🛑 JOBS: Job %s cancelled, stopping runner chunk", job_id)
+                        break
+        finally:
+            with self.in_flight_lock:
+                del self.in_flight[thread_id]
+            if pending:
+                self.store.release_items(job_id, pending)
+
+job_store = JobStore()
+job_runner = JobRunner(job_store)
+
+def collect_job_queue_metrics():
+    # The queue is shared by every worker, so it is read once per scrape instead of summed per process
+    depth = job_store.queue_depth()
+    return [(JOB_QUEUE_ITEMS._key({'status': status}), depth.get(status, 0)) for status in ('pending', 'claimed')]
+
+metrics.global_collectors.append(collect_job_queue_metrics)
+
+def start_background_services():
+    """Start this process's job runners, metrics flusher, system sampler and WebDriver pool maintenance.
+    Called at worker boot (gunicorn.conf.py, or before app.run) so unfinished jobs resume without waiting for traffic"""
+    job_runner.ensure_started()
+    metrics.ensure_started()
+    cpu_monitor.ensure_started()
+    if isinstance(webdriver_pool, WebDriverPool):
+        webdriver_pool.ensure_started()  # Health checks and prewarming
+
+@app.before_request
+def start_job_runner():
+    # Fallback for servers that don't run the boot hook; each service checks its pid, so this is cheap
+    start_background_services()
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queue a username list for background processing and return its job ID"""
+    try:
+        data = request.get_json()
+        usernames = [str(u).replace('@', '').strip() for u in data.get('usernames', [])]
+        usernames = [u for u in usernames if u]
+        force_refresh = data.get('force_refresh', False)
+        
+        if not usernames:
+            return jsonify({'success': False, 'error': 'Please provide usernames'})
+        
+        if len(usernames) > JOB_MAX_USERNAMES:
+            return jsonify({
+                'success': False,
+                'error': f'Too many usernames for a single job ({len(usernames)}). The limit is {JOB_MAX_USERNAMES}.'
+            })
+        
+        job_id = job_store.create_job(usernames, force_refresh=force_refresh)
+        job_runner.notify()
+        log.info("📦 JOBS: Queued job %s with %s usernames", job_id, len(usernames))
+        
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'total': len(usernames),
+            'status_url': f'/jobs/{job_id}',
+            'results_url': f'/jobs/{job_id}/results'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Failed to submit job: {str(e)}'
+        })
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    try:
+        job = job_store.get_job(job_id)
+        if job is None:
+            return jsonify({'success': False, 'error': 'Job not found'})
+        return jsonify({'success': True, **job})
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Failed to get job status: {str(e)}'
+        })
+
+@app.route('/jobs/<job_id>/results', methods=['GET'])
+def job_results(job_id):
+    """Finished results page by page (?page=1&per_page=100), in submission order"""
+    try:
+        job = job_store.get_job(job_id)
+        if job is None:
+            return jsonify({'success': False, 'error': 'Job not found'})
+        
+        page = max(1, request.args.get('page', 1, type=int))
+        per_page = min(1000, max(1, request.args.get('per_page', 100, type=int)))
+        results = job_store.get_results(job_id, (page - 1) * per_page, per_page)
+        
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status': job['status'],
+            'page': page,
+            'per_page': per_page,
+            'results': results,
+            'completed': job['completed'],
+            'has_more': page * per_page < job['completed']
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Failed to get job results: {str(e)}'
+        })
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    try:
+        if not job_store.cancel_job(job_id):
+            return jsonify({'success': False, 'error': 'Job not found or already finished'})
+        return jsonify({'success': True, 'job_id': job_id, 'message': 'Job cancelled'})
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Failed to cancel job: {str(e)}'
+        })
+
 @app.route('/export-excel', methods=['POST'])
 def export_excel():
     try:
@@ -1161,6 +3740,7 @@ def export_excel():
 def clear_cache():
     try:
         count = profile_cache.clear()  # This clears both memory and disk
+        profile_memory_cache.clear()  # Also tells other workers to drop their L1 entries
         return jsonify({
             'success': True,
             'message': f'Cache cleared successfully! {count} items removed.',
@@ -1186,7 +3766,10 @@ def cache_stats():
             'success': True,
             'total_items': item_count,
             'total_cache_size_mb': cache_size_mb,
-            'cache_directory': profile_cache.directory
+            'cache_directory': profile_cache.directory,
+            'memory_cache': profile_memory_cache.get_stats(),
+            'ttl_seconds': CACHE_TTLS,
+            'coalescing': scrape_coalescer.get_stats()
         })
         
     except Exception as e:
@@ -1199,27 +3782,31 @@ def cache_stats():
 def system_stats():
     """Get system performance statistics including CPU usage"""
     try:
-        # Get CPU usage
-        cpu_percent = cpu_monitor.get_cpu_usage()
+        # Latest background sample - nothing here blocks or walks the process table
+        sample = cpu_monitor.latest()
+        cpu_percent = sample['cpu_percent']
         cpu_history = cpu_monitor.get_cpu_history()
         is_throttling = False  # No throttling anymore
         
         # Get memory usage
-        memory = psutil.virtual_memory()
+        memory = sample['memory']
         memory_percent = memory.percent
         memory_available_gb = round(memory.available / (1024**3), 2)
         memory_used_gb = round(memory.used / (1024**3), 2)
         memory_total_gb = round(memory.total / (1024**3), 2)
         
         # Get disk usage
-        disk = psutil.disk_usage('/')
+        disk = sample['disk']
         disk_percent = disk.percent
         disk_free_gb = round(disk.free / (1024**3), 2)
         disk_used_gb = round(disk.used / (1024**3), 2)
         disk_total_gb = round(disk.total / (1024**3), 2)
         
         # Get process count
-        process_count = len(psutil.pids())
+        process_count = sample['process_count']
+        
+        # Get shared request budget and transfer savings
+        rate_limiter_stats = request_rate_limiter.get_stats()
         
         return jsonify({
             'success': True,
@@ -1243,7 +3830,26 @@ def system_stats():
             },
             'system': {
                 'process_count': process_count,
-                'uptime_seconds': time.time() - psutil.boot_time()
+                'uptime_seconds': time.time() - sample['boot_time'],
+                'worker_rss_mb': sample['process_rss_mb'],
+                'worker_threads': sample['process_threads'],
+                'sampled_at': sample['time']
+            },
+            'rate_limiter': rate_limiter_stats,
+            'transfer': transfer_stats.get_stats(),
+            'tiers': tier_stats.get_stats(),
+            'browsers': webdriver_pool.get_stats() if webdriver_pool else None,
+            'browser_resources': browser_resource_stats.get_stats(),
+            'routing': tier_router.get_stats(),
+            'circuit_breaker': http_circuit_breaker.get_stats(),
+            'concurrency': {
+                'http': http_concurrency.get_stats(),
+                'browser': browser_concurrency.get_stats()
+            },
+            'logging': {
+                'level': logging.getLevelName(log.level),
+                'sample_rate': LOG_SAMPLE_RATE,
+                'dropped': log_handler.dropped
             }
         })
         
@@ -1253,6 +3859,44 @@ def system_stats():
             'error': f'Failed to get system stats: {str(e)}'
         })
 
+@app.route('/debug/traces', methods=['GET'])
+def debug_traces():
+    """Slowest recent traces in this worker, with per-stage breakdowns"""
+    try:
+        limit = min(int(request.args.get('limit', 20)), TRACE_BUFFER_SIZE)
+        return jsonify({
+            'success': True,
+            'pid': os.getpid(),
+            'buffered': len(tracer.traces),
+            'stages': tracer.stage_summary(),
+            'slowest': tracer.slowest(limit, request.args.get('name'))
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Failed to read traces: {str(e)}'
+        })
+
+@app.route('/debug/profile', methods=['GET'])
+def debug_profile():
+    """Sample every thread's stack for ?seconds= and return collapsed stacks for flamegraph.pl or speedscope"""
+    if not PROFILER_ENABLED:
+        return jsonify({'success': False, 'error': 'Profiler is disabled, start the app with PROFILER_ENABLED=1'})
+    try:
+        seconds = min(float(request.args.get('seconds', 10)), PROFILER_MAX_SECONDS)
+        interval = max(float(request.args.get('interval', 0.005)), 0.001)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'seconds and interval must be numbers'})
+    stacks = sampling_profiler.profile(seconds, interval)
+    if stacks is None:
+        return jsonify({'success': False, 'error': 'A profile is already running in this worker'})
+    return Response(stacks, mimetype='text/plain')
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus scrape target - counters and histograms summed over every worker on this host"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 # CPU configuration endpoint removed - no throttling anymore
 
 @app.route('/remove-success', methods=['POST'])
@@ -1372,15 +4016,6 @@ def import_excel():
     except Exception as e:
         return jsonify({'error': f'Import failed: {str(e)}'})
 
-@app.teardown_appcontext
-def cleanup_resources(error):
-    """Enhanced cleanup on app shutdown"""
-    try:
-        if webdriver_pool:
-            webdriver_pool.close_all()
-    except Exception as e:
-        print(f"Cleanup error: {e}")
-
 import atexit
 import signal
 import os
@@ -1396,22 +4031,30 @@ def cleanup_on_exit():
             webdriver_pool.close_all()
             print("✅ WebDriver pool cleaned up")
         
-        # Kill all Chrome processes related to this app
-        try:
-            import psutil
-            current_pid = os.getpid()
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'ppid']):
-                try:
-                    if proc.info['name'] and 'chrome' in proc.info['name'].lower():
-                        cmdline = proc.info.get('cmdline', [])
-                        # Check if it's a headless Chrome from our app
-                        if cmdline and any('headless' in str(arg).lower() for arg in cmdline):
-                            proc.terminate()
-                            print(f"✅ Killed Chrome process: {proc.info['pid']}")
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-        except ImportError:
-            pass
+        # Stop the async fetch loop and drop queued bulk work
+        async_fetch_engine.close()
+        bulk_executor.shutdown()
+        
+        # Last metrics snapshot so this worker's counters reach the archive
+        metrics.flush()
+        
+        # Kill all Chrome processes related to this app (not when they belong to the shared broker)
+        if not BROWSER_BROKER_ADDRESS:
+            try:
+                import psutil
+                current_pid = os.getpid()
+                for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'ppid']):
+                    try:
+                        if proc.info['name'] and 'chrome' in proc.info['name'].lower():
+                            cmdline = proc.info.get('cmdline', [])
+                            # Check if it's a headless Chrome from our app
+                            if cmdline and any('headless' in str(arg).lower() for arg in cmdline):
+                                proc.terminate()
+                                print(f"✅ Killed Chrome process: {proc.info['pid']}")
+                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        pass
+            except ImportError:
+                pass
         
         # Force garbage collection
         import gc
@@ -1471,6 +4114,8 @@ if __name__ == '__main__':
     print("⚠️  Press Ctrl+C to stop the server (will kill all child processes)")
     print("-" * 60)
     
+    start_background_services()
+    
     try:
         # PERFORMANCE: Configure Flask with optimized threading
         app.run(
@@ -0,0 +1,140 @@
+"""
+Headless Chrome creation, shared by the app's WebDriver pool and scripts/browser_broker.py.
+Importing this module has no side effects - no cache directories, job database, signal handlers or exit hooks.
+"""
+import os
+import logging
+from fnmatch import fnmatchcase
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+
+log = logging.getLogger('tiktok_scraper')
+
+WEBDRIVER_PAGE_LOAD_STRATEGY = os.environ.get('WEBDRIVER_PAGE_LOAD_STRATEGY', 'eager')  # Return at DOMContentLoaded, not after every image/script
+
+# PERFORMANCE: Resource blocking via the DevTools protocol (headless Chrome ignores --disable-images/--disable-css)
+BLOCKED_URL_PATTERNS = {
+    'images': ['*.jpg*', '*.jpeg*', '*.png*', '*.gif*', '*.webp*', '*.avif*', '*.heic*', '*.ico*', '*.svg*', '*~tplv-*'],
+    'media': ['*.mp4*', '*.webm*', '*.m3u8*', '*.ts?*', '*.mp3*', '*.m4a*', '*/video/tos/*'],
+    'fonts': ['*.woff*', '*.ttf*', '*.otf*', '*.eot*'],
+    'trackers': ['*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*connect.facebook.net*',
+                 '*analytics.tiktok.com*', '*mon.tiktokv.com*', '*mcs.tiktokw.us*', '*mssdk*.tiktokw.us*'],
+}
+# Comma-separated categories from BLOCKED_URL_PATTERNS, or "none"
+SELENIUM_BLOCK_RESOURCES = [c.strip() for c in os.environ.get('SELENIUM_BLOCK_RESOURCES', 'images,media,fonts,trackers').split(',')
+                            if c.strip() in BLOCKED_URL_PATTERNS]
+
+def blocked_url_patterns(categories=SELENIUM_BLOCK_RESOURCES):
+    return [pattern for category in categories for pattern in BLOCKED_URL_PATTERNS[category]]
+
+def blocked_url_category(url, categories=SELENIUM_BLOCK_RESOURCES):
+    for category in categories:
+        if any(fnmatchcase(url, pattern) for pattern in BLOCKED_URL_PATTERNS[category]):
+            return category
+    return 'other'
+
+def chrome_options():
+    chrome_options = Options()
+    chrome_options.page_load_strategy = WEBDRIVER_PAGE_LOAD_STRATEGY
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument('--disable-web-security')
+    chrome_options.add_argument('--allow-running-insecure-content')
+    chrome_options.add_argument('--disable-logging')
+    chrome_options.add_argument('--log-level=3')
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument('--disable-plugins')
+    # Images, media and fonts are blocked over CDP in apply_resource_blocking
+    # Removed --disable-javascript as it breaks TikTok functionality
+    chrome_options.add_argument('--enable-unsafe-swiftshader')
+    chrome_options.add_argument('--disable-webgl')
+    chrome_options.add_argument('--disable-accelerated-2d-canvas')
+    chrome_options.add_argument('--no-first-run')
+    chrome_options.add_argument('--disable-default-apps')
+    chrome_options.add_argument('--disable-background-timer-throttling')
+    chrome_options.add_argument('--disable-backgrounding-occluded-windows')
+    chrome_options.add_argument('--disable-renderer-backgrounding')
+
+    # Additional speed optimizations
+    chrome_options.add_argument('--disable-background-networking')
+    chrome_options.add_argument('--disable-sync')
+    chrome_options.add_argument('--disable-translate')
+    chrome_options.add_argument('--disable-features=TranslateUI')
+    chrome_options.add_argument('--disable-features=VizDisplayCompositor')
+    chrome_options.add_argument('--disable-hang-monitor')
+    chrome_options.add_argument('--disable-prompt-on-repost')
+    chrome_options.add_argument('--disable-domain-reliability')
+    chrome_options.add_argument('--aggressive-cache-discard')
+    chrome_options.add_argument('--disable-component-extensions-with-background-pages')
+    chrome_options.add_argument('--disable-software-rasterizer')
+    chrome_options.add_argument('--disable-features=TranslateUI')
+    chrome_options.add_argument('--disable-ipc-flooding-protection')
+    chrome_options.add_argument('--hide-scrollbars')
+    chrome_options.add_argument('--mute-audio')
+    if SELENIUM_BLOCK_RESOURCES:
+        # Network events only, so blocked requests can be counted per page
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        chrome_options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+    return chrome_options
+
+def apply_resource_blocking(driver):
+    patterns = blocked_url_patterns()
+    if not patterns:
+        return
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+    except Exception as e:
+        log.warning("⚠️ CDP resource blocking unavailable: %s", e)
+
+def create_driver():
+    """Start a headless Chrome with resource blocking applied, or None if no Chrome could be started"""
+    try:
+        options = chrome_options()
+
+        # Try multiple methods to create driver
+        driver = None
+
+        # Method 1: Try with ChromeDriverManager
+        try:
+            from selenium.webdriver.chrome.service import Service
+            service = Service(ChromeDriverManager().install())
+            driver = webdriver.Chrome(service=service, options=options)
+            log.info("WebDriver created with ChromeDriverManager")
+        except Exception as e:
+            log.warning("ChromeDriverManager failed: %s", e)
+
+            # Method 2: Try without service (system PATH)
+            try:
+                driver = webdriver.Chrome(options=options)
+                log.info("WebDriver created with system Chrome")
+            except Exception as e2:
+                log.warning("System Chrome failed: %s", e2)
+
+                # Method 3: Try with different Chrome binary path
+                try:
+                    options.binary_location = r"C:\Program Files\Google\Chrome\Application\chrome.exe"
+                    driver = webdriver.Chrome(options=options)
+                    log.info("WebDriver created with specific Chrome path")
+                except Exception as e3:
+                    log.warning("Specific Chrome path failed: %s", e3)
+                    return None
+
+        if driver:
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            apply_resource_blocking(driver)
+            return driver
+        else:
+            return None
+
+    except Exception as e:
+        log.error("Failed to create WebDriver: %s", e)
+        return None
@@ -0,0 +1,47 @@
+import os
+import sys
+import json
+import argparse
+import tempfile
+import threading
+import importlib.util
+import urllib.request
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# src.app creates its caches and job database in the working directory when it is imported,
+# so the suite runs in a scratch directory instead of the checkout
+os.chdir(tempfile.mkdtemp(prefix='tiktok-scraper-tests-'))
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+
+def _load_mock_server():
+    spec = importlib.util.spec_from_file_location('mock_tiktok_server', os.path.join(ROOT_DIR, 'scripts', 'mock_tiktok_server.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# A well-behaved mock TikTok (every profile loads, fast) - profile URLs are read once when src.app is imported
+_mock = _load_mock_server()
+_mock_config = _mock.MockConfig(argparse.Namespace(
+    latency_ms=5, jitter_ms=0, slow_rate=0, slow_ms=0, login_wall_rate=0, rate_limit_rate=0, retry_after=1,
+    error_rate=0, not_found_rate=0, email_rate=1.0, seed=1))
+_mock_server = _mock.ThreadingHTTPServer(('127.0.0.1', 0), _mock.make_handler(_mock_config))
+_mock_server.daemon_threads = True
+threading.Thread(target=_mock_server.serve_forever, name='mock-tiktok', daemon=True).start()
+MOCK_TIKTOK_URL = f"http://127.0.0.1:{_mock_server.server_address[1]}"
+os.environ['TIKTOK_BASE_URL'] = MOCK_TIKTOK_URL
+os.environ.setdefault('RATE_LIMIT_RATE', '0')
+
+
+@pytest.fixture
+def mock_tiktok():
+    """Base URL of the mock server and a reader for its per-outcome request counts"""
+    def stats():
+        with urllib.request.urlopen(f"{MOCK_TIKTOK_URL}/__stats") as response:
+            return json.load(response)
+    return MOCK_TIKTOK_URL, stats
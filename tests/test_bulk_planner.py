@@ -0,0 +1,76 @@
+import uuid
+
+from src.app import iter_username_batch, normalize_username, plan_username_batch, set_cached_profile
+
+
+def unique(name):
+    # Caches live for the whole test session, so every test scrapes usernames nobody else has seen
+    return f"{name}{uuid.uuid4().hex[:8]}"
+
+
+def test_normalize_username():
+    assert normalize_username('@Some.User ') == 'some.user'
+    assert normalize_username('  ') == ''
+    assert normalize_username(12345) == '12345'
+
+
+def test_plan_dedupes_case_and_at_variants_in_list_order():
+    alpha, beta = unique('alpha'), unique('beta')
+
+    positions, cached, misses = plan_username_batch([f"@{alpha.upper()}", beta, alpha, '', ' @ ', f" {beta} "], use_cache=False)
+
+    assert positions == {alpha: [0, 2], beta: [1, 5], '': [3, 4]}
+    assert cached == {}
+    assert misses == [alpha, beta]
+
+
+def test_plan_serves_cache_hits_and_only_scrapes_misses():
+    hit, miss = unique('hit'), unique('miss')
+    set_cached_profile(hit, {'bio': 'cached bio', 'outcome': 'success'}, expire=60)
+
+    positions, cached, misses = plan_username_batch([hit, miss, f"@{hit}"])
+
+    assert positions == {hit: [0, 2], miss: [1]}
+    assert cached == {hit: {'bio': 'cached bio', 'outcome': 'success'}}
+    assert misses == [miss]
+
+
+def test_plan_ignores_the_cache_when_asked():
+    hit = unique('hit')
+    set_cached_profile(hit, {'bio': 'cached bio', 'outcome': 'success'}, expire=60)
+
+    _, cached, misses = plan_username_batch([hit], use_cache=False)
+
+    assert cached == {}
+    assert misses == [hit]
+
+
+def test_bulk_run_scrapes_each_distinct_username_once(mock_tiktok):
+    _, mock_stats = mock_tiktok
+    alpha, beta, hit = unique('alpha'), unique('beta'), unique('hit')
+    set_cached_profile(hit, {'bio': 'reach me at hit@example.com', 'outcome': 'success'}, expire=60)
+    submitted = [f"@{alpha}", alpha.upper(), beta, hit, '  ']
+    before = mock_stats().get('profile', 0)
+
+    results = list(iter_username_batch(submitted, use_async=False))
+
+    # One result per entry, under the username exactly as submitted
+    assert sorted(result['username'] for result in results) == sorted(submitted)
+    by_name = {result['username']: result for result in results}
+    assert by_name[f"@{alpha}"]['success'] and by_name[f"@{alpha}"]['bio'] == by_name[alpha.upper()]['bio']
+    assert by_name[hit]['emails'] == ['hit@example.com']
+    assert by_name['  '] == {'username': '  ', 'success': False, 'error': 'Invalid username'}
+    # alpha and its variants share one lookup, the cache hit never reaches the mock
+    assert mock_stats().get('profile', 0) - before == 2
+
+
+def test_bulk_run_with_async_prefetch(mock_tiktok):
+    _, mock_stats = mock_tiktok
+    names = [unique('async') for _ in range(5)]
+    before = mock_stats().get('profile', 0)
+
+    results = list(iter_username_batch(names + [names[0].upper()]))
+
+    assert len(results) == 6
+    assert all(result['success'] and result['emails'] for result in results)
+    assert mock_stats().get('profile', 0) - before == 5
@@ -0,0 +1,117 @@
+import time
+from email.utils import formatdate
+
+import pytest
+
+from src.app import CircuitBreaker, parse_retry_after
+
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker(window_seconds=30, min_requests=4, failure_rate=0.5,
+                          open_seconds=30, max_open_seconds=600, half_open_probes=2)
+
+
+def send(breaker, *statuses):
+    for status in statuses:
+        assert breaker.allow_request()
+        breaker.record(status)
+
+
+def cool_down(breaker):
+    breaker.open_until = time.time() - 1
+
+
+def test_stays_closed_below_min_requests(breaker):
+    send(breaker, 429, 429, 429)
+
+    assert breaker.state == 'closed'
+
+
+def test_trips_when_failure_rate_reached(breaker):
+    send(breaker, 200, 200, 429, 503)
+
+    assert breaker.state == 'open'
+    assert breaker.trips == 1
+    assert breaker.open_until == pytest.approx(time.time() + 30, abs=1)
+
+
+def test_client_errors_and_missing_responses_are_not_failures(breaker):
+    send(breaker, 404, 404, 200, None, None, None, 429)
+
+    assert breaker.state == 'closed'
+
+
+def test_open_breaker_rejects_requests(breaker):
+    send(breaker, 429, 429, 429, 429)
+
+    assert not breaker.allow_request()
+    assert not breaker.allow_request()
+    assert breaker.rejected == 2
+
+
+def test_retry_after_extends_the_cool_down_up_to_the_cap(breaker):
+    send(breaker, 200, 200, 429)
+    assert breaker.allow_request()
+    breaker.record(429, retry_after=120)
+    assert breaker.state == 'open'
+    assert breaker.open_until == pytest.approx(time.time() + 120, abs=1)
+
+    capped = CircuitBreaker(min_requests=1, open_seconds=30, max_open_seconds=60)
+    assert capped.allow_request()
+    capped.record(429, retry_after=3600)
+    assert capped.open_until == pytest.approx(time.time() + 60, abs=1)
+
+
+def test_half_open_lets_a_limited_number_of_probes_through(breaker):
+    send(breaker, 429, 429, 429, 429)
+    cool_down(breaker)
+
+    assert breaker.allow_request()
+    assert breaker.state == 'half_open'
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # Both probes still in flight
+
+
+def test_successful_probes_close_the_breaker(breaker):
+    send(breaker, 429, 429, 429, 429)
+    cool_down(breaker)
+
+    send(breaker, 200, 200)
+
+    assert breaker.state == 'closed'
+    send(breaker, 429, 429, 429)  # Fresh window after closing
+    assert breaker.state == 'closed'
+
+
+def test_failed_probe_reopens_the_breaker(breaker):
+    send(breaker, 429, 429, 429, 429)
+    cool_down(breaker)
+
+    send(breaker, 200)
+    assert breaker.allow_request()
+    breaker.record(503)
+
+    assert breaker.state == 'open'
+    assert breaker.trips == 2
+    assert not breaker.allow_request()
+
+
+def test_probes_that_never_report_back_are_replaced(breaker):
+    send(breaker, 429, 429, 429, 429)
+    cool_down(breaker)
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.half_open_since = time.time() - breaker.open_seconds - 1
+
+    assert breaker.allow_request()
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('120') == 120.0
+    assert parse_retry_after('-5') == 0.0
+    assert parse_retry_after(formatdate(time.time() + 60, usegmt=True)) == pytest.approx(60, abs=2)
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
@@ -0,0 +1,168 @@
+import socket
+import sqlite3
+import time
+
+import pytest
+
+from src.app import JOB_LEASE_SECONDS, JobStore
+
+OWNER = f"{socket.gethostname()}:1"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(path=str(tmp_path / 'jobs.db'))
+
+
+def item_rows(store, job_id):
+    conn = store._connect()
+    try:
+        return {row['position']: dict(row) for row in conn.execute('SELECT * FROM job_items WHERE job_id = ?', (job_id,))}
+    finally:
+        conn.close()
+
+
+def age_claims(store, job_id, seconds):
+    conn = store._connect()
+    try:
+        conn.execute("UPDATE job_items SET claimed_at = ? WHERE job_id = ? AND status = 'claimed'", (time.time() - seconds, job_id))
+    finally:
+        conn.close()
+
+
+def test_claims_hand_out_pending_items_in_order_once(store):
+    job_id = store.create_job(['a', 'b', 'c'], force_refresh=True)
+
+    assert store.claim_items(OWNER, 2) == (job_id, True, [(0, 'a'), (1, 'b')])
+    assert store.claim_items(OWNER, 2) == (job_id, True, [(2, 'c')])
+    assert store.claim_items(OWNER, 2) is None
+
+    job = store.get_job(job_id)
+    assert job['status'] == 'running'
+    assert (job['in_progress'], job['pending'], job['completed']) == (3, 0, 0)
+
+
+def test_oldest_job_is_claimed_first(store):
+    first = store.create_job(['a'])
+    second = store.create_job(['b'])
+
+    assert store.claim_items(OWNER, 10)[0] == first
+    assert store.claim_items(OWNER, 10)[0] == second
+
+
+def test_completing_every_item_completes_the_job(store):
+    job_id = store.create_job(['a', 'b'])
+    store.claim_items(OWNER, 10)
+
+    store.complete_item(job_id, 0, {'username': 'a', 'success': True})
+    job = store.get_job(job_id)
+    assert (job['status'], job['completed'], job['successful'], job['percent']) == ('running', 1, 1, 50.0)
+
+    store.complete_item(job_id, 1, {'username': 'b', 'success': False})
+    job = store.get_job(job_id)
+    assert (job['status'], job['completed'], job['successful']) == ('completed', 2, 1)
+    assert job['finished_at'] is not None
+    assert store.get_results(job_id, 0, 10) == [{'username': 'a', 'success': True}, {'username': 'b', 'success': False}]
+
+
+def test_an_item_completed_twice_counts_once(store):
+    job_id = store.create_job(['a', 'b'])
+    store.claim_items(OWNER, 10)
+
+    store.complete_item(job_id, 0, {'username': 'a', 'success': True})
+    store.complete_item(job_id, 0, {'username': 'a', 'success': True})  # Re-queued and finished again
+
+    job = store.get_job(job_id)
+    assert (job['completed'], job['successful'], job['status']) == (1, 1, 'running')
+
+
+def test_released_items_are_claimed_again(store):
+    job_id = store.create_job(['a', 'b'])
+    store.claim_items(OWNER, 10)
+
+    store.release_items(job_id, [1])
+
+    assert store.claim_items(OWNER, 10) == (job_id, False, [(1, 'b')])
+
+
+def test_expired_lease_is_requeued(store):
+    job_id = store.create_job(['a', 'b'])
+    store.claim_items('other-host:123', 10)
+    age_claims(store, job_id, JOB_LEASE_SECONDS + 1)
+
+    assert store.release_stale_claims() == 2
+    assert store.get_job(job_id)['pending'] == 2
+
+
+def test_renewed_claims_survive_the_sweep(store):
+    job_id = store.create_job(['a', 'b'])
+    store.claim_items('other-host:123', 10)
+    age_claims(store, job_id, JOB_LEASE_SECONDS + 1)
+
+    store.renew_claims(job_id, 'other-host:123', [0])
+
+    assert store.release_stale_claims() == 1
+    rows = item_rows(store, job_id)
+    assert (rows[0]['status'], rows[1]['status']) == ('claimed', 'pending')
+
+
+def test_renewal_only_touches_the_owners_claims(store):
+    job_id = store.create_job(['a'])
+    store.claim_items('other-host:123', 10)
+    age_claims(store, job_id, JOB_LEASE_SECONDS + 1)
+
+    store.renew_claims(job_id, 'someone-else:456', [0])
+
+    assert store.release_stale_claims() == 1
+
+
+def test_claims_of_a_dead_local_process_are_requeued(store):
+    job_id = store.create_job(['a'])
+    store.claim_items(f"{socket.gethostname()}:999999999", 10)  # No such pid
+
+    assert store.release_stale_claims() == 1
+    assert store.claim_items(OWNER, 10) == (job_id, False, [(0, 'a')])
+
+
+def test_cancelled_jobs_stop_handing_out_work(store):
+    job_id = store.create_job(['a', 'b'])
+    store.claim_items(OWNER, 1)
+
+    assert store.cancel_job(job_id)
+    assert store.is_cancelled(job_id)
+    assert store.claim_items(OWNER, 10) is None
+    assert not store.cancel_job(job_id)  # Already finished
+
+
+def test_purge_removes_only_old_finished_jobs(store):
+    finished = store.create_job(['a'])
+    store.cancel_job(finished)
+    running = store.create_job(['b'])
+
+    assert store.purge_finished_jobs(older_than=3600) == 0
+    assert store.purge_finished_jobs(older_than=-1) == 1
+    assert store.get_job(finished) is None
+    assert store.get_job(running) is not None
+    assert item_rows(store, finished) == {}
+
+
+def test_counters_are_backfilled_on_old_databases(tmp_path):
+    path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, force_refresh INTEGER NOT NULL DEFAULT 0,
+                           total INTEGER NOT NULL, created_at REAL NOT NULL, updated_at REAL NOT NULL, finished_at REAL);
+        CREATE TABLE job_items (job_id TEXT NOT NULL, position INTEGER NOT NULL, username TEXT NOT NULL,
+                                status TEXT NOT NULL DEFAULT 'pending', success INTEGER, result TEXT,
+                                claimed_by TEXT, claimed_at REAL, PRIMARY KEY (job_id, position));
+        INSERT INTO jobs VALUES ('old', 'running', 0, 3, 0, 0, NULL);
+        INSERT INTO job_items VALUES ('old', 0, 'a', 'done', 1, '{}', NULL, NULL);
+        INSERT INTO job_items VALUES ('old', 1, 'b', 'done', 0, '{}', NULL, NULL);
+        INSERT INTO job_items VALUES ('old', 2, 'c', 'pending', NULL, NULL, NULL, NULL);
+    ''')
+    conn.commit()
+    conn.close()
+
+    job = JobStore(path=path).get_job('old')
+
+    assert (job['completed'], job['successful'], job['pending']) == (2, 1, 1)
@@ -0,0 +1,68 @@
+import time
+
+import diskcache as dc
+import pytest
+
+from src.app import TokenBucketRateLimiter
+
+
+@pytest.fixture
+def store(tmp_path):
+    cache = dc.Cache(str(tmp_path / 'coordination'))
+    yield cache
+    cache.close()
+
+
+class BrokenStore:
+    def transact(self):
+        raise OSError('disk gone')
+
+    def get(self, key, default=None):
+        raise OSError('disk gone')
+
+
+def test_burst_is_free_then_reservations_queue(store):
+    limiter = TokenBucketRateLimiter(rate=10, burst=3, store=store)
+
+    waits = [limiter.reserve() for _ in range(5)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    # Each reservation past the burst waits one more token interval than the one before it
+    assert waits[3] == pytest.approx(0.1, abs=0.02)
+    assert waits[4] == pytest.approx(0.2, abs=0.02)
+    assert limiter.stats['acquired'] == 5
+    assert limiter.stats['delayed'] == 2
+
+
+def test_tokens_refill_over_time_up_to_burst(store):
+    limiter = TokenBucketRateLimiter(rate=10, burst=3, store=store)
+    # Bucket emptied a long time ago - refill is capped at the burst size
+    store.set(limiter.key, (0.0, time.time() - 60))
+
+    assert limiter.remaining() == pytest.approx(3)
+    assert [limiter.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.reserve() > 0
+
+
+def test_limiters_sharing_a_store_share_one_budget(store):
+    first = TokenBucketRateLimiter(rate=1, burst=2, store=store)
+    second = TokenBucketRateLimiter(rate=1, burst=2, store=store)
+
+    assert first.reserve() == 0.0
+    assert second.reserve() == 0.0
+    assert first.reserve() == pytest.approx(1.0, abs=0.05)
+
+
+def test_zero_rate_disables_limiting(store):
+    limiter = TokenBucketRateLimiter(rate=0, burst=1, store=store)
+
+    assert all(limiter.reserve() == 0.0 for _ in range(10))
+
+
+def test_unavailable_store_falls_back_to_local_bucket():
+    limiter = TokenBucketRateLimiter(rate=10, burst=2, store=BrokenStore())
+
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == pytest.approx(0.1, abs=0.02)
+    assert limiter.remaining() == 0.0